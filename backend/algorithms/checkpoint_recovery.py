@@ -0,0 +1,176 @@
+import time
+
+class CheckpointRecovery:
+    """Resolve realtime deadlocks by preempting one holder's units of a
+    resource and rolling the victim back to its last checkpoint instead of
+    terminating it"""
+    def __init__(self, monitor):
+        self.monitor = monitor
+        self.checkpoints = {}
+        self.stats = self._empty_stats()
+
+    def _empty_stats(self):
+        return {
+            'checkpoints_taken': 0,
+            'records_copied': 0,
+            'preemptions': 0,
+            'units_preempted': 0,
+            'units_rolled_back': 0,
+            'units_saved_vs_termination': 0
+        }
+
+    def reset(self):
+        self.checkpoints.clear()
+        self.stats = self._empty_stats()
+
+    def take_checkpoint(self):
+        """Copy-on-write checkpoint: only processes whose holdings changed
+        since the previous checkpoint get a new record, the rest keep
+        sharing the record they already have"""
+        dirty = self.monitor._dirty_processes
+        now = time.time()
+
+        for process_id in list(dirty):
+            process = self.monitor.processes.get(process_id)
+            if process is None:
+                self.checkpoints.pop(process_id, None)
+                continue
+            self.checkpoints[process_id] = {
+                'timestamp': now,
+                'units': {rid: process.held_units(rid) for rid in process.resources}
+            }
+
+        self.stats['checkpoints_taken'] += 1
+        self.stats['records_copied'] += len(dirty)
+        dirty.clear()
+
+    def get_checkpoint(self, process_id):
+        checkpoint = self.checkpoints.get(process_id)
+        if checkpoint is None:
+            return None
+        return {
+            'timestamp': checkpoint['timestamp'],
+            'resources': sorted(checkpoint['units'], key=str),
+            'units': dict(checkpoint['units'])
+        }
+
+    def _rollback_set(self, process_id, resource_id):
+        """(resource, units) acquired after the last checkpoint, lost on rollback"""
+        checkpoint = self.checkpoints.get(process_id)
+        kept = checkpoint['units'] if checkpoint else {}
+        process = self.monitor.processes[process_id]
+        rolled = []
+        for r in process.resources:
+            extra = process.held_units(r) - kept.get(r, 0)
+            if r != resource_id and extra > 0:
+                rolled.append((r, extra))
+        return rolled
+
+    def _termination_cost(self, cycle):
+        """Units the default priority-based termination would discard"""
+        victim = min(cycle, key=lambda p: self.monitor._get_priority_value(p))
+        process = self.monitor.processes[victim]
+        return victim, sum(process.held_units(r) for r in process.resources)
+
+    def plan_preemption(self, cycle):
+        """Pick the preemption that unblocks a cycle member at the lowest
+        rollback cost. Only the waiter's shortfall (units wanted minus units
+        already free) is taken from the victim"""
+        processes = self.monitor.processes
+        resources = self.monitor.resources
+        members = set(cycle)
+        candidates = []
+
+        for waiter in cycle:
+            for resource_id in processes[waiter].waiting_for:
+                resource = resources.get(resource_id)
+                if resource is None:
+                    continue
+                shortfall = processes[waiter].wanted_units(resource_id) - resource.available
+                if shortfall <= 0:
+                    continue
+                for holder in resource.holders:
+                    if holder == waiter or holder not in members:
+                        continue
+                    rolled_back = self._rollback_set(holder, resource_id)
+                    units = min(shortfall, processes[holder].held_units(resource_id))
+                    candidates.append({
+                        'victim': holder,
+                        'beneficiary': waiter,
+                        'resource_id': resource_id,
+                        'units': units,
+                        'rolled_back': rolled_back,
+                        'units_lost': units + sum(n for _, n in rolled_back)
+                    })
+
+        if not candidates:
+            return None
+
+        best = min(candidates, key=lambda c: (
+            c['units_lost'],
+            self.monitor._get_priority_value(c['victim'])
+        ))
+        terminated, termination_cost = self._termination_cost(cycle)
+        best['termination_victim'] = terminated
+        best['termination_units_lost'] = termination_cost
+        return best
+
+    def _apply(self, plan):
+        monitor = self.monitor
+        victim = plan['victim']
+        resource_id = plan['resource_id']
+        start_time = time.time()
+
+        # The victim resumes from its checkpoint and queues again for every
+        # unit it gives back, on top of any it was already waiting for
+        for rolled, units in plan['rolled_back'] + [(resource_id, plan['units'])]:
+            monitor.release_resource(victim, rolled, units)
+            wanted = units + monitor.processes[victim].wanted_units(rolled)
+            monitor._unwait(victim, rolled)
+            monitor._wait(victim, rolled, wanted)
+        monitor._log_event('PREEMPT', victim, resource_id, start_time)
+
+        checkpoint = self.checkpoints.get(victim)
+        if checkpoint and resource_id in checkpoint['units']:
+            units = dict(checkpoint['units'])
+            kept = min(units.pop(resource_id), monitor.processes[victim].held_units(resource_id))
+            if kept:
+                units[resource_id] = kept
+            self.checkpoints[victim] = {'timestamp': checkpoint['timestamp'], 'units': units}
+
+        # A multi-unit waiter may still lack units held by someone else, and
+        # avoidance mode may refuse the grant
+        beneficiary = plan['beneficiary']
+        if monitor._try_grant(beneficiary, resource_id):
+            monitor._log_event('AUTO_GRANT', beneficiary, resource_id, start_time)
+
+        self.stats['preemptions'] += 1
+        self.stats['units_preempted'] += plan['units']
+        self.stats['units_rolled_back'] += sum(n for _, n in plan['rolled_back'])
+        self.stats['units_saved_vs_termination'] += max(
+            plan['termination_units_lost'] - plan['units_lost'], 0
+        )
+
+    def resolve(self, cycle):
+        """Preempt units until no deadlock remains"""
+        applied = []
+
+        for _ in range(len(self.monitor.processes) + 1):
+            if not cycle:
+                break
+            plan = self.plan_preemption(cycle)
+            if plan is None:
+                break
+            self._apply(plan)
+            applied.append(plan)
+            cycle = self.monitor.find_deadlock()
+
+        if not applied:
+            return False, "No preemptable resource in cycle"
+        preempted = sum(p['units'] for p in applied)
+        if cycle:
+            return False, f"Preempted {preempted} unit(s) but a cycle remains"
+
+        victims = ', '.join(str(p['victim']) for p in applied)
+        lost = sum(p['units_lost'] for p in applied)
+        return True, f"Preempted {preempted} unit(s) from {victims}, rolled back {lost} unit(s) to last checkpoint"
@@ -0,0 +1,196 @@
+import time
+from collections import deque
+
+def _percentiles(values):
+    if not values:
+        return {'count': 0, 'p50': None, 'p90': None, 'p99': None, 'max': None}
+    values = sorted(values)
+    def rank(q):
+        return values[min(len(values) - 1, int(q * len(values)))]
+    return {'count': len(values), 'p50': rank(0.5), 'p90': rank(0.9), 'p99': rank(0.99), 'max': values[-1]}
+
+class _ResourceStats:
+    __slots__ = ('waits', 'holds', 'grants', 'queue', 'totals')
+
+    def __init__(self, max_samples):
+        # (time, seconds) of finished waits and holds, (time,) of grants and
+        # (time, queue length) whenever the queue changed
+        self.waits = deque(maxlen=max_samples)
+        self.holds = deque(maxlen=max_samples)
+        self.grants = deque(maxlen=max_samples)
+        self.queue = deque(maxlen=max_samples)
+        self.totals = {'grants': 0, 'waits': 0, 'abandoned': 0, 'wait_seconds': 0.0, 'hold_seconds': 0.0}
+
+class ContentionProfiler:
+    """Sliding-window contention statistics fed by RealTimeDeadlockMonitor.
+
+    Per resource it keeps wait and hold durations, grants and queue length
+    changes for the last `window` seconds (at most max_samples each). Time
+    spent waiting is charged to whoever held the resource meanwhile, split
+    evenly between holders and re-split whenever the holders change."""
+    def __init__(self, window=60.0, max_samples=2048, clock=time.monotonic):
+        self.window = window
+        self.max_samples = max_samples
+        self.clock = clock
+        self.reset()
+
+    def reset(self):
+        self.stats = {}
+        # resource -> {process: [wait start, charged until, holders since then]}
+        self.pending_waits = {}
+        # (process, resource) -> grant time
+        self.held_since = {}
+        # (time, holder, seconds of waiting it caused)
+        self.blame = deque(maxlen=self.max_samples * 8)
+
+    def _resource(self, resource_id):
+        stats = self.stats.get(resource_id)
+        if stats is None:
+            stats = self.stats[resource_id] = _ResourceStats(self.max_samples)
+        return stats
+
+    def _charge(self, wait, now):
+        _, since, holders = wait
+        for holder in holders:
+            self.blame.append((now, holder, (now - since) / len(holders)))
+        wait[1] = now
+
+    def wait_started(self, process_id, resource_id, holders, queue_length):
+        now = self.clock()
+        stats = self._resource(resource_id)
+        stats.totals['waits'] += 1
+        stats.queue.append((now, queue_length))
+        waits = self.pending_waits.setdefault(resource_id, {})
+        waits[process_id] = [now, now, tuple(h for h in holders if h != process_id)]
+
+    def _end_wait(self, process_id, resource_id, now):
+        waits = self.pending_waits.get(resource_id)
+        wait = waits.pop(process_id, None) if waits else None
+        if wait is None:
+            return None
+        if not waits:
+            del self.pending_waits[resource_id]
+        self._charge(wait, now)
+        return now - wait[0]
+
+    def holders_changed(self, resource_id, holders):
+        now = self.clock()
+        for process_id, wait in self.pending_waits.get(resource_id, {}).items():
+            self._charge(wait, now)
+            wait[2] = tuple(h for h in holders if h != process_id)
+
+    def wait_ended(self, process_id, resource_id, queue_length):
+        """The wait was dropped without a grant"""
+        now = self.clock()
+        if self._end_wait(process_id, resource_id, now) is None:
+            return
+        stats = self._resource(resource_id)
+        stats.totals['abandoned'] += 1
+        stats.queue.append((now, queue_length))
+
+    def granted(self, process_id, resource_id, queue_length):
+        now = self.clock()
+        stats = self._resource(resource_id)
+        waited = self._end_wait(process_id, resource_id, now)
+        if waited is not None:
+            stats.waits.append((now, waited))
+            stats.totals['wait_seconds'] += waited
+            stats.queue.append((now, queue_length))
+        stats.grants.append((now,))
+        stats.totals['grants'] += 1
+        self.held_since[(process_id, resource_id)] = now
+
+    def released(self, process_id, resource_id, holders):
+        now = self.clock()
+        since = self.held_since.pop((process_id, resource_id), None)
+        if since is not None:
+            stats = self._resource(resource_id)
+            stats.holds.append((now, now - since))
+            stats.totals['hold_seconds'] += now - since
+        self.holders_changed(resource_id, holders)
+
+    def _recent(self, samples, cutoff):
+        while samples and samples[0][0] < cutoff:
+            samples.popleft()
+        return samples
+
+    def resource_report(self, resource_id, queue_length=None, now=None):
+        now = self.clock() if now is None else now
+        cutoff = now - self.window
+        stats = self.stats.get(resource_id)
+        if stats is None:
+            return None
+        waits = [s for _, s in self._recent(stats.waits, cutoff)]
+        holds = [s for _, s in self._recent(stats.holds, cutoff)]
+        grants = len(self._recent(stats.grants, cutoff))
+        queue = self._recent(stats.queue, cutoff)
+        ongoing = [now - wait[0] for wait in self.pending_waits.get(resource_id, {}).values()]
+        if queue_length is None:
+            queue_length = len(ongoing)
+        return {
+            'resource_id': resource_id,
+            'queue_length': queue_length,
+            'peak_queue_length': max([length for _, length in queue] + [queue_length]),
+            'grant_rate': grants / self.window,
+            'wait_seconds': sum(waits) + sum(ongoing),
+            'wait_time': _percentiles(waits),
+            'hold_time': _percentiles(holds),
+            'waiting_now': len(ongoing),
+            'longest_current_wait': max(ongoing, default=0.0),
+            'totals': dict(stats.totals)
+        }
+
+    def hot_resources(self, monitor=None, limit=10):
+        """Resources ranked by time spent waiting on them in the window"""
+        now = self.clock()
+        reports = []
+        for resource_id in list(self.stats):
+            queue_length = None
+            if monitor is not None and resource_id in monitor.resources:
+                queue_length = len(monitor.resources[resource_id].waiters)
+            report = self.resource_report(resource_id, queue_length, now)
+            if monitor is not None and resource_id in monitor.resources:
+                report['name'] = monitor.resources[resource_id].name
+            reports.append(report)
+        reports.sort(key=lambda r: (r['wait_seconds'], r['queue_length'], r['totals']['waits']), reverse=True)
+        return reports[:limit]
+
+    def top_blockers(self, monitor=None, limit=10):
+        """Processes ranked by the waiting they caused in the window, with
+        how many processes they block right now"""
+        now = self.clock()
+        caused = {}
+        for _, holder, seconds in self._recent(self.blame, now - self.window):
+            caused[holder] = caused.get(holder, 0.0) + seconds
+        for waits in self.pending_waits.values():
+            for _, since, holders in waits.values():
+                for holder in holders:
+                    caused[holder] = caused.get(holder, 0.0) + (now - since) / len(holders)
+
+        direct, transitive = {}, {}
+        if monitor is not None:
+            for resource in monitor.resources.values():
+                for holder in resource.holders:
+                    waiting = sum(1 for w in resource.waiters if w != holder)
+                    if waiting:
+                        direct[holder] = direct.get(holder, 0) + waiting
+            transitive = monitor.reachability().blocked_counts()
+
+        ranked = [
+            {
+                'process_id': pid,
+                'blocking_seconds': caused.get(pid, 0.0),
+                'blocking_now': direct.get(pid, 0),
+                'transitively_blocking': transitive.get(pid, 0)
+            }
+            for pid in set(caused) | set(direct) | set(transitive)
+        ]
+        ranked.sort(key=lambda r: (r['blocking_seconds'], r['transitively_blocking'], r['blocking_now']), reverse=True)
+        return ranked[:limit]
+
+    def report(self, monitor=None, limit=10):
+        return {
+            'window_seconds': self.window,
+            'hot_resources': self.hot_resources(monitor, limit),
+            'top_blockers': self.top_blockers(monitor, limit)
+        }
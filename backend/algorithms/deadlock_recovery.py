@@ -1,4 +1,5 @@
 import random
+from algorithms.preemption_planner import PreemptionPlanner
 
 class DeadlockRecovery:
     def __init__(self, processes, resources, allocation):
@@ -76,6 +77,16 @@ class DeadlockRecovery:
         
         return preemption_plan
     
+    def plan_preemption(self, request, available, victims=None, resource_costs=None,
+                        process_weights=None, strategy='auto', max_nodes=256):
+        # Cheapest preemption set that leaves the whole system able to finish
+        planner = PreemptionPlanner(
+            self.allocation, request, available,
+            resource_costs=resource_costs,
+            process_weights=process_weights
+        )
+        return planner.plan(victims=victims, strategy=strategy, max_nodes=max_nodes)
+    
     def _calculate_termination_cost(self, process):
         # Simple cost calculation based on resources held
         return sum(self.allocation[process]) * 10
\ No newline at end of file
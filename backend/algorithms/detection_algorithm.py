@@ -2,12 +2,12 @@ import numpy as np
 from collections import defaultdict
 
 class DeadlockDetection:
-    def __init__(self, processes, resources, allocation, request):
+    def __init__(self, processes, resources, allocation, request, available=None):
         self.processes = processes
         self.resources = resources
         self.allocation = np.array(allocation)
         self.request = np.array(request)
-        self.available = self._calculate_available()
+        self.available = self._calculate_available() if available is None else np.array(available)
         self.steps = []
         
     def _calculate_available(self):
@@ -0,0 +1,213 @@
+import numpy as np
+
+class PreemptionPlanner:
+    """Search for the cheapest set of (process, resource type) preemptions
+    after which every process can run to completion.
+
+    A preempted process gives its units of that type back to the pool and has
+    to re-acquire them, so its outstanding request grows by the same amount.
+    Each candidate set is validated with a vectorized detection reduction."""
+    def __init__(self, allocation, request, available, resource_costs=None, process_weights=None):
+        self.allocation = np.array(allocation, dtype=np.int64)
+        self.request = np.array(request, dtype=np.int64)
+        self.available = np.array(available, dtype=np.int64)
+        self.processes, self.resources = self.allocation.shape
+
+        if resource_costs is None:
+            resource_costs = np.ones(self.resources)
+        if process_weights is None:
+            process_weights = np.ones(self.processes)
+        self.resource_costs = np.array(resource_costs, dtype=float)
+        self.process_weights = np.array(process_weights, dtype=float)
+        self.nodes_explored = 0
+
+    @staticmethod
+    def reduce(work, finish, allocation, request, order=None):
+        """Finish every process whose request fits in work, all at once per
+        round, until nothing changes. Mutates work and finish."""
+        while True:
+            ready = ~finish & (request <= work).all(axis=1)
+            if not ready.any():
+                return finish
+            work += allocation[ready].sum(axis=0)
+            finish |= ready
+            if order is not None:
+                order.extend(np.flatnonzero(ready).tolist())
+
+    def deadlocked(self):
+        finish = np.zeros(self.processes, dtype=bool)
+        self.reduce(self.available.copy(), finish, self.allocation, self.request)
+        return np.flatnonzero(~finish)
+
+    def _candidates(self, victims):
+        procs, types = np.nonzero(self.allocation[victims] > 0)
+        procs = victims[procs]
+        amounts = self.allocation[procs, types]
+        costs = amounts * self.resource_costs[types] * self.process_weights[procs]
+        return procs, types, amounts, costs
+
+    def _is_safe(self, chosen, procs, types, amounts, order=None):
+        allocation = self.allocation.copy()
+        request = self.request.copy()
+        work = self.available.copy()
+        for c in chosen:
+            p, t, a = procs[c], types[c], amounts[c]
+            allocation[p, t] -= a
+            request[p, t] += a
+            work[t] += a
+        finish = np.zeros(self.processes, dtype=bool)
+        self.reduce(work, finish, allocation, request, order)
+        return bool(finish.all())
+
+    def _greedy(self, procs, types, amounts, costs):
+        allocation = self.allocation.copy()
+        request = self.request.copy()
+        work = self.available.copy()
+        finish = np.zeros(self.processes, dtype=bool)
+        self.reduce(work, finish, allocation, request)
+
+        chosen = []
+        remaining = np.ones(len(procs), dtype=bool)
+        safe_costs = np.maximum(costs, 1e-9)
+
+        while not finish.all() and remaining.any():
+            unfinished = np.flatnonzero(~finish)
+            deficit = np.maximum(request[unfinished] - work, 0)
+            blocked_on = (deficit > 0).sum(axis=1)
+
+            # Processes short on exactly one type are unblocked by any single
+            # preemption of that type covering their deficit
+            single = blocked_on == 1
+            single_col = deficit[single].argmax(axis=1)
+            single_amt = deficit[single].max(axis=1)
+
+            gain = np.zeros(len(procs))
+            cover = np.zeros(len(procs))
+            for t in range(self.resources):
+                mask = remaining & (types == t) & ~finish[procs]
+                if not mask.any():
+                    continue
+                need = np.sort(single_amt[single_col == t])
+                gain[mask] = np.searchsorted(need, amounts[mask], side='right')
+
+                col = np.sort(deficit[:, t])
+                prefix = np.concatenate(([0], np.cumsum(col)))
+                idx = np.searchsorted(col, amounts[mask], side='right')
+                cover[mask] = prefix[idx] + amounts[mask] * (len(col) - idx)
+
+            score = np.where(remaining, gain / safe_costs, -np.inf)
+            if score.max() <= 0:
+                score = np.where(remaining, cover / safe_costs, -np.inf)
+            best = int(score.argmax())
+            if score[best] == -np.inf:
+                break
+
+            p, t, a = procs[best], types[best], amounts[best]
+            allocation[p, t] -= a
+            request[p, t] += a
+            work[t] += a
+            remaining[best] = False
+            chosen.append(best)
+            self.nodes_explored += 1
+            self.reduce(work, finish, allocation, request)
+
+        if not finish.all():
+            return None
+
+        # Drop preemptions that turned out to be unnecessary, costliest first
+        for c in sorted(chosen, key=lambda c: -costs[c]):
+            trial = [x for x in chosen if x != c]
+            self.nodes_explored += 1
+            if self._is_safe(trial, procs, types, amounts):
+                chosen = trial
+        return chosen
+
+    def _branch_and_bound(self, procs, types, amounts, costs, best, best_cost, max_nodes):
+        order = np.argsort(costs, kind='stable')
+        exhausted = True
+
+        stack = [(0, [], 0.0)]
+        while stack:
+            if self.nodes_explored >= max_nodes:
+                exhausted = False
+                break
+            pos, chosen, cost = stack.pop()
+            self.nodes_explored += 1
+
+            if chosen and self._is_safe(chosen, procs, types, amounts):
+                if cost < best_cost:
+                    best, best_cost = list(chosen), cost
+                continue
+            if pos >= len(order):
+                continue
+            # Every later item costs at least order[pos], so this bounds the subtree
+            if cost + costs[order[pos]] >= best_cost:
+                continue
+
+            # Exclude first so the include branch is explored next
+            stack.append((pos + 1, chosen, cost))
+            item = order[pos]
+            stack.append((pos + 1, chosen + [item], cost + costs[item]))
+
+        return best, best_cost, exhausted
+
+    def plan(self, victims=None, strategy='auto', max_nodes=256):
+        """strategy: 'greedy', 'branch_and_bound' or 'auto' (greedy bound
+        refined by branch-and-bound within max_nodes)"""
+        self.nodes_explored = 0
+        deadlocked = self.deadlocked()
+        if len(deadlocked) == 0:
+            return {
+                "has_deadlock": False,
+                "preemptions": [],
+                "total_cost": 0,
+                "victims": [],
+                "deadlocked_processes": [],
+                "strategy": strategy,
+                "optimal": True,
+                "nodes_explored": 0
+            }
+
+        victims = deadlocked if victims is None else np.intersect1d(deadlocked, victims)
+        procs, types, amounts, costs = self._candidates(victims)
+
+        best = None
+        best_cost = np.inf
+        exhausted = False
+        if strategy in ('greedy', 'auto'):
+            best = self._greedy(procs, types, amounts, costs)
+            if best is not None:
+                best_cost = float(costs[best].sum())
+        if strategy in ('branch_and_bound', 'auto'):
+            best, best_cost, exhausted = self._branch_and_bound(
+                procs, types, amounts, costs, best, best_cost, max_nodes
+            )
+
+        result = {
+            "has_deadlock": True,
+            "deadlocked_processes": deadlocked.tolist(),
+            "strategy": strategy,
+            "optimal": exhausted,
+            "nodes_explored": self.nodes_explored
+        }
+        if best is None:
+            result.update({"feasible": False, "preemptions": [], "total_cost": None, "victims": []})
+            return result
+
+        sequence = []
+        self._is_safe(best, procs, types, amounts, sequence)
+        preemptions = [{
+            "process": int(procs[c]),
+            "resource_type": int(types[c]),
+            "amount": int(amounts[c]),
+            "cost": float(costs[c])
+        } for c in sorted(best, key=lambda c: (procs[c], types[c]))]
+
+        result.update({
+            "feasible": True,
+            "preemptions": preemptions,
+            "total_cost": float(best_cost),
+            "victims": sorted({p["process"] for p in preemptions}),
+            "completion_sequence": sequence
+        })
+        return result
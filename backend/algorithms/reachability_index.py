@@ -0,0 +1,182 @@
+import numpy as np
+
+# Rows with at most this many bits are decoded bit by bit, denser ones in bulk
+SPARSE_BITS = 32
+
+class ReachabilityIndex:
+    """Transitive closure of a wait-for graph as bit rows.
+
+    Every node gets a bit position; reach[i] has bit j set when node i
+    transitively waits on node j, and above[j] is the transposed row (who
+    is blocked behind j). Rows are Python ints, so they only grow to the
+    highest position they mention. Inserting an edge ORs the new
+    descendants into every ancestor; deleting one marks the index stale and
+    the closure is rebuilt on the next query, one pass over the strongly
+    connected components."""
+    def __init__(self):
+        self.position = {}
+        self.nodes = []
+        self.reach = []
+        self.above = []
+        # (waiter, holder) positions -> number of reasons for the edge
+        self.edges = {}
+        self.stale = False
+        self.stats = {'inserts': 0, 'deletes': 0, 'rebuilds': 0}
+
+    @classmethod
+    def from_edges(cls, edges):
+        index = cls()
+        for waiter, holder in edges:
+            index.add_edge(waiter, holder)
+        return index
+
+    def _node(self, node):
+        i = self.position.get(node)
+        if i is None:
+            i = len(self.nodes)
+            self.position[node] = i
+            self.nodes.append(node)
+            self.reach.append(0)
+            self.above.append(0)
+        return i
+
+    def add_edge(self, waiter, holder):
+        u, v = self._node(waiter), self._node(holder)
+        count = self.edges.get((u, v), 0)
+        self.edges[(u, v)] = count + 1
+        if count or self.stale:
+            return
+        self.stats['inserts'] += 1
+        if self.reach[u] >> v & 1:
+            return
+        gained = self.reach[v] | (1 << v)
+        sources = self.above[u] | (1 << u)
+        for x in _bits(sources):
+            self.reach[x] |= gained
+        for y in _bits(gained):
+            self.above[y] |= sources
+
+    def remove_edge(self, waiter, holder):
+        key = (self.position.get(waiter), self.position.get(holder))
+        count = self.edges.get(key, 0)
+        if count > 1:
+            self.edges[key] = count - 1
+        elif count == 1:
+            del self.edges[key]
+            self.stats['deletes'] += 1
+            self.stale = True
+
+    def _rebuild(self):
+        """Closure from scratch: Tarjan emits components sinks first, so each
+        component's row is the OR of its successors' finished rows"""
+        n = len(self.nodes)
+        successors = [[] for _ in range(n)]
+        for u, v in self.edges:
+            successors[u].append(v)
+        reach = [0] * n
+        index_of = [-1] * n
+        lowlink = [0] * n
+        on_stack = [False] * n
+        stack = []
+        counter = 0
+
+        for root in range(n):
+            if index_of[root] >= 0:
+                continue
+            index_of[root] = lowlink[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = True
+            work = [(root, iter(successors[root]))]
+            while work:
+                node, pending = work[-1]
+                for nxt in pending:
+                    if index_of[nxt] < 0:
+                        index_of[nxt] = lowlink[nxt] = counter
+                        counter += 1
+                        stack.append(nxt)
+                        on_stack[nxt] = True
+                        work.append((nxt, iter(successors[nxt])))
+                        break
+                    if on_stack[nxt]:
+                        lowlink[node] = min(lowlink[node], index_of[nxt])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[node])
+                    if lowlink[node] != index_of[node]:
+                        continue
+                    members = []
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = False
+                        members.append(member)
+                        if member == node:
+                            break
+                    mask = 0
+                    for member in members:
+                        mask |= 1 << member
+                    row = 0
+                    cyclic = len(members) > 1
+                    for member in members:
+                        for nxt in successors[member]:
+                            if mask >> nxt & 1:
+                                cyclic = True
+                            else:
+                                row |= reach[nxt] | (1 << nxt)
+                    if cyclic:
+                        row |= mask
+                    for member in members:
+                        reach[member] = row
+
+        above = [0] * n
+        for x in range(n):
+            bit = 1 << x
+            for y in _bits(reach[x]):
+                above[y] |= bit
+        self.reach, self.above = reach, above
+        self.stale = False
+        self.stats['rebuilds'] += 1
+
+    def _fresh(self):
+        if self.stale:
+            self._rebuild()
+
+    def blockers(self, node):
+        """Everyone node transitively waits on"""
+        self._fresh()
+        i = self.position.get(node)
+        return [] if i is None else [self.nodes[j] for j in _bits(self.reach[i])]
+
+    def blocked(self, node):
+        """Everyone transitively waiting on node"""
+        self._fresh()
+        i = self.position.get(node)
+        return [] if i is None else [self.nodes[j] for j in _bits(self.above[i])]
+
+    def waits_on(self, waiter, holder):
+        self._fresh()
+        u, v = self.position.get(waiter), self.position.get(holder)
+        return u is not None and v is not None and bool(self.reach[u] >> v & 1)
+
+    def deadlocked(self, node):
+        """On a cycle: the node transitively waits on itself"""
+        return self.waits_on(node, node)
+
+    def blocked_counts(self):
+        """node -> how many nodes are transitively blocked behind it"""
+        self._fresh()
+        return {self.nodes[i]: row.bit_count() for i, row in enumerate(self.above) if row}
+
+def _bits(row):
+    """Positions of the set bits, lowest first"""
+    if row.bit_count() <= SPARSE_BITS:
+        positions = []
+        while row:
+            low = row & -row
+            positions.append(low.bit_length() - 1)
+            row ^= low
+        return positions
+    data = row.to_bytes((row.bit_length() + 7) // 8, 'little')
+    return np.flatnonzero(np.unpackbits(np.frombuffer(data, dtype=np.uint8), bitorder='little')).tolist()
@@ -0,0 +1,168 @@
+import heapq
+import itertools
+
+class BankersAvoidance:
+    """Banker's avoidance for RealTimeDeadlockMonitor.
+
+    Processes declare a maximum claim per resource up front; need is the
+    claim minus the units the monitor says are held, and available is the
+    monitor's own count, so neither is ever recomputed from scratch. The
+    current state is safe by induction, so a grant keeps it safe when the
+    requester could finish right after it: one comparison per claimed
+    resource. Only when that fails are the other processes reduced, and
+    only until the requester fits.
+
+    Grants can only make a refused request less safe and releases can only
+    help it, so a refusal is remembered until the next release and
+    re-checking deferred waiters costs nothing in between.
+
+    A grant that skipped the check (recovery or a mirrored real lock) breaks
+    the induction; the next check then verifies the whole state first and
+    refuses everything while it is unsafe."""
+    def __init__(self, monitor):
+        self.monitor = monitor
+        self.reset()
+
+    def reset(self):
+        # process -> {resource: maximum units}
+        self.claims = {}
+        # (process, resource, units) refused since the last release
+        self.refused = set()
+        # False after an unchecked grant, until the state is verified safe
+        self.verified = True
+        self.stats = {'checks': 0, 'fast_path': 0, 'reductions': 0, 'cached': 0, 'deferred': 0,
+                      'unchecked_grants': 0, 'unsafe_refusals': 0}
+
+    def released(self):
+        self.refused.clear()
+
+    def unchecked(self):
+        self.verified = False
+        self.refused.clear()
+        self.stats['unchecked_grants'] += 1
+
+    def declare(self, process_id, claim):
+        if process_id not in self.monitor.processes:
+            raise ValueError(f'Unknown process {process_id!r}')
+        checked = {}
+        for resource_id, units in claim.items():
+            resource = self.monitor.resources.get(resource_id)
+            if resource is None:
+                raise ValueError(f'Claim of {process_id!r} names unknown resource {resource_id!r}')
+            units = int(units)
+            if not 0 <= units <= resource.total:
+                raise ValueError(f'Claim of {process_id!r} on {resource_id!r} must be between 0 and {resource.total}')
+            if units:
+                checked[resource_id] = units
+        self.claims[process_id] = checked
+
+    def check_claim(self, process_id, resource_id, units):
+        """Error message when holding `units` would exceed the claim"""
+        claimed = self.claims.get(process_id, {}).get(resource_id, 0)
+        if units > claimed:
+            return f'Process {process_id} would hold {units} units of {resource_id}, over its maximum claim of {claimed}'
+        return None
+
+    def need(self, process_id):
+        process = self.monitor.processes[process_id]
+        return {rid: units - process.held_units(rid) for rid, units in self.claims.get(process_id, {}).items()}
+
+    def can_grant(self, process_id, resource_id, units, held=None, available=None):
+        """Whether granting keeps the state safe. `held` ((process,
+        resource) -> units) and `available` (resource -> units) override the
+        monitor's counts, so a batch can be checked before it is applied."""
+        monitor = self.monitor
+        self.stats['checks'] += 1
+
+        def held_units(pid, rid):
+            if held is not None and (pid, rid) in held:
+                return held[(pid, rid)]
+            return monitor.processes[pid].held_units(rid)
+
+        def free(rid):
+            if available is not None and rid in available:
+                return available[rid]
+            return monitor.resources[rid].available
+
+        if free(resource_id) < units:
+            return False
+        if not self.verified:
+            self.verified = self._reduce(
+                {rid: r.available for rid, r in monitor.resources.items()},
+                lambda pid, rid: monitor.processes[pid].held_units(rid)
+            )
+            if not self.verified:
+                self.stats['unsafe_refusals'] += 1
+                return False
+        key = (process_id, resource_id, units)
+        overlay = held is not None or available is not None
+        if not overlay and key in self.refused:
+            self.stats['cached'] += 1
+            return False
+        claim = self.claims.get(process_id, {})
+        if all(
+            claimed - held_units(process_id, rid) - (units if rid == resource_id else 0)
+            <= free(rid) - (units if rid == resource_id else 0)
+            for rid, claimed in claim.items()
+        ):
+            self.stats['fast_path'] += 1
+            return True
+
+        self.stats['reductions'] += 1
+        work = {rid: free(rid) for rid in monitor.resources}
+        work[resource_id] -= units
+        if self._reduce(work, held_units, process_id, resource_id, units):
+            return True
+        if not overlay:
+            self.refused.add(key)
+        return False
+
+    def _reduce(self, work, held_units, process_id=None, resource_id=None, units=0):
+        """Whether process_id can finish after being granted `units` of
+        resource_id, or with no process_id whether everyone can finish.
+        
+        Each resource queues the processes it is short for by units needed;
+        finishing a process returns its units and releases every queued need
+        that now fits."""
+        monitor = self.monitor
+        queues = {}
+        short = {}
+        ready = []
+        order = itertools.count()
+        for pid, claim in self.claims.items():
+            if pid not in monitor.processes:
+                continue
+            missing = 0
+            for rid, claimed in claim.items():
+                need = claimed - held_units(pid, rid) - (units if pid == process_id and rid == resource_id else 0)
+                if need > work[rid]:
+                    missing += 1
+                    heapq.heappush(queues.setdefault(rid, []), (need, next(order), pid))
+            if missing:
+                short[pid] = missing
+            elif pid != process_id:
+                ready.append(pid)
+
+        while ready:
+            pid = ready.pop()
+            for rid in self.claims[pid]:
+                work[rid] += held_units(pid, rid)
+                queue = queues.get(rid)
+                while queue and queue[0][0] <= work[rid]:
+                    waiter = heapq.heappop(queue)[2]
+                    short[waiter] -= 1
+                    if short[waiter]:
+                        continue
+                    del short[waiter]
+                    if waiter == process_id:
+                        return True
+                    ready.append(waiter)
+        return process_id is None and not short
+
+    def report(self):
+        return {
+            'claims': self.claims,
+            'need': {pid: self.need(pid) for pid in self.claims if pid in self.monitor.processes},
+            'available': {rid: r.available for rid, r in self.monitor.resources.items()},
+            'stats': dict(self.stats)
+        }
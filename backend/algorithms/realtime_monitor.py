@@ -1,14 +1,114 @@
+import heapq
+import itertools
 import time
 import threading
 from collections import defaultdict, deque
-import asyncio
+
+# Up to this many members a holder/waiter collection is a tuple, then a set
+SMALL_SET = 4
+EMPTY = ()
+
+def _added(members, item):
+    if members is None:
+        return (item,)
+    if isinstance(members, tuple):
+        if item in members:
+            return members
+        if len(members) < SMALL_SET:
+            return members + (item,)
+        members = set(members)
+    members.add(item)
+    return members
+
+def _removed(members, item):
+    if isinstance(members, tuple):
+        if item not in members:
+            return members
+        return tuple(m for m in members if m != item) or None
+    if members is not None:
+        members.discard(item)
+        if not members:
+            return None
+    return members
+
+def _counted(counts, item, units):
+    """Set item's unit count in a dict that leaves out counts of 0 and 1,
+    so it stays None while every count is a single unit"""
+    if units > 1:
+        if counts is None:
+            counts = {}
+        counts[item] = units
+        return counts
+    if counts:
+        counts.pop(item, None)
+    return counts or None
+
+def _valid_units(units):
+    return isinstance(units, int) and not isinstance(units, bool) and units >= 1
+
+class ProcessRecord:
+    """Held and awaited resources are None when empty, a tuple while small
+    and a set beyond that; read them through the properties. Unit counts
+    above one are kept aside in _held_units and _wait_units."""
+    __slots__ = ('name', 'priority', 'timestamp', '_held', '_waits', '_held_units', '_wait_units')
+
+    def __init__(self, name, priority, timestamp):
+        self.name = name
+        self.priority = priority
+        self.timestamp = timestamp
+        self._held = None
+        self._waits = None
+        self._held_units = None
+        self._wait_units = None
+
+    @property
+    def resources(self):
+        return self._held or EMPTY
+
+    @property
+    def waiting_for(self):
+        return self._waits or EMPTY
+
+    def held_units(self, resource_id):
+        if not self._held or resource_id not in self._held:
+            return 0
+        return self._held_units.get(resource_id, 1) if self._held_units else 1
+
+    def wanted_units(self, resource_id):
+        """Units the process is still waiting for"""
+        if not self._waits or resource_id not in self._waits:
+            return 0
+        return self._wait_units.get(resource_id, 1) if self._wait_units else 1
+
+    def __getitem__(self, key):
+        # Records used to be dicts; keep read access by key working
+        return getattr(self, key)
+
+class ResourceRecord:
+    __slots__ = ('name', 'total', 'available', '_holders', '_waiters')
+
+    def __init__(self, name, total):
+        self.name = name
+        self.total = total
+        self.available = total
+        self._holders = None
+        self._waiters = None
+
+    @property
+    def holders(self):
+        return self._holders or EMPTY
+
+    @property
+    def waiters(self):
+        return self._waiters or EMPTY
+
+    def __getitem__(self, key):
+        return getattr(self, key)
 
 class RealTimeDeadlockMonitor:
     def __init__(self):
         self.processes = {}
         self.resources = {}
-        self.allocation_matrix = defaultdict(dict)
-        self.request_matrix = defaultdict(dict)
         self.monitoring = False
         self.deadlock_callbacks = []
         self.event_queue = deque(maxlen=1000)
@@ -19,14 +119,25 @@ class RealTimeDeadlockMonitor:
             'throughput': 0
         }
         self.last_check_time = time.time()
+        self.recovery_engine = None
+        # Processes whose holdings changed since the last checkpoint
+        self._dirty_processes = set()
+        # Transitive wait index, built on first query and then kept current
+        self._reachability = None
+        # Optional ContentionProfiler fed from the grant/wait/release paths
+        self.profiler = None
+        # Optional StarvationDetector fed from the wait paths, checked each cycle
+        self.starvation = None
+        # Optional BankersAvoidance: grants must leave the declared claims safe
+        self.avoidance = None
+        # Held by the monitor thread for each cycle and by batch operations
+        self.lock = threading.RLock()
         
     def reset_system(self):
         """Complete system reset to initial state"""
         self.stop_monitoring()
         self.processes.clear()
         self.resources.clear()
-        self.allocation_matrix.clear()
-        self.request_matrix.clear()
         self.event_queue.clear()
         self.deadlock_callbacks.clear()
         self.performance_metrics = {
@@ -39,25 +150,46 @@ class RealTimeDeadlockMonitor:
         self._session_id = int(time.time())
         self._start_time = time.time()
         self._deadlock_history = []
+        self._dirty_processes.clear()
+        self._reachability = None
+        if self.recovery_engine:
+            self.recovery_engine.reset()
+        if self.profiler:
+            self.profiler.reset()
+        if self.starvation:
+            self.starvation.reset()
+        if self.avoidance:
+            self.avoidance.reset()
         
-    def add_process(self, process_id, name, priority):
-        self.processes[process_id] = {
-            'name': name,
-            'priority': priority,
-            'resources': set(),
-            'waiting_for': set(),
-            'timestamp': time.time()
+    @property
+    def allocation_matrix(self):
+        """process -> {resource: units held}, derived from the process records"""
+        return {
+            pid: {rid: p.held_units(rid) for rid in p._held}
+            for pid, p in self.processes.items() if p._held
         }
         
-    def add_resource(self, resource_id, name, total_instances):
-        self.resources[resource_id] = {
-            'name': name,
-            'total': total_instances,
-            'available': total_instances,
-            'holders': set()
+    @property
+    def request_matrix(self):
+        return {
+            pid: {rid: p.wanted_units(rid) for rid in p._waits}
+            for pid, p in self.processes.items() if p._waits
         }
         
-    def request_resource(self, process_id, resource_id):
+    def add_process(self, process_id, name, priority):
+        self.processes[process_id] = ProcessRecord(name, priority, time.time())
+        self._dirty_processes.add(process_id)
+        
+    def add_resource(self, resource_id, name, total_instances):
+        self.resources[resource_id] = ResourceRecord(name, total_instances)
+        
+    def request_resource(self, process_id, resource_id, units=1):
+        """Ask for `units` more units; all of them are granted at once or
+        the process waits for the whole amount"""
+        with self.lock:
+            return self._request_resource(process_id, resource_id, units)
+        
+    def _request_resource(self, process_id, resource_id, units):
         start_time = time.time()
         
         if resource_id not in self.resources or process_id not in self.processes:
@@ -65,43 +197,200 @@ class RealTimeDeadlockMonitor:
             
         resource = self.resources[resource_id]
         process = self.processes[process_id]
+        if not _valid_units(units):
+            return False, "Units must be a positive integer"
         
-        # Check if already holding or waiting
-        if resource_id in process['resources']:
-            return True, f"Process {process['name']} already holds {resource['name']}"
-        if resource_id in process['waiting_for']:
-            return False, f"Process {process['name']} already waiting for {resource['name']}"
+        # Check if already waiting or asking beyond the total
+        if resource_id in process.waiting_for:
+            return False, f"Process {process.name} already waiting for {resource.name}"
+        held = process.held_units(resource_id)
+        if held + units > resource.total:
+            if held == resource.total:
+                return True, f"Process {process.name} already holds {resource.name}"
+            return False, f"Process {process.name} holds {held} of {resource.total} units of {resource.name}, {units} more exceed the total"
+        if self.avoidance is not None:
+            error = self.avoidance.check_claim(process_id, resource_id, held + units)
+            if error:
+                return False, error
         
-        if resource['available'] > 0:
+        label = resource.name if units == 1 else f"{units} units of {resource.name}"
+        if resource.available >= units and self._safe_to_grant(process_id, resource_id, units):
             # Grant resource immediately
-            resource['available'] -= 1
-            resource['holders'].add(process_id)
-            process['resources'].add(resource_id)
-            self.allocation_matrix[process_id][resource_id] = 1
+            self._grant(process_id, resource_id, units, checked=True)
             
             self._log_event('GRANT', process_id, resource_id, start_time)
             self.performance_metrics['requests_processed'] += 1
-            return True, f"Resource {resource['name']} granted to {process['name']}"
+            return True, f"Resource {label} granted to {process.name}"
         else:
             # Process must wait
-            process['waiting_for'].add(resource_id)
-            self.request_matrix[process_id][resource_id] = 1
+            self._wait(process_id, resource_id, units)
             
             self._log_event('WAIT', process_id, resource_id, start_time)
-            return False, f"Process {process['name']} waiting for {resource['name']}"
+            if resource.available >= units:
+                self.avoidance.stats['deferred'] += 1
+                return False, f"Process {process.name} waiting for {label}, granting it now would be unsafe"
+            return False, f"Process {process.name} waiting for {label}"
             
-    def release_resource(self, process_id, resource_id):
-        if resource_id in self.processes[process_id]['resources']:
-            resource = self.resources[resource_id]
-            process = self.processes[process_id]
-            
-            resource['available'] += 1
-            resource['holders'].discard(process_id)
-            process['resources'].discard(resource_id)
-            self.allocation_matrix[process_id].pop(resource_id, None)
+    def _safe_to_grant(self, process_id, resource_id, units):
+        return self.avoidance is None or self.avoidance.can_grant(process_id, resource_id, units)
+        
+    def _try_grant(self, process_id, resource_id):
+        """Grant a waiting request when its units are free and, in avoidance
+        mode, the grant leaves the state safe"""
+        wanted = self.processes[process_id].wanted_units(resource_id)
+        if self.resources[resource_id].available < wanted or not self._safe_to_grant(process_id, resource_id, wanted):
+            return False
+        self._grant(process_id, resource_id, checked=True)
+        return True
             
-            return True, f"Resource {resource['name']} released by {process['name']}"
-        return False, "Resource not held by process"
+    def release_resource(self, process_id, resource_id, units=None):
+        """Give back `units` units, all held units by default"""
+        with self.lock:
+            return self._release_resource(process_id, resource_id, units)
+        
+    def _release_resource(self, process_id, resource_id, units):
+        process = self.processes[process_id]
+        held = process.held_units(resource_id)
+        if not held:
+            return False, "Resource not held by process"
+        resource = self.resources[resource_id]
+        if units is None:
+            units = held
+        if not _valid_units(units):
+            return False, "Units must be a positive integer"
+        if units > held:
+            return False, f"Process {process.name} holds {held} units of {resource.name}, cannot release {units}"
+        
+        resource.available += units
+        process._held_units = _counted(process._held_units, resource_id, held - units)
+        self._dirty_processes.add(process_id)
+        if self.avoidance is not None:
+            self.avoidance.released()
+        if units < held:
+            return True, f"Released {units} of {held} units of {resource.name} held by {process.name}"
+        
+        resource._holders = _removed(resource._holders, process_id)
+        process._held = _removed(process._held, resource_id)
+        if self.profiler is not None:
+            self.profiler.released(process_id, resource_id, resource.holders)
+        if self._reachability is not None:
+            for waiter in resource.waiters:
+                if waiter != process_id:
+                    self._reachability.remove_edge(waiter, process_id)
+        
+        return True, f"Resource {resource.name} released by {process.name}"
+        
+    def _grant(self, process_id, resource_id, units=None, checked=False):
+        """Hand units of a resource to a process and clear its wait on it;
+        by default the units it is waiting for, or one. `checked` marks a
+        grant that already passed avoidance."""
+        resource = self.resources[resource_id]
+        process = self.processes[process_id]
+        if self.avoidance is not None and not checked:
+            self.avoidance.unchecked()
+        if units is None:
+            units = process.wanted_units(resource_id) or 1
+        held = process.held_units(resource_id)
+        
+        if self.profiler is not None:
+            waiting = len(resource.waiters) - (resource_id in process.waiting_for)
+            self.profiler.granted(process_id, resource_id, waiting)
+        self._unwait(process_id, resource_id)
+        resource.available -= units
+        process._held_units = _counted(process._held_units, resource_id, held + units)
+        self._dirty_processes.add(process_id)
+        if held:
+            # Already a holder: holders and wait-for edges are unchanged
+            return
+        resource._holders = _added(resource._holders, process_id)
+        process._held = _added(process._held, resource_id)
+        if self.profiler is not None:
+            self.profiler.holders_changed(resource_id, resource.holders)
+        if self._reachability is not None:
+            for waiter in resource.waiters:
+                if waiter != process_id:
+                    self._reachability.add_edge(waiter, process_id)
+        
+    def _wait(self, process_id, resource_id, units=1):
+        process = self.processes[process_id]
+        resource = self.resources[resource_id]
+        if resource_id in process.waiting_for:
+            return
+        process._waits = _added(process._waits, resource_id)
+        process._wait_units = _counted(process._wait_units, resource_id, units)
+        resource._waiters = _added(resource._waiters, process_id)
+        if self.profiler is not None:
+            self.profiler.wait_started(process_id, resource_id, resource.holders, len(resource.waiters))
+        if self.starvation is not None:
+            self.starvation.wait_started(process_id, resource_id)
+        if self._reachability is not None:
+            for holder in resource.holders:
+                if holder != process_id:
+                    self._reachability.add_edge(process_id, holder)
+        
+    def _unwait(self, process_id, resource_id=None):
+        """Drop one wait, or all of them when resource_id is None"""
+        process = self.processes[process_id]
+        for waited in (tuple(process.waiting_for) if resource_id is None else (resource_id,)):
+            if waited not in process.waiting_for:
+                continue
+            resource = self.resources[waited]
+            process._waits = _removed(process._waits, waited)
+            process._wait_units = _counted(process._wait_units, waited, 0)
+            resource._waiters = _removed(resource._waiters, process_id)
+            if self.profiler is not None:
+                self.profiler.wait_ended(process_id, waited, len(resource.waiters))
+            if self.starvation is not None:
+                self.starvation.wait_ended(process_id, waited)
+            if self._reachability is not None:
+                for holder in resource.holders:
+                    if holder != process_id:
+                        self._reachability.remove_edge(process_id, holder)
+        
+    def reachability(self):
+        """Transitive wait index over the process wait-for graph; built
+        from the current state on first use and maintained from then on"""
+        if self._reachability is None:
+            from algorithms.reachability_index import ReachabilityIndex
+            index = ReachabilityIndex()
+            for process_id, process in self.processes.items():
+                for resource_id in process.waiting_for:
+                    for holder in self.resources[resource_id].holders:
+                        if holder != process_id:
+                            index.add_edge(process_id, holder)
+            self._reachability = index
+        return self._reachability
+        
+    def blocking_report(self, process_id=None, resource_id=None):
+        """Who is transitively blocked behind a process or resource, and
+        whom it transitively waits on. `deadlocked` follows the detection
+        reduction, like find_deadlock, rather than cycle membership"""
+        index = self.reachability()
+        stuck = self.deadlocked_processes()
+        if process_id is not None:
+            if process_id not in self.processes:
+                raise ValueError(f'Unknown process {process_id!r}')
+            return {
+                'process_id': process_id,
+                'blocked': index.blocked(process_id),
+                'blockers': index.blockers(process_id),
+                'deadlocked': process_id in stuck
+            }
+        if resource_id not in self.resources:
+            raise ValueError(f'Unknown resource {resource_id!r}')
+        resource = self.resources[resource_id]
+        blocked = dict.fromkeys(resource.waiters)
+        for waiter in resource.waiters:
+            blocked.update(dict.fromkeys(index.blocked(waiter)))
+        blockers = dict.fromkeys(resource.holders)
+        for holder in resource.holders:
+            blockers.update(dict.fromkeys(index.blockers(holder)))
+        return {
+            'resource_id': resource_id,
+            'blocked': list(blocked),
+            'blockers': list(blockers),
+            'deadlocked': any(h in stuck for h in resource.holders)
+        }
         
     def detect_deadlock(self):
         # Fast deadlock detection using optimized algorithm
@@ -113,23 +402,99 @@ class RealTimeDeadlockMonitor:
         
         self.last_check_time = current_time
         
+        cycle = self.find_deadlock()
+        if cycle:
+            self.performance_metrics['deadlocks_detected'] += 1
+            # Log deadlock occurrence
+            deadlock_event = {
+                'timestamp': current_time,
+                'type': 'DEADLOCK_DETECTED',
+                'cycle': cycle,
+                'affected_processes': cycle
+            }
+            if not hasattr(self, '_deadlock_history'):
+                self._deadlock_history = []
+            self._deadlock_history.append(deadlock_event)
+            return True, cycle
+            
+        return False, []
+        
+    def find_deadlock(self):
+        """Return a cycle of deadlocked processes, or [] when there is none.
+        
+        A wait-for cycle is a deadlock when every awaited resource has a
+        single unit. With multi-unit resources other holders may still free
+        enough units, so the cycle is confirmed by the detection reduction
+        and then looked for among the processes the reduction cannot finish."""
+        cycle = self.find_cycle()
+        if not cycle:
+            return []
+        if all(
+            self.resources[rid].total == 1
+            for process in self.processes.values() if process._waits
+            for rid in process._waits
+        ):
+            return cycle
+        stuck = self.deadlocked_processes()
+        return self.find_cycle(among=stuck) if stuck else []
+        
+    def deadlocked_processes(self):
+        """Processes the detection reduction cannot finish.
+        
+        Each resource queues its unsatisfied waits by units wanted; finishing
+        a process returns its units and pops every wait that now fits, so a
+        process becomes finishable once its count of unsatisfied waits hits
+        zero. O((n + e) log e) for e waits instead of repeated full passes."""
+        work = {rid: resource.available for rid, resource in self.resources.items()}
+        queues = {}
+        blocked = {}
+        ready = []
+        order = itertools.count()
+        for pid, process in self.processes.items():
+            unsatisfied = 0
+            for rid in process.waiting_for:
+                wanted = process.wanted_units(rid)
+                if wanted > work[rid]:
+                    unsatisfied += 1
+                    heapq.heappush(queues.setdefault(rid, []), (wanted, next(order), pid))
+            if unsatisfied:
+                blocked[pid] = unsatisfied
+            elif process._held:
+                ready.append(pid)
+        
+        while ready:
+            process = self.processes[ready.pop()]
+            for rid in process.resources:
+                work[rid] += process.held_units(rid)
+                queue = queues.get(rid)
+                while queue and queue[0][0] <= work[rid]:
+                    waiter = heapq.heappop(queue)[2]
+                    blocked[waiter] -= 1
+                    if not blocked[waiter]:
+                        del blocked[waiter]
+                        ready.append(waiter)
+        return set(blocked)
+        
+    def find_cycle(self, among=None):
+        """Return one wait-for cycle without throttling or recording metrics,
+        optionally only through the processes in `among`"""
         # Build adjacency list for wait-for graph
         wait_graph = defaultdict(list)
         waiting_processes = set()
         
         for proc_id, process in self.processes.items():
-            if process['waiting_for']:
+            if process._waits and (among is None or proc_id in among):
                 waiting_processes.add(proc_id)
-                for resource_id in process['waiting_for']:
+                for resource_id in process._waits:
                     # Check if the resource exists and has holders
                     if resource_id in self.resources:
-                        for holder_id in self.resources[resource_id]['holders']:
-                            if holder_id != proc_id:
+                        for holder_id in self.resources[resource_id].holders:
+                            if holder_id != proc_id and (among is None or holder_id in among):
                                 wait_graph[proc_id].append(holder_id)
         
         # Fast cycle detection using DFS with early termination
         if len(waiting_processes) < 2:
-            return False, []
+            return []
             
         visited = set()
         rec_stack = set()
@@ -153,7 +518,6 @@ class RealTimeDeadlockMonitor:
             for neighbor in wait_graph[node]:
                 cycle = find_cycle(neighbor, path.copy())
                 if cycle:
-                    self.performance_metrics['deadlocks_detected'] += 1
                     return cycle
                     
             rec_stack.remove(node)
@@ -163,40 +527,30 @@ class RealTimeDeadlockMonitor:
             if process_id not in visited:
                 cycle = find_cycle(process_id)
                 if cycle:
-                    # Log deadlock occurrence
-                    deadlock_event = {
-                        'timestamp': current_time,
-                        'type': 'DEADLOCK_DETECTED',
-                        'cycle': cycle,
-                        'affected_processes': cycle
-                    }
-                    if not hasattr(self, '_deadlock_history'):
-                        self._deadlock_history = []
-                    self._deadlock_history.append(deadlock_event)
-                    return True, cycle
+                    return cycle
                     
-        return False, []
+        return []
         
     def get_system_state(self):
         return {
             'processes': {
                 pid: {
-                    'name': p['name'],
-                    'priority': p['priority'],
-                    'resources': list(p['resources']),
-                    'waiting_for': list(p['waiting_for'])
+                    'name': p.name,
+                    'priority': p.priority,
+                    'resources': list(p.resources),
+                    'waiting_for': list(p.waiting_for)
                 } for pid, p in self.processes.items()
             },
             'resources': {
                 rid: {
-                    'name': r['name'],
-                    'total': r['total'],
-                    'available': r['available'],
-                    'holders': list(r['holders'])
+                    'name': r.name,
+                    'total': r.total,
+                    'available': r.available,
+                    'holders': list(r.holders)
                 } for rid, r in self.resources.items()
             },
-            'allocation_matrix': dict(self.allocation_matrix),
-            'request_matrix': dict(self.request_matrix)
+            'allocation_matrix': self.allocation_matrix,
+            'request_matrix': self.request_matrix
         }
         
     def get_full_simulation_log(self):
@@ -218,16 +572,22 @@ class RealTimeDeadlockMonitor:
         
         def monitor_loop():
             while self.monitoring:
-                has_deadlock, cycle = self.detect_deadlock()
-                if has_deadlock:
-                    # Auto-resolve if enabled, otherwise notify callbacks
-                    resolved, message = self.auto_resolve_deadlock(cycle)
-                    if not resolved:
-                        for callback in self.deadlock_callbacks:
-                            callback(cycle)
-                            
-                # Process any waiting requests that can now be granted
-                self._process_waiting_queue()
+                with self.lock:
+                    if self.recovery_engine:
+                        self.recovery_engine.take_checkpoint()
+                        
+                    has_deadlock, cycle = self.detect_deadlock()
+                    if has_deadlock:
+                        # Auto-resolve if enabled, otherwise notify callbacks
+                        resolved, message = self.auto_resolve_deadlock(cycle)
+                        if not resolved:
+                            for callback in self.deadlock_callbacks:
+                                callback(cycle)
+                                
+                    # Process any waiting requests that can now be granted
+                    self._process_waiting_queue()
+                    if self.starvation:
+                        self.starvation.check()
                 time.sleep(interval)
                 
         monitor_thread = threading.Thread(target=monitor_loop)
@@ -235,24 +595,91 @@ class RealTimeDeadlockMonitor:
         monitor_thread.start()
         
     def _process_waiting_queue(self):
-        """Process waiting requests when resources become available"""
-        for proc_id, process in self.processes.items():
-            waiting_copy = process['waiting_for'].copy()
-            for resource_id in waiting_copy:
-                if self.resources[resource_id]['available'] > 0:
-                    # Try to grant the resource
-                    process['waiting_for'].discard(resource_id)
-                    self.request_matrix[proc_id].pop(resource_id, None)
-                    
-                    # Grant resource
-                    resource = self.resources[resource_id]
-                    resource['available'] -= 1
-                    resource['holders'].add(proc_id)
-                    process['resources'].add(resource_id)
-                    self.allocation_matrix[proc_id][resource_id] = 1
-                    
+        """Process waiting requests when resources become available,
+        higher priority first so aged processes get served"""
+        waiting = [pid for pid, process in self.processes.items() if process._waits]
+        waiting.sort(key=self._get_priority_value, reverse=True)
+        for proc_id in waiting:
+            process = self.processes[proc_id]
+            for resource_id in tuple(process.waiting_for):
+                if self._try_grant(proc_id, resource_id):
                     self._log_event('AUTO_GRANT', proc_id, resource_id, time.time())
         
+    def apply_batch(self, operations):
+        """Apply request/release operations all or nothing: the batch is
+        checked against the current state first, and nothing changes if any
+        operation would fail. Each operation is {'op': 'request'|'release',
+        'process_id', 'resource_id', 'units'}."""
+        with self.lock:
+            self._check_batch(operations)
+            results = []
+            for op in operations:
+                if op['op'] == 'request':
+                    success, message = self.request_resource(op['process_id'], op['resource_id'], op.get('units', 1))
+                else:
+                    success, message = self.release_resource(op['process_id'], op['resource_id'], op.get('units'))
+                results.append({
+                    'op': op['op'],
+                    'process_id': op['process_id'],
+                    'resource_id': op['resource_id'],
+                    'success': success,
+                    'message': message
+                })
+            return results
+        
+    def _check_batch(self, operations):
+        """Replay the batch on unit counts only, with the same checks as
+        request_resource and release_resource; raises ValueError naming the
+        first operation that would fail"""
+        held = {}
+        available = {}
+        waiting = set()
+        for i, op in enumerate(operations):
+            kind = op.get('op')
+            process_id, resource_id = op.get('process_id'), op.get('resource_id')
+            if kind not in ('request', 'release'):
+                raise ValueError(f"Operation {i}: unknown op {kind!r}, expected request or release")
+            if process_id not in self.processes or resource_id not in self.resources:
+                raise ValueError(f"Operation {i}: invalid process or resource")
+            units = op.get('units', 1 if kind == 'request' else None)
+            if units is not None and not _valid_units(units):
+                raise ValueError(f"Operation {i}: units must be a positive integer")
+            
+            process, resource = self.processes[process_id], self.resources[resource_id]
+            key = (process_id, resource_id)
+            if key not in held:
+                held[key] = process.held_units(resource_id)
+            if resource_id not in available:
+                available[resource_id] = resource.available
+            
+            if kind == 'request':
+                if key in waiting or resource_id in process.waiting_for:
+                    raise ValueError(f"Operation {i}: process {process_id} already waiting for {resource_id}")
+                if held[key] + units > resource.total:
+                    if held[key] == resource.total:
+                        # request_resource reports this as already held
+                        continue
+                    raise ValueError(f"Operation {i}: {held[key] + units} units of {resource_id} exceed its total of {resource.total}")
+                if self.avoidance is not None:
+                    error = self.avoidance.check_claim(process_id, resource_id, held[key] + units)
+                    if error:
+                        raise ValueError(f"Operation {i}: {error}")
+                if available[resource_id] >= units and (
+                    self.avoidance is None
+                    or self.avoidance.can_grant(process_id, resource_id, units, held, available)
+                ):
+                    available[resource_id] -= units
+                    held[key] += units
+                else:
+                    waiting.add(key)
+            else:
+                if units is None:
+                    units = held[key]
+                if not held[key] or units > held[key]:
+                    raise ValueError(f"Operation {i}: process {process_id} holds {held[key]} units of {resource_id}, cannot release {units or 1}")
+                held[key] -= units
+                available[resource_id] += units
+        
     def stop_monitoring(self):
         self.monitoring = False
         
@@ -261,16 +688,12 @@ class RealTimeDeadlockMonitor:
         
     def _would_cause_deadlock(self, process_id, resource_id):
         """Fast check if granting request would cause immediate deadlock"""
-        # Simulate adding the wait relationship
-        temp_waiting = self.processes[process_id]['waiting_for'].copy()
-        temp_waiting.add(resource_id)
-        
         # Check if this creates a simple cycle
-        for holder_id in self.resources[resource_id]['holders']:
+        for holder_id in self.resources[resource_id].holders:
             if holder_id != process_id:
                 # Check if holder is waiting for any resource held by process_id
-                holder_waiting = self.processes[holder_id]['waiting_for']
-                process_resources = self.processes[process_id]['resources']
+                holder_waiting = self.processes[holder_id].waiting_for
+                process_resources = self.processes[process_id].resources
                 
                 if any(res in process_resources for res in holder_waiting):
                     return True
@@ -284,8 +707,8 @@ class RealTimeDeadlockMonitor:
             'process_id': process_id,
             'resource_id': resource_id,
             'response_time': time.time() - start_time,
-            'process_name': self.processes[process_id]['name'],
-            'resource_name': self.resources[resource_id]['name']
+            'process_name': self.processes[process_id].name,
+            'resource_name': self.resources[resource_id].name
         }
         self.event_queue.append(event)
         
@@ -309,20 +732,24 @@ class RealTimeDeadlockMonitor:
         if not cycle:
             return False, "No cycle to resolve"
             
+        # Partial preemption with rollback when a recovery engine is attached
+        if self.recovery_engine:
+            return self.recovery_engine.resolve(cycle)
+            
         # Find lowest priority process in cycle
         min_priority_proc = min(cycle, key=lambda p: self._get_priority_value(p))
         
         # Terminate process (release all resources)
-        terminated_resources = list(self.processes[min_priority_proc]['resources'])
+        terminated_resources = list(self.processes[min_priority_proc].resources)
         for resource_id in terminated_resources:
             self.release_resource(min_priority_proc, resource_id)
             
         # Clear waiting requests
-        self.processes[min_priority_proc]['waiting_for'].clear()
+        self._unwait(min_priority_proc)
         
         return True, f"Process {min_priority_proc} terminated to resolve deadlock"
         
     def _get_priority_value(self, process_id):
         """Convert priority to numeric value for comparison"""
         priority_map = {'High': 3, 'Medium': 2, 'Low': 1}
-        return priority_map.get(self.processes[process_id]['priority'], 1)
\ No newline at end of file
+        return priority_map.get(self.processes[process_id].priority, 1)
\ No newline at end of file
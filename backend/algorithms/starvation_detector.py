@@ -0,0 +1,181 @@
+import heapq
+import itertools
+import time
+from collections import deque
+
+PRIORITY_LEVELS = ('Low', 'Medium', 'High')
+ACTIONS = ('alert', 'age', 'preempt')
+# action -> escalation level it starts at (None disables it); a wait reaches
+# level k after k * threshold seconds. Aging and preemption change priorities
+# and holdings, so only alerts are on unless configured.
+DEFAULT_ACTIONS = {'alert': 1, 'age': None, 'preempt': None}
+
+class StarvationDetector:
+    """Finds waits that outlast `threshold` seconds without scanning every
+    process.
+
+    Each wait pushes its deadline onto a min-heap. A finished wait only
+    drops its token, and the stale heap entry is skipped when it surfaces.
+    check() pops crossed deadlines alone, O(log n) each, fires the actions
+    due at that escalation level and re-arms the wait one threshold later."""
+    def __init__(self, monitor, threshold=5.0, actions=None, clock=time.monotonic, max_alerts=1000):
+        actions = dict(DEFAULT_ACTIONS if actions is None else actions)
+        unknown = [a for a in actions if a not in ACTIONS]
+        if unknown:
+            raise ValueError(f"Unknown starvation action(s) {', '.join(unknown)}, expected: {', '.join(ACTIONS)}")
+        if threshold <= 0:
+            raise ValueError('Starvation threshold must be positive')
+        self.monitor = monitor
+        self.threshold = threshold
+        self.actions = actions
+        self.clock = clock
+        self.callbacks = []
+        self.alerts = deque(maxlen=max_alerts)
+        self.reset()
+
+    def reset(self):
+        self.heap = []
+        # (process, resource) -> (token, wait start) for every open wait
+        self.tokens = {}
+        # (process, resource) -> latest crossing, for waits past the threshold
+        self.starving = {}
+        # process -> priority before aging
+        self.aged = {}
+        self.stats = {'crossings': 0, 'stale_skipped': 0, 'alerts': 0, 'aged': 0, 'preempted': 0}
+        self._tokens = itertools.count()
+
+    def wait_started(self, process_id, resource_id):
+        token = next(self._tokens)
+        now = self.clock()
+        self.tokens[(process_id, resource_id)] = (token, now)
+        heapq.heappush(self.heap, (now + self.threshold, token, process_id, resource_id, 1))
+
+    def wait_ended(self, process_id, resource_id):
+        if self.tokens.pop((process_id, resource_id), None) is None:
+            return
+        if self.starving.pop((process_id, resource_id), None) is None or process_id not in self.aged:
+            return
+        # Served: aging ends once none of the process's waits is starving
+        if not any(pid == process_id for pid, _ in self.starving):
+            process = self.monitor.processes.get(process_id)
+            original = self.aged.pop(process_id)
+            if process is not None:
+                process.priority = original
+
+    def check(self, now=None):
+        """Handle every deadline crossed by `now`; returns the crossings"""
+        now = self.clock() if now is None else now
+        crossed = []
+        while self.heap and self.heap[0][0] <= now:
+            deadline, token, process_id, resource_id, level = heapq.heappop(self.heap)
+            key = (process_id, resource_id)
+            current = self.tokens.get(key)
+            if current is None or current[0] != token:
+                self.stats['stale_skipped'] += 1
+                continue
+
+            self.stats['crossings'] += 1
+            crossing = {
+                'process_id': process_id,
+                'resource_id': resource_id,
+                'waited': now - current[1],
+                'level': level,
+                'actions': []
+            }
+            self.starving[key] = crossing
+            for action in ACTIONS:
+                start = self.actions.get(action)
+                if start is not None and level >= start and key in self.tokens:
+                    if getattr(self, f'_{action}')(process_id, resource_id, crossing):
+                        crossing['actions'].append(action)
+            if key in self.tokens:
+                heapq.heappush(self.heap, (deadline + self.threshold, token, process_id, resource_id, level + 1))
+            crossed.append(crossing)
+        return crossed
+
+    def _alert(self, process_id, resource_id, crossing):
+        process = self.monitor.processes[process_id]
+        alert = {
+            'timestamp': time.time(),
+            'type': 'STARVATION',
+            'process_id': process_id,
+            'process_name': process.name,
+            'priority': process.priority,
+            'resource_id': resource_id,
+            'holders': list(self.monitor.resources[resource_id].holders),
+            'waited': crossing['waited'],
+            'level': crossing['level']
+        }
+        self.alerts.append(alert)
+        self.stats['alerts'] += 1
+        self.monitor._log_event('STARVATION', process_id, resource_id, time.time())
+        for callback in self.callbacks:
+            callback(alert)
+        return True
+
+    def _age(self, process_id, resource_id, crossing):
+        """Raise the waiter one priority level"""
+        process = self.monitor.processes[process_id]
+        level = PRIORITY_LEVELS.index(process.priority) if process.priority in PRIORITY_LEVELS else 0
+        if level + 1 >= len(PRIORITY_LEVELS):
+            return False
+        self.aged.setdefault(process_id, process.priority)
+        process.priority = PRIORITY_LEVELS[level + 1]
+        self.stats['aged'] += 1
+        return True
+
+    def _preempt(self, process_id, resource_id, crossing):
+        """Take units from holders of strictly lower priority than the
+        waiter, lowest first, which queue for them again, until the starving
+        waiter's request fits; nothing is taken unless the grant will pass"""
+        monitor = self.monitor
+        resource = monitor.resources[resource_id]
+        wanted = monitor.processes[process_id].wanted_units(resource_id)
+        priority = monitor._get_priority_value(process_id)
+        holders = sorted(
+            (h for h in resource.holders if h != process_id and monitor._get_priority_value(h) < priority),
+            key=monitor._get_priority_value
+        )
+        victims = []
+        freed = resource.available
+        for victim in holders:
+            if freed >= wanted:
+                break
+            victims.append(victim)
+            freed += monitor.processes[victim].held_units(resource_id)
+        if freed < wanted:
+            return False
+        if monitor.avoidance is not None and not monitor.avoidance.can_grant(
+            process_id, resource_id, wanted,
+            held={(victim, resource_id): 0 for victim in victims},
+            available={resource_id: freed}
+        ):
+            return False
+
+        for victim in victims:
+            units = monitor.processes[victim].held_units(resource_id) + monitor.processes[victim].wanted_units(resource_id)
+            monitor.release_resource(victim, resource_id)
+            monitor._unwait(victim, resource_id)
+            monitor._wait(victim, resource_id, units)
+            monitor._log_event('STARVATION_PREEMPT', victim, resource_id, time.time())
+        if not monitor._try_grant(process_id, resource_id):
+            return False
+        monitor._log_event('AUTO_GRANT', process_id, resource_id, time.time())
+        self.stats['preempted'] += 1
+        return True
+
+    def report(self, limit=100):
+        now = self.clock()
+        starving = [
+            dict(crossing, waited=now - self.tokens[key][1])
+            for key, crossing in self.starving.items() if key in self.tokens
+        ]
+        starving.sort(key=lambda c: c['waited'], reverse=True)
+        return {
+            'threshold': self.threshold,
+            'actions': self.actions,
+            'open_waits': len(self.tokens),
+            'starving': starving[:limit],
+            'alerts': list(self.alerts)[-limit:],
+            'stats': dict(self.stats)
+        }
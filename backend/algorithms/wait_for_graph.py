@@ -16,38 +16,87 @@ class WaitForGraph:
             self.in_degree[to_process] -= 1
             
     def detect_deadlock(self):
-        # Use DFS to detect cycles
+        # Iterative DFS so long wait chains do not hit the recursion limit
         visited = set()
-        rec_stack = set()
-        deadlock_cycle = []
         
-        def dfs(node, path):
-            if node in rec_stack:
-                cycle_start = path.index(node)
-                return path[cycle_start:]
-            
-            if node in visited:
-                return None
+        for start in range(self.processes):
+            if start in visited:
+                continue
                 
-            visited.add(node)
-            rec_stack.add(node)
-            path.append(node)
+            visited.add(start)
+            path = [start]
+            on_path = {start}
+            neighbors = [iter(self.graph.get(start, ()))]
             
-            for neighbor in self.graph[node]:
-                cycle = dfs(neighbor, path.copy())
-                if cycle:
-                    return cycle
+            while neighbors:
+                for neighbor in neighbors[-1]:
+                    if neighbor in on_path:
+                        cycle_start = path.index(neighbor)
+                        return True, path[cycle_start:]
+                    if neighbor not in visited:
+                        visited.add(neighbor)
+                        on_path.add(neighbor)
+                        path.append(neighbor)
+                        neighbors.append(iter(self.graph.get(neighbor, ())))
+                        break
+                else:
+                    neighbors.pop()
+                    on_path.discard(path.pop())
                     
-            rec_stack.remove(node)
-            return None
+        return False, []
+    
+    def deadlocked_components(self):
+        """Strongly connected components that contain a cycle (iterative Tarjan)"""
+        index_of = {}
+        lowlink = {}
+        on_stack = set()
+        stack = []
+        components = []
+        counter = 0
         
-        for process in range(self.processes):
-            if process not in visited:
-                cycle = dfs(process, [])
-                if cycle:
-                    return True, cycle
+        nodes = set(range(self.processes)) | set(self.graph.keys())
+        for root in sorted(nodes):
+            if root in index_of:
+                continue
+            work = [(root, iter(self.graph.get(root, ())))]
+            index_of[root] = lowlink[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+            
+            while work:
+                node, neighbors = work[-1]
+                advanced = False
+                for neighbor in neighbors:
+                    if neighbor not in index_of:
+                        index_of[neighbor] = lowlink[neighbor] = counter
+                        counter += 1
+                        stack.append(neighbor)
+                        on_stack.add(neighbor)
+                        work.append((neighbor, iter(self.graph.get(neighbor, ()))))
+                        advanced = True
+                        break
+                    if neighbor in on_stack:
+                        lowlink[node] = min(lowlink[node], index_of[neighbor])
+                if advanced:
+                    continue
                     
-        return False, []
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index_of[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    if len(component) > 1 or node in self.graph.get(node, ()):
+                        components.append(sorted(component))
+                        
+        return components
     
     def get_graph_data(self):
         edges = []
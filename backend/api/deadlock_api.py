@@ -1,26 +1,39 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, send_file, stream_with_context, url_for
 from algorithms.bankers_algorithm import BankersAlgorithm
 from algorithms.wait_for_graph import WaitForGraph
 from algorithms.deadlock_recovery import DeadlockRecovery
 from algorithms.detection_algorithm import DeadlockDetection
 from algorithms.prevention_strategies import DeadlockPrevention
 from algorithms.realtime_monitor import RealTimeDeadlockMonitor
+from algorithms.checkpoint_recovery import CheckpointRecovery
+from algorithms.contention_profiler import ContentionProfiler
+from algorithms.starvation_detector import StarvationDetector
+from algorithms.realtime_avoidance import BankersAvoidance
 from models.simulation import Simulation
-from reports.report_generator import ReportGenerator
+from reports.job_queue import ReportJobQueue
+from api.result_cache import ResultCache
+from api.wire_format import request_payload, respond
 import json
 
 deadlock_bp = Blueprint('deadlock', __name__)
 
+# Shared by the deterministic analysis endpoints below
+result_cache = ResultCache()
+
+# PDF rendering and exports run off the request thread
+report_jobs = ReportJobQueue()
+
 @deadlock_bp.route('/bankers', methods=['POST'])
+@result_cache.cached
 def bankers_algorithm():
-    data = request.json
-    
     try:
+        data = request_payload()
+        
         banker = BankersAlgorithm(
             data['processes'],
             data['resources'],
             data['allocation'],
-            data.get('max_need') or data.get('maxNeed'),
+            data['max_need'] if 'max_need' in data else data.get('maxNeed'),
             data['available']
         )
         
@@ -31,43 +44,46 @@ def bankers_algorithm():
             "is_safe": is_safe,
             "safe_sequence": sequence,
             "current_state": {
-                "allocation": banker.allocation.tolist(),
-                "need": banker.need.tolist(),
-                "available": banker.available.tolist()
+                "allocation": banker.allocation,
+                "need": banker.need,
+                "available": banker.available
             }
         }
         
         if step_by_step:
             response["steps"] = banker.steps
             
-        return jsonify(response)
+        return respond(response)
     except Exception as e:
         return jsonify({"error": str(e)}), 400
 
 @deadlock_bp.route('/detection', methods=['POST'])
+@result_cache.cached
 def detection_algorithm():
-    data = request.json
-    
     try:
+        data = request_payload()
+        
         detector = DeadlockDetection(
             data['processes'],
             data['resources'],
             data['allocation'],
-            data['request']
+            data['request'],
+            data.get('available')
         )
         
         result = detector.detect_deadlock_step_by_step()
         wait_for_graph = detector.build_wait_for_graph()
         
-        return jsonify({
+        return respond({
             "detection_result": result,
             "wait_for_graph": wait_for_graph,
-            "available_resources": detector.available.tolist()
+            "available_resources": detector.available
         })
     except Exception as e:
         return jsonify({"error": str(e)}), 400
 
 @deadlock_bp.route('/prevention', methods=['GET'])
+@result_cache.cached
 def prevention_strategies():
     try:
         prevention = DeadlockPrevention()
@@ -99,14 +115,14 @@ def simulate_prevention():
 
 @deadlock_bp.route('/request-resources', methods=['POST'])
 def request_resources():
-    data = request.json
-    
     try:
+        data = request_payload()
+        
         banker = BankersAlgorithm(
             data['processes'],
             data['resources'],
             data['allocation'],
-            data.get('max_need') or data.get('maxNeed'),
+            data['max_need'] if 'max_need' in data else data.get('maxNeed'),
             data['available']
         )
         
@@ -115,19 +131,20 @@ def request_resources():
             data['request']
         )
         
-        return jsonify({
+        return respond({
             "success": success,
             "message": message,
             "new_state": {
-                "allocation": banker.allocation.tolist(),
-                "need": banker.need.tolist(),
-                "available": banker.available.tolist()
+                "allocation": banker.allocation,
+                "need": banker.need,
+                "available": banker.available
             }
         })
     except Exception as e:
         return jsonify({"error": str(e)}), 400
 
 @deadlock_bp.route('/detect-deadlock', methods=['POST'])
+@result_cache.cached
 def detect_deadlock():
     data = request.json
     
@@ -149,6 +166,15 @@ def detect_deadlock():
     except Exception as e:
         return jsonify({"error": str(e)}), 400
 
+@deadlock_bp.route('/cache', methods=['GET'])
+def get_cache_stats():
+    return jsonify(result_cache.info())
+
+@deadlock_bp.route('/cache', methods=['DELETE'])
+def clear_cache():
+    result_cache.clear()
+    return jsonify({"success": True, "cache": result_cache.info()})
+
 @deadlock_bp.route('/recovery-options', methods=['POST'])
 def recovery_options():
     data = request.json
@@ -166,10 +192,24 @@ def recovery_options():
             data['available']
         )
         
-        return jsonify({
+        response = {
             "termination_options": termination_options,
             "preemption_options": preemption_options
-        })
+        }
+        
+        # With the request matrix we can search for a provably safe preemption plan
+        if 'request' in data:
+            response["preemption_plan"] = recovery.plan_preemption(
+                data['request'],
+                data['available'],
+                victims=data.get('victims'),
+                resource_costs=data.get('resource_costs'),
+                process_weights=data.get('process_weights'),
+                strategy=data.get('strategy', 'auto'),
+                max_nodes=data.get('max_nodes', 256)
+            )
+        
+        return jsonify(response)
     except Exception as e:
         return jsonify({"error": str(e)}), 400
 
@@ -185,23 +225,57 @@ def simulate_scenario():
     except Exception as e:
         return jsonify({"error": str(e)}), 400
 
+@deadlock_bp.route('/simulate/load', methods=['POST'])
+def simulate_load():
+    from models.event_simulation import EventSimulation, check_load, load_curves
+    data = request.json or {}
+    
+    try:
+        options = {
+            'total': data.get('total', [6, 4, 4]),
+            'mean_hold': float(data.get('mean_hold', 2.0)),
+            'max_claim': data.get('max_claim'),
+            'max_active': int(data.get('max_active', 16)),
+            'horizon': float(data.get('horizon', 10000)),
+            'warmup': float(data.get('warmup', 0)),
+            'seed': data.get('seed', 0)
+        }
+        strategies = list(data.get('strategies', ['avoidance', 'detection', 'prevention']))
+        if 'rates' in data:
+            rates = [float(r) for r in data['rates']]
+        else:
+            rates = [float(data.get('arrival_rate', 0.1))]
+        check_load(rates, strategies, options['horizon'], options['max_active'])
+        
+        if 'rates' in data:
+            # Throughput and latency as functions of offered load
+            return jsonify({"curves": load_curves(rates, strategies, **options)})
+        
+        results = {
+            strategy: EventSimulation(strategy, arrival_rate=rates[0], **options).run()
+            for strategy in strategies
+        }
+        return jsonify({"results": results})
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
+
+def _job_response(job):
+    response = job.to_dict()
+    response["status_url"] = url_for('deadlock.get_report_job', job_id=job.id)
+    response["download_url"] = url_for('deadlock.download_report_job', job_id=job.id)
+    return response
+
 @deadlock_bp.route('/generate-report', methods=['POST'])
 def generate_report():
     data = request.json
     
     try:
-        report_gen = ReportGenerator()
-        
         if data.get('type') == 'comparison':
-            filename = report_gen.generate_comparison_report(data['comparison_data'])
+            job = report_jobs.submit('comparison', data['comparison_data'])
         else:
-            filename = report_gen.generate_simulation_report(data['simulation_data'])
+            job = report_jobs.submit('simulation', data['simulation_data'])
         
-        return jsonify({
-            "success": True,
-            "filename": filename,
-            "message": "Report generated successfully"
-        })
+        return jsonify(dict(_job_response(job), success=True, message="Report generation queued")), 202
     except Exception as e:
         return jsonify({"error": str(e)}), 400
 
@@ -210,20 +284,64 @@ def export_data():
     data = request.json
     
     try:
-        report_gen = ReportGenerator()
-        filename = report_gen.export_simulation_data(
-            data['simulation_data'],
-            data.get('format', 'json')
-        )
+        job = report_jobs.submit('export', data['simulation_data'], data.get('format', 'json'))
         
-        return jsonify({
-            "success": True,
-            "filename": filename,
-            "message": "Data exported successfully"
-        })
+        return jsonify(dict(_job_response(job), success=True, message="Export queued")), 202
     except Exception as e:
         return jsonify({"error": str(e)}), 400
 
+@deadlock_bp.route('/export-data/stream', methods=['POST'])
+def stream_export_data():
+    from reports.exporters import EXTENSIONS, FORMATS, export, iter_ndjson_steps
+    try:
+        export_format = request.args.get('format', 'ndjson')
+        if request.mimetype == 'application/x-ndjson':
+            # NDJSON upload: steps are parsed as they are exported, never
+            # materialized as one list
+            meta, steps = iter_ndjson_steps(line.decode() for line in request.stream)
+            simulation_data = dict(meta, steps=steps)
+        else:
+            data = request.json
+            simulation_data = data['simulation_data']
+            export_format = data.get('format', export_format)
+        
+        chunks = export(simulation_data, export_format)
+        filename = f"simulation_data.{EXTENSIONS[export_format]}"
+        return Response(
+            stream_with_context(chunks),
+            mimetype=FORMATS[export_format],
+            headers={"Content-Disposition": f"attachment; filename={filename}"}
+        )
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
+
+@deadlock_bp.route('/jobs', methods=['GET'])
+def list_report_jobs():
+    return jsonify({"jobs": report_jobs.list()})
+
+@deadlock_bp.route('/jobs/<job_id>', methods=['GET'])
+def get_report_job(job_id):
+    job = report_jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown or expired job"}), 404
+    return jsonify(_job_response(job))
+
+@deadlock_bp.route('/jobs/<job_id>', methods=['DELETE'])
+def cancel_report_job(job_id):
+    job = report_jobs.cancel(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown or expired job"}), 404
+    return jsonify(_job_response(job))
+
+@deadlock_bp.route('/jobs/<job_id>/download', methods=['GET'])
+def download_report_job(job_id):
+    job = report_jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown or expired job"}), 404
+    if job.status != 'done':
+        return jsonify(dict(job.to_dict(), error=f"Job is {job.status}")), 409
+    return send_file(job.path, as_attachment=True, download_name=job.filename)
+
 # Real-time monitoring endpoints
 rt_monitor = RealTimeDeadlockMonitor()
 
@@ -232,22 +350,59 @@ def init_realtime_system():
     data = request.json
     
     try:
-        # Reset existing system completely
-        global rt_monitor
-        rt_monitor.reset_system()
+        with rt_monitor.lock:
+            # Reset existing system completely
+            rt_monitor.reset_system()
+        
+            # 'preemption' rolls victims back to checkpoints instead of terminating them
+            if data.get('recovery_mode') == 'preemption':
+                rt_monitor.recovery_engine = CheckpointRecovery(rt_monitor)
+            else:
+                rt_monitor.recovery_engine = None
+        
+            # Contention profiling is on unless switched off
+            if data.get('profile', True):
+                rt_monitor.profiler = ContentionProfiler(window=float(data.get('profile_window', 60)))
+            else:
+                rt_monitor.profiler = None
+        
+            # Long-wait detection is opt-in: true enables alerts only, a dict
+            # sets threshold (seconds) and actions ({action: escalation level})
+            starvation = data.get('starvation')
+            if not starvation:
+                rt_monitor.starvation = None
+            else:
+                if starvation is True:
+                    starvation = {}
+                rt_monitor.starvation = StarvationDetector(
+                    rt_monitor,
+                    threshold=float(starvation.get('threshold', 5)),
+                    actions=starvation.get('actions')
+                )
         
-        # Add processes
-        for proc in data['processes']:
-            rt_monitor.add_process(proc['id'], proc['name'], proc['priority'])
+            # Add processes
+            for proc in data['processes']:
+                rt_monitor.add_process(proc['id'], proc['name'], proc['priority'])
             
-        # Add resources
-        for res in data['resources']:
-            rt_monitor.add_resource(res['id'], res['name'], res['total'])
+            # Add resources
+            for res in data['resources']:
+                rt_monitor.add_resource(res['id'], res['name'], res['total'])
+        
+            # Avoidance mode: every process declares max_claim {resource: units}
+            # and grants must keep the state safe
+            if data.get('avoidance'):
+                rt_monitor.avoidance = BankersAvoidance(rt_monitor)
+                for proc in data['processes']:
+                    if 'max_claim' not in proc:
+                        raise ValueError(f"Process {proc['id']} needs a max_claim in avoidance mode")
+                    rt_monitor.avoidance.declare(proc['id'], proc['max_claim'])
+            else:
+                rt_monitor.avoidance = None
             
-        # Start fresh monitoring
-        rt_monitor.start_monitoring()
+            # Start fresh monitoring
+            rt_monitor.start_monitoring()
             
-        return jsonify({"success": True, "message": "Real-time system initialized"})
+            return jsonify({"success": True, "message": "Real-time system initialized"})
     except Exception as e:
         return jsonify({"error": str(e)}), 400
 
@@ -256,21 +411,23 @@ def realtime_request_resource():
     data = request.json
     
     try:
-        success, message = rt_monitor.request_resource(
-            data['process_id'], 
-            data['resource_id']
-        )
+        with rt_monitor.lock:
+            success, message = rt_monitor.request_resource(
+                data['process_id'], 
+                data['resource_id'],
+                data.get('units', 1)
+            )
         
-        has_deadlock, cycle = rt_monitor.detect_deadlock()
-        system_state = rt_monitor.get_system_state()
+            has_deadlock, cycle = rt_monitor.detect_deadlock()
+            system_state = rt_monitor.get_system_state()
         
-        return jsonify({
-            "success": success,
-            "message": message,
-            "has_deadlock": has_deadlock,
-            "deadlock_cycle": cycle,
-            "system_state": system_state
-        })
+            return jsonify({
+                "success": success,
+                "message": message,
+                "has_deadlock": has_deadlock,
+                "deadlock_cycle": cycle,
+                "system_state": system_state
+            })
     except Exception as e:
         return jsonify({"error": str(e)}), 400
 
@@ -279,68 +436,208 @@ def realtime_release_resource():
     data = request.json
     
     try:
-        success, message = rt_monitor.release_resource(
-            data['process_id'], 
-            data['resource_id']
-        )
+        with rt_monitor.lock:
+            success, message = rt_monitor.release_resource(
+                data['process_id'], 
+                data['resource_id'],
+                data.get('units')
+            )
         
-        system_state = rt_monitor.get_system_state()
+            system_state = rt_monitor.get_system_state()
         
-        return jsonify({
-            "success": success,
-            "message": message,
-            "system_state": system_state
-        })
+            return jsonify({
+                "success": success,
+                "message": message,
+                "system_state": system_state
+            })
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
+
+@deadlock_bp.route('/realtime/batch', methods=['POST'])
+def realtime_batch():
+    """Many request/release operations in one call, applied all or nothing"""
+    data = request.json
+    
+    try:
+        with rt_monitor.lock:
+            results = rt_monitor.apply_batch(data['operations'])
+        
+            has_deadlock, cycle = rt_monitor.detect_deadlock()
+            system_state = rt_monitor.get_system_state()
+        
+            return jsonify({
+                "success": True,
+                "results": results,
+                "granted": sum(1 for r in results if r['op'] == 'request' and r['success']),
+                "has_deadlock": has_deadlock,
+                "deadlock_cycle": cycle,
+                "system_state": system_state
+            })
     except Exception as e:
         return jsonify({"error": str(e)}), 400
 
 @deadlock_bp.route('/realtime/status', methods=['GET'])
 def get_realtime_status():
     try:
-        has_deadlock, cycle = rt_monitor.detect_deadlock()
-        system_state = rt_monitor.get_system_state()
-        performance_metrics = rt_monitor.get_performance_metrics()
+        with rt_monitor.lock:
+            has_deadlock, cycle = rt_monitor.detect_deadlock()
+            system_state = rt_monitor.get_system_state()
+            performance_metrics = rt_monitor.get_performance_metrics()
         
-        return jsonify({
-            "has_deadlock": has_deadlock,
-            "deadlock_cycle": cycle,
-            "system_state": system_state,
-            "performance_metrics": performance_metrics
-        })
+            return jsonify({
+                "has_deadlock": has_deadlock,
+                "deadlock_cycle": cycle,
+                "system_state": system_state,
+                "performance_metrics": performance_metrics
+            })
     except Exception as e:
         return jsonify({"error": str(e)}), 400
 
 @deadlock_bp.route('/realtime/auto-resolve', methods=['POST'])
 def auto_resolve_deadlock():
     try:
-        has_deadlock, cycle = rt_monitor.detect_deadlock()
-        if has_deadlock:
-            resolved, message = rt_monitor.auto_resolve_deadlock(cycle)
-            return jsonify({
-                "resolved": resolved,
-                "message": message,
-                "system_state": rt_monitor.get_system_state()
-            })
-        else:
+        with rt_monitor.lock:
+            has_deadlock, cycle = rt_monitor.detect_deadlock()
+            if has_deadlock:
+                resolved, message = rt_monitor.auto_resolve_deadlock(cycle)
+                return jsonify({
+                    "resolved": resolved,
+                    "message": message,
+                    "system_state": rt_monitor.get_system_state()
+                })
+            else:
+                return jsonify({
+                    "resolved": False,
+                    "message": "No deadlock detected"
+                })
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
+
+@deadlock_bp.route('/realtime/blocking', methods=['POST'])
+def realtime_blocking():
+    data = request.json
+
+    try:
+        with rt_monitor.lock:
+            if 'process_id' in data:
+                report = rt_monitor.blocking_report(process_id=data['process_id'])
+            else:
+                report = rt_monitor.blocking_report(resource_id=data['resource_id'])
+            return jsonify(report)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
+
+@deadlock_bp.route('/realtime/blocking', methods=['GET'])
+def realtime_top_blockers():
+    try:
+        with rt_monitor.lock:
+            limit = int(request.args.get('limit', 10))
+            counts = rt_monitor.reachability().blocked_counts()
+            top = sorted(counts.items(), key=lambda item: -item[1])[:limit]
             return jsonify({
-                "resolved": False,
-                "message": "No deadlock detected"
+                "top_blockers": [{"process_id": pid, "blocked": count} for pid, count in top],
+                "index": rt_monitor.reachability().stats
             })
     except Exception as e:
         return jsonify({"error": str(e)}), 400
 
+@deadlock_bp.route('/realtime/contention', methods=['GET'])
+def realtime_contention():
+    try:
+        with rt_monitor.lock:
+            if not rt_monitor.profiler:
+                return jsonify({"error": "Contention profiling is not enabled"}), 400
+        
+            resource_id = request.args.get('resource_id')
+            if resource_id is not None:
+                # Query strings are text; resources are keyed by their JSON ids
+                resource_id = next((rid for rid in list(rt_monitor.resources) if str(rid) == resource_id), resource_id)
+                report = rt_monitor.profiler.resource_report(resource_id)
+                if report is None:
+                    return jsonify({"error": f"No contention recorded for {resource_id}"}), 404
+                return jsonify(report)
+        
+            limit = int(request.args.get('limit', 10))
+            return jsonify(rt_monitor.profiler.report(rt_monitor, limit))
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
+
+@deadlock_bp.route('/realtime/starvation', methods=['GET'])
+def realtime_starvation():
+    try:
+        if not rt_monitor.starvation:
+            return jsonify({"error": "Starvation detection is not enabled"}), 400
+        
+        # Report only: thresholds are checked and acted on by the monitor loop
+        limit = int(request.args.get('limit', 100))
+        with rt_monitor.lock:
+            report = rt_monitor.starvation.report(limit)
+        return jsonify(report)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
+
+@deadlock_bp.route('/realtime/avoidance', methods=['GET'])
+def realtime_avoidance():
+    try:
+        with rt_monitor.lock:
+            if not rt_monitor.avoidance:
+                return jsonify({"error": "Avoidance mode is not enabled"}), 400
+            return jsonify(rt_monitor.avoidance.report())
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
+
 @deadlock_bp.route('/realtime/metrics', methods=['GET'])
 def get_performance_metrics():
     try:
-        metrics = rt_monitor.get_performance_metrics()
-        return jsonify(metrics)
+        with rt_monitor.lock:
+            metrics = rt_monitor.get_performance_metrics()
+            return jsonify(metrics)
     except Exception as e:
         return jsonify({"error": str(e)}), 400
 
 @deadlock_bp.route('/realtime/full-log', methods=['GET'])
 def get_full_simulation_log():
     try:
-        full_log = rt_monitor.get_full_simulation_log()
-        return jsonify(full_log)
+        with rt_monitor.lock:
+            full_log = rt_monitor.get_full_simulation_log()
+            return jsonify(full_log)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
+
+@deadlock_bp.route('/realtime/checkpoint', methods=['POST'])
+def take_realtime_checkpoint():
+    try:
+        with rt_monitor.lock:
+            if not rt_monitor.recovery_engine:
+                return jsonify({"error": "Preemption recovery is not enabled"}), 400
+            
+            rt_monitor.recovery_engine.take_checkpoint()
+            return jsonify({
+                "success": True,
+                "checkpoints": {
+                    pid: rt_monitor.recovery_engine.get_checkpoint(pid)
+                    for pid in rt_monitor.processes
+                },
+                "stats": rt_monitor.recovery_engine.stats
+            })
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
+
+@deadlock_bp.route('/import-dump', methods=['POST'])
+def import_lock_dump():
+    from importers.cli import import_dump
+    try:
+        upload = request.files.get('file')
+        if upload is None:
+            return jsonify({"error": "Upload the dump as the 'file' form field"}), 400
+        activity = request.files.get('activity')
+
+        # Uploads are parsed straight from the request stream, never read whole
+        summary = import_dump(
+            request.form.get('format', 'pg_locks'),
+            upload.stream,
+            activity=activity.stream if activity else None
+        )
+        return jsonify(summary)
     except Exception as e:
-        return jsonify({"error": str(e)}), 400
\ No newline at end of file
+        return jsonify({"error": str(e)}), 400
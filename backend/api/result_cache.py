@@ -0,0 +1,110 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from functools import wraps
+from flask import Response, make_response, request
+from api.wire_format import MIMETYPE as BINARY_MIMETYPE, wants_binary
+
+def request_key(endpoint, payload):
+    """Hash of the payload as sent, only key order made canonical: values
+    are never rewritten, since the endpoints may treat 1 and 1.0 or two
+    spellings of a key differently"""
+    canonical = json.dumps([endpoint, payload], sort_keys=True, separators=(',', ':'))
+    return hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
+
+class ResultCache:
+    """Bounded LRU of serialized responses for deterministic endpoints,
+    keyed by a hash of the request and evicted by total size"""
+    def __init__(self, max_bytes=32 * 1024 * 1024, max_entries=10000):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.size = 0
+        self.stats = {'hits': 0, 'misses': 0, 'not_modified': 0, 'evictions': 0, 'uncacheable': 0}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.stats['misses'] += 1
+            else:
+                self.stats['hits'] += 1
+                self.entries.move_to_end(key)
+            return entry
+
+    def count(self, stat):
+        with self._lock:
+            self.stats[stat] += 1
+
+    def put(self, key, etag, body, mimetype='application/json'):
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            old = self.entries.pop(key, None)
+            if old is not None:
+                self.size -= len(old[1])
+            self.entries[key] = (etag, body, mimetype)
+            self.size += len(body)
+            while self.size > self.max_bytes or len(self.entries) > self.max_entries:
+                _, (_, evicted, _) = self.entries.popitem(last=False)
+                self.size -= len(evicted)
+                self.stats['evictions'] += 1
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+            self.size = 0
+
+    def info(self):
+        with self._lock:
+            lookups = self.stats['hits'] + self.stats['misses']
+            return dict(
+                self.stats,
+                entries=len(self.entries),
+                bytes=self.size,
+                max_bytes=self.max_bytes,
+                hit_rate=self.stats['hits'] / lookups if lookups else 0.0
+            )
+
+    def cached(self, view):
+        """Serve repeated identical requests from the cache, answering
+        If-None-Match with 304. Only successful responses are stored."""
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.method != 'POST':
+                payload = request.args.to_dict()
+            elif request.is_json:
+                payload = request.get_json(silent=True)
+            else:
+                # Binary bodies are already canonical: hash the bytes
+                payload = [request.mimetype, hashlib.blake2b(request.get_data(), digest_size=16).hexdigest()]
+            # JSON and binary renderings of one result are separate entries
+            variant = BINARY_MIMETYPE if wants_binary() else 'application/json'
+            key = request_key(f'{request.path} {variant}', payload)
+            entry = self.get(key)
+
+            if entry is None:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200 or response.mimetype != variant:
+                    self.count('uncacheable')
+                    return response
+                body = response.get_data()
+                etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+                self.put(key, etag, body, variant)
+                cache_status = 'MISS'
+            else:
+                etag, body, variant = entry
+                cache_status = 'HIT'
+
+            if etag in request.if_none_match:
+                self.count('not_modified')
+                response = Response(status=304)
+            else:
+                response = Response(body, status=200, mimetype=variant)
+            response.set_etag(etag)
+            response.vary.add('Accept')
+            response.headers['X-Cache'] = cache_status
+            return response
+        return wrapper
@@ -1,9 +1,31 @@
-from flask import Blueprint, jsonify
-import psutil
-import time
+import threading
+from flask import Blueprint, request, jsonify
 
 system_bp = Blueprint('system', __name__)
 
+# Stats are collected in the background; endpoints only read the ring buffer.
+# Created on the first /api/system request so psutil is never imported by
+# workers that only serve the algorithm endpoints.
+sampler = None
+lock_collector = None
+_start_lock = threading.Lock()
+
+@system_bp.before_request
+def ensure_sampler():
+    global sampler, lock_collector
+    if sampler is not None:
+        return
+    with _start_lock:
+        if sampler is None:
+            from models.system_sampler import SystemSampler
+            from models.proc_locks import ProcLocksCollector
+            lock_collector = ProcLocksCollector()
+            if ProcLocksCollector.available():
+                lock_collector.start()
+            started = SystemSampler()
+            started.start()
+            sampler = started
+
 @system_bp.route('/test', methods=['GET'])
 def test_endpoint():
     return jsonify({'message': 'System API is working'})
@@ -11,59 +33,79 @@ def test_endpoint():
 @system_bp.route('/processes', methods=['GET'])
 def get_processes():
     try:
-        processes = []
-        # Get processes with basic info first
-        for proc in psutil.process_iter():
-            try:
-                pinfo = proc.as_dict(attrs=['pid', 'name', 'cpu_percent', 'memory_info', 'status'])
-                processes.append({
-                    'pid': pinfo['pid'],
-                    'name': pinfo['name'] or 'Unknown',
-                    'cpu': round(pinfo['cpu_percent'] or 0, 1),
-                    'memory': round((pinfo['memory_info'].rss if pinfo['memory_info'] else 0) / 1024 / 1024, 1),
-                    'status': pinfo['status'] or 'unknown'
-                })
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                continue
-        
-        # Sort by memory usage and take top 15
-        processes.sort(key=lambda x: x['memory'], reverse=True)
-        return jsonify({'processes': processes[:15]})
+        snapshot = sampler.latest()
+        return jsonify({'processes': snapshot['processes'], 'timestamp': snapshot['timestamp']})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @system_bp.route('/resources', methods=['GET'])
 def get_resources():
     try:
-        cpu_percent = psutil.cpu_percent(interval=0.1, percpu=True)
-        memory = psutil.virtual_memory()
-        
-        # Use C: drive for Windows
-        try:
-            disk = psutil.disk_usage('C:\\')
-        except:
-            disk = psutil.disk_usage('/')
-        
-        resources = [
-            {'name': f'CPU Core {i+1}', 'usage': round(cpu, 1), 'total': 100, 'unit': '%'}
-            for i, cpu in enumerate(cpu_percent)
-        ]
-        
-        resources.extend([
-            {
-                'name': 'Memory',
-                'usage': round(memory.used / 1024**3, 1),
-                'total': round(memory.total / 1024**3, 1),
-                'unit': 'GB'
-            },
-            {
-                'name': 'Disk C:',
-                'usage': round(disk.used / 1024**3, 1),
-                'total': round(disk.total / 1024**3, 1),
-                'unit': 'GB'
-            }
-        ])
-        
-        return jsonify({'resources': resources})
+        snapshot = sampler.latest()
+        return jsonify({'resources': snapshot['resources'], 'timestamp': snapshot['timestamp']})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@system_bp.route('/snapshots', methods=['GET'])
+def get_snapshots():
+    try:
+        snapshots = sampler.history(
+            since=request.args.get('since', type=float),
+            until=request.args.get('until', type=float),
+            limit=request.args.get('limit', type=int)
+        )
+        return jsonify({
+            'snapshots': snapshots,
+            'interval': sampler.interval,
+            'capacity': sampler.snapshots.maxlen
+        })
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
\ No newline at end of file
+        return jsonify({'error': str(e)}), 500
+
+@system_bp.route('/history', methods=['GET'])
+def get_history():
+    try:
+        if sampler.store is None:
+            return jsonify({'error': 'System sampler is warming up'}), 503
+        series = request.args.get('series')
+        history = sampler.store.query(
+            since=request.args.get('since', type=float),
+            until=request.args.get('until', type=float),
+            resolution=request.args.get('resolution', 'auto'),
+            series=series.split(',') if series else None,
+            max_points=request.args.get('max_points', type=int)
+        )
+        return jsonify(history)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@system_bp.route('/history/stats', methods=['GET'])
+def get_history_stats():
+    try:
+        if sampler.store is None:
+            return jsonify({'error': 'System sampler is warming up'}), 503
+        return jsonify(sampler.store.stats())
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@system_bp.route('/locks', methods=['GET'])
+def get_os_locks():
+    try:
+        if not lock_collector.available(lock_collector.locks_path):
+            return jsonify({'error': 'OS lock inspection needs Linux /proc/locks'}), 501
+        return jsonify(lock_collector.latest())
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@system_bp.route('/locks/scan', methods=['POST'])
+def scan_os_locks():
+    try:
+        if not lock_collector.available(lock_collector.locks_path):
+            return jsonify({'error': 'OS lock inspection needs Linux /proc/locks'}), 501
+        result = lock_collector.scan()
+        result['stats'] = lock_collector.stats
+        return jsonify(result)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
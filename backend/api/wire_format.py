@@ -0,0 +1,109 @@
+"""Binary wire format for matrix-heavy payloads.
+
+Layout (all little-endian):
+    b'DLKA' | u16 version | u16 reserved | u32 header length | header JSON
+    | padding to 8 bytes | array buffers
+
+The header holds every non-array field as plain JSON plus, per array, its
+dotted path in the payload, dtype, shape and offset into the buffer area.
+Arrays decode with np.frombuffer, so no per-element Python objects are made.
+"""
+import json
+import struct
+import numpy as np
+from flask import Response, jsonify, request
+
+MIMETYPE = 'application/x-deadlock-arrays'
+MAGIC = b'DLKA'
+VERSION = 1
+_PREFIX = struct.Struct('<4sHHI')
+
+def _wire_dtype(array):
+    if array.dtype.kind == 'b':
+        return np.dtype('u1'), 'bool'
+    if array.dtype.kind in 'iu':
+        small = array.size == 0 or (array.min() >= np.iinfo(np.int32).min and array.max() <= np.iinfo(np.int32).max)
+        dtype = np.dtype('<i4') if small else np.dtype('<i8')
+        return dtype, dtype.str
+    dtype = np.dtype('<f8')
+    return dtype, dtype.str
+
+def encode(payload):
+    arrays = []
+    buffers = []
+    offset = 0
+
+    def strip(value, path):
+        nonlocal offset
+        if isinstance(value, np.ndarray):
+            dtype, name = _wire_dtype(value)
+            data = np.ascontiguousarray(value, dtype=dtype).tobytes()
+            arrays.append({'path': path, 'dtype': name, 'shape': list(value.shape), 'offset': offset})
+            buffers.append(data)
+            # Keep every buffer 8-byte aligned for frombuffer
+            pad = -len(data) % 8
+            if pad:
+                buffers.append(b'\0' * pad)
+            offset += len(data) + pad
+            return None
+        if isinstance(value, dict):
+            return {k: strip(v, path + [k]) for k, v in value.items()}
+        if isinstance(value, np.generic):
+            return value.item()
+        return value
+
+    fields = strip(payload, [])
+    header = json.dumps({'fields': fields, 'arrays': arrays}, separators=(',', ':')).encode()
+    header += b' ' * (-(_PREFIX.size + len(header)) % 8)
+    return b''.join([_PREFIX.pack(MAGIC, VERSION, 0, len(header)), header] + buffers)
+
+def decode(data):
+    """Payload from an encoded body; ValueError on anything malformed"""
+    try:
+        return _decode(data)
+    except (ValueError, IndexError, KeyError, TypeError, struct.error) as e:
+        raise ValueError(f'Malformed {MIMETYPE} body: {e}') from e
+
+def _decode(data):
+    magic, version, _, length = _PREFIX.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError('Not a deadlock array payload')
+    header = json.loads(data[_PREFIX.size:_PREFIX.size + length])
+    base = _PREFIX.size + length
+    payload = header['fields']
+    for spec in header['arrays']:
+        dtype = np.dtype('u1') if spec['dtype'] == 'bool' else np.dtype(spec['dtype'])
+        count = int(np.prod(spec['shape'])) if spec['shape'] else 1
+        array = np.frombuffer(data, dtype=dtype, count=count, offset=base + spec['offset']).reshape(spec['shape'])
+        if spec['dtype'] == 'bool':
+            array = array.view(bool)
+        target = payload
+        for key in spec['path'][:-1]:
+            target = target[key]
+        target[spec['path'][-1]] = array
+    return payload
+
+def wants_binary():
+    return request.accept_mimetypes.best_match(['application/json', MIMETYPE]) == MIMETYPE
+
+def request_payload():
+    """Request body as a dict; binary bodies keep their matrices as arrays"""
+    if request.mimetype == MIMETYPE:
+        return decode(request.get_data())
+    return request.json
+
+def _to_json(value):
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, dict):
+        return {k: _to_json(v) for k, v in value.items()}
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+def respond(payload):
+    """Binary response when the client prefers it, JSON otherwise; arrays
+    are only converted to lists on the JSON path"""
+    if wants_binary():
+        return Response(encode(payload), mimetype=MIMETYPE)
+    return jsonify(_to_json(payload))
@@ -0,0 +1,179 @@
+"""Offline batch analysis of system states and wait-for graphs.
+
+Records are read lazily, analysed in chunks on a process pool and yielded
+back in input order with a bounded number of chunks in flight, so inputs of
+any size stream through in constant memory.
+"""
+import csv
+import json
+import os
+from collections import deque
+from itertools import islice
+
+import numpy as np
+
+from algorithms.bankers_algorithm import BankersAlgorithm
+from algorithms.detection_algorithm import DeadlockDetection
+from algorithms.wait_for_graph import WaitForGraph
+from importers.common import open_text
+
+MODES = ('bankers', 'detection', 'cycles')
+INPUT_FORMATS = ('ndjson', 'csv')
+CHUNK_SIZE = 256
+# CSV state columns holding JSON-encoded vectors and matrices
+MATRIX_COLUMNS = ('allocation', 'max_need', 'maxNeed', 'available', 'request', 'edges')
+
+def guess_format(source):
+    if isinstance(source, str) and source.lower().endswith('.csv'):
+        return 'csv'
+    return 'ndjson'
+
+def _csv_state(row):
+    record = {}
+    for key, value in row.items():
+        if key is None or value is None or value == '':
+            continue
+        if key in MATRIX_COLUMNS:
+            record[key] = json.loads(value)
+        elif key in ('processes', 'resources'):
+            record[key] = int(value)
+        else:
+            record[key] = value
+    return record
+
+def _csv_edge_lists(rows):
+    """Consecutive rows sharing a 'graph' value form one wait-for graph"""
+    graph_id, edges = None, []
+    for row in rows:
+        key = row.get('graph')
+        if edges and key != graph_id:
+            yield {'id': graph_id, 'edges': edges} if graph_id is not None else {'edges': edges}
+            edges = []
+        graph_id = key
+        edges.append([int(row['from']), int(row['to'])])
+    if edges:
+        yield {'id': graph_id, 'edges': edges} if graph_id is not None else {'edges': edges}
+
+def read_records(source, input_format=None):
+    """Records from a path, '-' or a file object.
+
+    NDJSON lines are handed on unparsed so decoding happens in the workers.
+    CSV is either one state per row (matrices as JSON cells) or an edge list
+    with from/to columns and an optional graph column."""
+    input_format = input_format or guess_format(source)
+    if input_format not in INPUT_FORMATS:
+        raise ValueError(f"Unknown input format {input_format!r}, expected one of: {', '.join(INPUT_FORMATS)}")
+    stream = open_text(source)
+    if input_format == 'ndjson':
+        return (line for line in stream if line.strip())
+    reader = csv.DictReader(stream)
+    if reader.fieldnames and 'from' in reader.fieldnames and 'to' in reader.fieldnames:
+        return _csv_edge_lists(reader)
+    return (_csv_state(row) for row in reader)
+
+def _shape(record):
+    allocation = np.asarray(record['allocation'])
+    processes = record.get('processes', allocation.shape[0])
+    resources = record.get('resources', allocation.shape[1] if allocation.ndim == 2 else 0)
+    return processes, resources
+
+def analyze_bankers(record, steps=False, **_):
+    processes, resources = _shape(record)
+    banker = BankersAlgorithm(
+        processes,
+        resources,
+        record['allocation'],
+        record['max_need'] if 'max_need' in record else record.get('maxNeed'),
+        record['available']
+    )
+    is_safe, sequence = banker.is_safe_state(steps)
+    result = {'is_safe': is_safe, 'safe_sequence': sequence}
+    if steps:
+        result['steps'] = banker.steps
+    return result, not is_safe
+
+def analyze_detection(record, steps=False, **_):
+    processes, resources = _shape(record)
+    detector = DeadlockDetection(
+        processes,
+        resources,
+        record['allocation'],
+        record['request'],
+        record.get('available')
+    )
+    detection = detector.detect_deadlock_step_by_step()
+    result = {
+        'has_deadlock': detection['has_deadlock'],
+        'deadlocked_processes': detection['deadlocked_processes']
+    }
+    if steps:
+        result['steps'] = detection['steps']
+    return result, detection['has_deadlock']
+
+def analyze_cycles(record, components=False, **_):
+    edges = [(e['from'], e['to']) if isinstance(e, dict) else tuple(e) for e in record.get('edges', ())]
+    processes = record.get('processes')
+    if processes is None:
+        processes = max((max(edge) for edge in edges), default=-1) + 1
+    wfg = WaitForGraph(processes)
+    for waiter, holder in edges:
+        wfg.add_edge(waiter, holder)
+    has_deadlock, cycle = wfg.detect_deadlock()
+    result = {'has_deadlock': has_deadlock, 'deadlock_cycle': cycle}
+    if components:
+        result['components'] = wfg.deadlocked_components()
+    return result, has_deadlock
+
+ANALYZERS = {
+    'bankers': analyze_bankers,
+    'detection': analyze_detection,
+    'cycles': analyze_cycles
+}
+
+def _analyze_chunk(mode, chunk, options):
+    """Runs in a pool worker: (flagged, result) per record, errors included"""
+    analyze = ANALYZERS[mode]
+    results = []
+    for index, item in chunk:
+        record_id = index
+        try:
+            record = json.loads(item) if isinstance(item, str) else item
+            record_id = record.get('id', index)
+            result, flagged = analyze(record, **options)
+        except Exception as e:
+            results.append((False, {'id': record_id, 'error': str(e)}))
+            continue
+        results.append((flagged, dict({'id': record_id}, **result)))
+    return results
+
+def _chunks(records, size):
+    numbered = enumerate(records)
+    while True:
+        chunk = list(islice(numbered, size))
+        if not chunk:
+            return
+        yield chunk
+
+def run_batch(records, mode, workers=None, chunk_size=CHUNK_SIZE, **options):
+    """Yields (flagged, result) in input order; flagged marks an unsafe or
+    deadlocked record. workers=1 analyses in-process."""
+    if mode not in ANALYZERS:
+        raise ValueError(f"Unknown analysis mode {mode!r}, expected one of: {', '.join(MODES)}")
+    workers = workers or os.cpu_count() or 1
+    chunks = _chunks(records, chunk_size)
+    if workers == 1:
+        for chunk in chunks:
+            yield from _analyze_chunk(mode, chunk, options)
+        return
+
+    # Imported here so in-process runs never start the multiprocessing machinery
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(_analyze_chunk, mode, chunk, options))
+            # Two chunks per worker keeps every core busy without reading ahead
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
@@ -0,0 +1,65 @@
+"""Analyse large files of system states or wait-for graphs without the web app.
+
+Run from the backend directory:
+    python -m batch.cli bankers states.ndjson
+    python -m batch.cli detection states.csv --workers 8
+    cat graphs.ndjson | python -m batch.cli cycles - --components
+
+Input is NDJSON (one API-style payload per line) or CSV; results stream to
+stdout as NDJSON in input order, and a summary goes to stderr.
+"""
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from batch.analysis import CHUNK_SIZE, INPUT_FORMATS, MODES, read_records, run_batch
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f'{type(value).__name__} is not JSON serializable')
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch Banker's, detection and cycle analysis")
+    parser.add_argument('mode', choices=MODES)
+    parser.add_argument('file', help="input file, or '-' for stdin")
+    parser.add_argument('--format', choices=INPUT_FORMATS, help='input format (default: from the file extension, else ndjson)')
+    parser.add_argument('--workers', type=int, help='worker processes (default: all cores, 1 runs in-process)')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help='records per task sent to a worker')
+    parser.add_argument('--steps', action='store_true', help='include step-by-step traces (bankers, detection)')
+    parser.add_argument('--components', action='store_true', help='include every deadlocked component (cycles)')
+    args = parser.parse_args(argv)
+
+    records = read_records(args.file, args.format)
+    options = {'steps': args.steps} if args.mode != 'cycles' else {'components': args.components}
+    counts = {'records': 0, 'flagged': 0, 'errors': 0}
+    start = time.perf_counter()
+    out = sys.stdout
+    try:
+        for flagged, result in run_batch(records, args.mode, args.workers, args.chunk_size, **options):
+            counts['records'] += 1
+            counts['flagged'] += flagged
+            counts['errors'] += 'error' in result
+            out.write(json.dumps(result, separators=(',', ':'), default=_json_default))
+            out.write('\n')
+        out.flush()
+    except BrokenPipeError:
+        # Downstream closed early (e.g. piped into head)
+        sys.stdout = None
+        return 1 if counts['flagged'] else 0
+
+    elapsed = time.perf_counter() - start
+    counts['seconds'] = round(elapsed, 3)
+    counts['records_per_second'] = round(counts['records'] / elapsed) if elapsed else 0
+    json.dump(counts, sys.stderr)
+    sys.stderr.write('\n')
+    # Non-zero exit so scripts can alert on an unsafe or deadlocked input
+    return 1 if counts['flagged'] else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,57 @@
+"""Overhead of tracked asyncio locks and the deadlock sampler.
+
+Thousands of tasks repeatedly take one of a handful of shared locks, once
+with plain asyncio.Lock and once with AsyncDeadlockDetector locks while the
+sampler is running.
+
+Run from the backend directory:
+    python -m benchmarks.bench_asyncio_detector [tasks] [rounds]
+"""
+import asyncio
+import sys
+import time
+
+from instrumentation.asyncio_locks import AsyncDeadlockDetector
+
+async def workload(locks, tasks, rounds):
+    async def worker(i):
+        for r in range(rounds):
+            async with locks[(i + r) % len(locks)]:
+                await asyncio.sleep(0)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(tasks)))
+    return time.perf_counter() - start
+
+async def run_plain(tasks, rounds, lock_count):
+    locks = [asyncio.Lock() for _ in range(lock_count)]
+    return await workload(locks, tasks, rounds)
+
+async def run_tracked(tasks, rounds, lock_count, interval):
+    detector = AsyncDeadlockDetector(interval=interval)
+    detector.start()
+    locks = [detector.Lock(f'L{i}') for i in range(lock_count)]
+    try:
+        elapsed = await workload(locks, tasks, rounds)
+    finally:
+        detector.stop()
+    return elapsed, detector.stats
+
+def run(tasks=5000, rounds=10, lock_count=16, interval=0.5):
+    plain = asyncio.run(run_plain(tasks, rounds, lock_count))
+    tracked, stats = asyncio.run(run_tracked(tasks, rounds, lock_count, interval))
+    acquisitions = tasks * rounds
+
+    print(f"{tasks} tasks x {rounds} rounds over {lock_count} locks "
+          f"({acquisitions} acquisitions), sampler every {interval * 1000:.0f} ms")
+    print(f"  asyncio.Lock   {plain:7.3f} s  {1e6 * plain / acquisitions:6.2f} us/acquire")
+    print(f"  tracked Lock   {tracked:7.3f} s  {1e6 * tracked / acquisitions:6.2f} us/acquire")
+    print(f"  overhead       {100 * (tracked - plain) / plain:6.1f} %")
+    checks = max(stats['checks'], 1)
+    print(f"  sampler: {stats['samples']} samples, {stats['checks']} cycle checks, "
+          f"{1000 * stats['check_time'] / checks:.2f} ms per check")
+    return plain, tracked
+
+if __name__ == '__main__':
+    args = [int(a) for a in sys.argv[1:3]]
+    run(*args)
@@ -0,0 +1,133 @@
+"""Real-time grant latency and throughput: Banker's avoidance versus
+detect-and-resolve.
+
+Processes run their plans in a closed loop, one unit per request, and
+release everything when a plan completes. The light scenario gives every
+resource roughly as many units as all claims together; the heavy one is
+the Monte Carlo workload shape, where claims oversubscribe each resource. Avoidance checks every grant
+against the declared claims; detection grants whenever units are free and
+periodically finds and resolves deadlocks by terminating a victim, which
+restarts its plan.
+
+Run from the backend directory:
+    python -m benchmarks.bench_avoidance [processes] [resources] [steps]
+"""
+import random
+import sys
+import time
+
+from algorithms.realtime_monitor import RealTimeDeadlockMonitor
+from algorithms.realtime_avoidance import BankersAvoidance
+from models.monte_carlo import generate_workload
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] if values else 0.0
+
+def light_workload(rng, processes, resources, max_claim=3):
+    max_need = [[rng.randint(0, max_claim) for _ in range(resources)] for _ in range(processes)]
+    total = [max(1, sum(row[r] for row in max_need) * 3 // 4) for r in range(resources)]
+    return generate_workload(rng, total=total, max_need=max_need)
+
+def drive(mode, workload, steps, upkeep_every, seed):
+    n = len(workload['max_need'])
+    monitor = RealTimeDeadlockMonitor()
+    for r, total in enumerate(workload['total']):
+        monitor.add_resource(r, f'R{r}', total)
+    for p in range(n):
+        monitor.add_process(p, f'P{p}', ('High', 'Medium', 'Low')[p % 3])
+    if mode == 'avoidance':
+        monitor.avoidance = BankersAvoidance(monitor)
+        for p, claim in enumerate(workload['max_need']):
+            monitor.avoidance.declare(p, dict(enumerate(claim)))
+
+    plans = [[r for r, _ in plan] for plan in workload['plans']]
+    position = [0] * n
+    # process -> (resource, units it holds once the pending request is granted)
+    pending = [None] * n
+    latencies = []
+    upkeep = 0.0
+    counts = {'requests': 0, 'grants': 0, 'completed': 0, 'restarts': 0, 'deadlocks': 0}
+    rng = random.Random(seed)
+
+    start = time.perf_counter()
+    for step in range(1, steps + 1):
+        if step % upkeep_every == 0:
+            t0 = time.perf_counter()
+            if mode == 'detection':
+                cycle = monitor.find_deadlock()
+                if cycle:
+                    monitor.auto_resolve_deadlock(cycle)
+                    counts['deadlocks'] += 1
+            monitor._process_waiting_queue()
+            upkeep += time.perf_counter() - t0
+
+        p = rng.randrange(n)
+        process = monitor.processes[p]
+        if pending[p] is not None:
+            r, target = pending[p]
+            if process.held_units(r) >= target:
+                pending[p] = None
+                position[p] += 1
+                counts['grants'] += 1
+            elif r in process.waiting_for:
+                continue
+            else:
+                # Terminated to break a deadlock: start the plan over
+                pending[p] = None
+                position[p] = 0
+                counts['restarts'] += 1
+
+        if position[p] == len(plans[p]):
+            for r in tuple(process.resources):
+                monitor.release_resource(p, r)
+            position[p] = 0
+            counts['completed'] += 1
+        else:
+            r = plans[p][position[p]]
+            target = process.held_units(r) + 1
+            t0 = time.perf_counter()
+            granted, _ = monitor.request_resource(p, r)
+            latencies.append(time.perf_counter() - t0)
+            counts['requests'] += 1
+            if granted:
+                position[p] += 1
+                counts['grants'] += 1
+            else:
+                pending[p] = (r, target)
+
+    elapsed = time.perf_counter() - start
+
+    stats = monitor.avoidance.stats if monitor.avoidance else None
+    return elapsed, upkeep, latencies, counts, stats
+
+def report(mode, elapsed, upkeep, latencies, counts, stats):
+    print(f'  {mode:<10} request p50 {percentile(latencies, 0.5) * 1e6:7.2f} us'
+          f'  p99 {percentile(latencies, 0.99) * 1e6:8.2f} us'
+          f'  grants/s {counts["grants"] / elapsed:9.0f}'
+          f'  plans/s {counts["completed"] / elapsed:8.0f}'
+          f'  upkeep {100.0 * upkeep / elapsed:5.1f}%')
+    print(f'  {"":<10} completed {counts["completed"]}  deadlocks {counts["deadlocks"]}'
+          f'  restarts {counts["restarts"]}')
+    if stats:
+        fast = 100.0 * stats['fast_path'] / max(stats['checks'], 1)
+        print(f'  {"":<10} safety checks {stats["checks"]}  fast path {fast:.1f}%'
+              f'  reductions {stats["reductions"]}  cached refusals {stats["cached"]}  deferred {stats["deferred"]}')
+
+def run(processes=40, resources=6, steps=50000, upkeep_every=50, seed=0):
+    scenarios = {
+        'light': light_workload(random.Random(seed), processes, resources),
+        'heavy': generate_workload(random.Random(seed), processes=(processes, processes),
+                                   resources=(resources, resources))
+    }
+    print(f'processes={processes} resources={resources} steps={steps} upkeep every {upkeep_every} steps')
+    for scenario, workload in scenarios.items():
+        print(f'{scenario}: totals {workload["total"]}')
+        for mode in ('detection', 'avoidance'):
+            report(mode, *drive(mode, workload, steps, upkeep_every, seed))
+
+if __name__ == '__main__':
+    processes = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    resources = int(sys.argv[2]) if len(sys.argv) > 2 else 6
+    steps = int(sys.argv[3]) if len(sys.argv) > 3 else 50000
+    run(processes, resources, steps)
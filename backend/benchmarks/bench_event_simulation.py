@@ -0,0 +1,20 @@
+"""Event throughput of the discrete-event simulator per strategy.
+
+Run from the backend directory:
+    python -m benchmarks.bench_event_simulation [horizon]
+"""
+import sys
+
+from models.event_simulation import EventSimulation
+
+def run(horizon):
+    print(f"{'strategy':<12} {'rate':>5} {'events':>9} {'events/min':>12} {'sim/wall':>10}")
+    for rate in (0.05, 0.1, 0.15):
+        for strategy in ('avoidance', 'detection', 'prevention'):
+            result = EventSimulation(strategy, arrival_rate=rate, horizon=horizon, seed=1).run()
+            speedup = horizon / result['elapsed']
+            print(f"{strategy:<12} {rate:>5} {result['events']:>9} "
+                  f"{result['events_per_second'] * 60:>12,.0f} {speedup:>9,.0f}x")
+
+if __name__ == '__main__':
+    run(float(sys.argv[1]) if len(sys.argv) > 1 else 200000)
@@ -0,0 +1,85 @@
+"""Memory held by RealTimeDeadlockMonitor state versus the earlier layout of
+one dict with two sets per process plus mirrored allocation/request
+matrices, which is rebuilt here for comparison.
+
+Every process holds its own single-unit resource and a share of them wait
+on another process's resource. IDs and names are created before measuring,
+so only the per-entity bookkeeping is counted.
+
+Run from the backend directory:
+    python -m benchmarks.bench_monitor_memory [processes] [wait_fraction]
+"""
+import gc
+import random
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+
+from algorithms.realtime_monitor import RealTimeDeadlockMonitor
+
+def workload(processes, wait_fraction, seed=0):
+    rng = random.Random(seed)
+    names = [f'P{p}' for p in range(processes)]
+    resource_ids = [f'r{p}' for p in range(processes)]
+    resource_names = [f'R{p}' for p in range(processes)]
+    waits = [(p, resource_ids[rng.randrange(processes)]) for p in range(processes) if rng.random() < wait_fraction]
+    return names, resource_ids, resource_names, waits
+
+def legacy_layout(names, resource_ids, resource_names, waits):
+    processes, resources = {}, {}
+    allocation_matrix, request_matrix = defaultdict(dict), defaultdict(dict)
+    for p, name in enumerate(names):
+        processes[p] = {'name': name, 'priority': 'Medium', 'resources': set(),
+                        'waiting_for': set(), 'timestamp': time.time()}
+    for rid, name in zip(resource_ids, resource_names):
+        resources[rid] = {'name': name, 'total': 1, 'available': 1, 'holders': set()}
+    for p, rid in enumerate(resource_ids):
+        resources[rid]['available'] -= 1
+        resources[rid]['holders'].add(p)
+        processes[p]['resources'].add(rid)
+        allocation_matrix[p][rid] = 1
+    for p, rid in waits:
+        if rid not in processes[p]['resources']:
+            processes[p]['waiting_for'].add(rid)
+            request_matrix[p][rid] = 1
+    return processes, resources, allocation_matrix, request_matrix
+
+def compact_layout(names, resource_ids, resource_names, waits):
+    monitor = RealTimeDeadlockMonitor()
+    for p, name in enumerate(names):
+        monitor.add_process(p, name, 'Medium')
+    for rid, name in zip(resource_ids, resource_names):
+        monitor.add_resource(rid, name, 1)
+    for p, rid in enumerate(resource_ids):
+        monitor.request_resource(p, rid)
+    for p, rid in waits:
+        monitor.request_resource(p, rid)
+    monitor._dirty_processes.clear()
+    return monitor
+
+def measure(build, data):
+    gc.collect()
+    tracemalloc.start()
+    state = build(*data)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del state
+    return current
+
+def run(processes=1_000_000, wait_fraction=0.5):
+    data = workload(processes, wait_fraction)
+    print(f'processes={processes} resources={processes} waits={len(data[3])}')
+    sizes = {}
+    for label, build in (('dict + sets + matrices', legacy_layout), ('slots records', compact_layout)):
+        size = measure(build, data)
+        sizes[label] = size
+        print(f'  {label:<24} {size / 2**20:9.1f} MiB  {size / processes:7.0f} B/process')
+    legacy, compact = sizes.values()
+    print(f'  compact layout uses {100.0 * compact / legacy:.1f}% of the earlier footprint')
+    return sizes
+
+if __name__ == '__main__':
+    processes = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    wait_fraction = float(sys.argv[2]) if len(sys.argv) > 2 else 0.5
+    run(processes, wait_fraction)
@@ -0,0 +1,66 @@
+"""Transitive blocker queries: bit-row index versus a fresh search per query.
+
+Run from the backend directory:
+    python -m benchmarks.bench_reachability [processes] [density]
+"""
+import random
+import sys
+import time
+
+from algorithms.reachability_index import ReachabilityIndex
+from benchmarks.workloads import wait_graph
+
+def search(successors, start):
+    seen = set()
+    stack = list(successors.get(start, ()))
+    while stack:
+        node = stack.pop()
+        if node not in seen:
+            seen.add(node)
+            stack.extend(successors.get(node, ()))
+    return seen
+
+def run(processes=5000, density=1.5, queries=2000, seed=0):
+    edges, _ = wait_graph(processes, density, cycles=2, seed=seed)
+    successors = {}
+    for waiter, holder in edges:
+        successors.setdefault(waiter, []).append(holder)
+    rng = random.Random(seed)
+    targets = [rng.randrange(processes) for _ in range(queries)]
+
+    start = time.perf_counter()
+    index = ReachabilityIndex.from_edges(edges)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for node in targets:
+        search(successors, node)
+    dfs = (time.perf_counter() - start) / queries
+
+    start = time.perf_counter()
+    for node in targets:
+        index.blockers(node)
+    indexed = (time.perf_counter() - start) / queries
+
+    start = time.perf_counter()
+    for node in targets:
+        index.waits_on(node, targets[0])
+    pair = (time.perf_counter() - start) / queries
+
+    # Deleting one edge costs one rebuild, paid by the next query
+    index.remove_edge(*edges[0])
+    start = time.perf_counter()
+    index.blockers(targets[0])
+    rebuild = time.perf_counter() - start
+
+    print(f'processes={processes} edges={len(edges)} queries={queries}')
+    print(f'  incremental build   {build * 1000:10.1f} ms')
+    print(f'  search per query    {dfs * 1e6:10.1f} us')
+    print(f'  index blockers()    {indexed * 1e6:10.1f} us')
+    print(f'  index waits_on()    {pair * 1e6:10.1f} us')
+    print(f'  rebuild after delete {rebuild * 1000:9.1f} ms')
+
+if __name__ == '__main__':
+    processes = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    density = float(sys.argv[2]) if len(sys.argv) > 2 else 1.5
+    run(processes, density)
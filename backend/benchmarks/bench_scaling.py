@@ -0,0 +1,237 @@
+"""Time and peak-memory scaling curves for the algorithm modules.
+
+Each case is run over growing sizes (processes, or wait-for graph nodes);
+setup is excluded from the measurements. Time is the best of --repeat runs
+and peak memory comes from a separate tracemalloc run. A curve stops once a
+size would exceed --budget seconds, extrapolated from the slope of the last
+two points, so quadratic algorithms do not stall the suite.
+
+Results can be saved as a baseline and later runs compared against it; the
+comparison exits non-zero when a point regressed beyond --tolerance.
+
+Run from the backend directory:
+    python -m benchmarks.bench_scaling
+    python -m benchmarks.bench_scaling --save
+    python -m benchmarks.bench_scaling --compare --cases wait_for_graph,bankers
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from algorithms.bankers_algorithm import BankersAlgorithm
+from algorithms.deadlock_recovery import DeadlockRecovery
+from algorithms.detection_algorithm import DeadlockDetection
+from algorithms.wait_for_graph import WaitForGraph
+from benchmarks.workloads import banker_state, build_monitor, detection_state, monitor_system, wait_graph
+
+DEFAULT_SIZES = (10, 100, 1000, 10000, 100000)
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), 'baselines', 'scaling.json')
+# Differences below these are noise, whatever the ratio
+MIN_SECONDS = 0.001
+MIN_BYTES = 64 * 1024
+
+def _bankers(size, opts):
+    state = banker_state(size, opts.resources, unsafe=opts.cycles, seed=opts.seed)
+    def run():
+        banker = BankersAlgorithm(size, opts.resources, state['allocation'], state['max_need'], state['available'])
+        banker.is_safe_state()
+    return run
+
+def _detection(size, opts):
+    state = detection_state(size, opts.resources, deadlocked=min(size, opts.cycles * opts.cycle_length), seed=opts.seed)
+    def run():
+        detector = DeadlockDetection(size, opts.resources, state['allocation'], state['request'], state['available'])
+        detector.detect_deadlock_step_by_step()
+        detector.build_wait_for_graph()
+    return run
+
+def _graph(size, opts):
+    edges, _ = wait_graph(size, opts.density, opts.cycles, opts.cycle_length, seed=opts.seed)
+    return edges
+
+def _wait_for_graph(size, opts):
+    edges = _graph(size, opts)
+    def run():
+        wfg = WaitForGraph(size)
+        for waiter, holder in edges:
+            wfg.add_edge(waiter, holder)
+        wfg.detect_deadlock()
+    return run
+
+def _wait_for_graph_components(size, opts):
+    edges = _graph(size, opts)
+    wfg = WaitForGraph(size)
+    for waiter, holder in edges:
+        wfg.add_edge(waiter, holder)
+    return wfg.deadlocked_components
+
+def _recovery(size, opts):
+    # Everyone in one deadlocked group, so the cycle handed over has `size` members
+    state = detection_state(size, opts.resources, deadlocked=size, seed=opts.seed)
+    cycle = state['deadlocked_processes']
+    allocation = state['allocation'].tolist()
+    def run():
+        recovery = DeadlockRecovery(size, opts.resources, allocation)
+        recovery.process_termination(cycle)
+        recovery.resource_preemption(cycle, state['available'])
+        recovery.plan_preemption(state['request'], state['available'], max_nodes=64)
+    return run
+
+def _monitor_build(size, opts):
+    edges = _graph(size, opts)
+    return lambda: build_monitor(size, edges)
+
+def _monitor_detect(size, opts):
+    monitor, _ = monitor_system(size, opts.density, opts.cycles, opts.cycle_length, seed=opts.seed)
+    return monitor.find_cycle
+
+# case -> setup(size, options) returning the callable that is measured
+CASES = {
+    'bankers': _bankers,
+    'detection': _detection,
+    'wait_for_graph': _wait_for_graph,
+    'wait_for_graph_components': _wait_for_graph_components,
+    'recovery': _recovery,
+    'realtime_monitor_build': _monitor_build,
+    'realtime_monitor_detect': _monitor_detect,
+}
+
+def measure(run, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+def curve(name, sizes, opts):
+    points = []
+    for size in sizes:
+        timed = [p for p in points if 'seconds' in p]
+        if len(timed) >= 2:
+            a, b = timed[-2], timed[-1]
+            slope = max(1.0, math.log(max(b['seconds'], 1e-9) / max(a['seconds'], 1e-9)) / math.log(b['size'] / a['size']))
+            predicted = b['seconds'] * (size / b['size']) ** slope
+            if predicted > opts.budget:
+                points.append({'size': size, 'skipped': f'predicted {predicted:.0f}s > budget'})
+                continue
+        try:
+            run = CASES[name](size, opts)
+            seconds, peak = measure(run, opts.repeat)
+        except RecursionError:
+            points.append({'size': size, 'error': 'RecursionError'})
+            continue
+        except MemoryError:
+            points.append({'size': size, 'error': 'MemoryError'})
+            break
+        points.append({'size': size, 'seconds': seconds, 'peak_bytes': peak})
+        if seconds > opts.budget:
+            break
+    return points
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpus': os.cpu_count()
+    }
+
+def compare(results, baseline, tolerance):
+    """Regressions as (case, size, metric, baseline, current)"""
+    regressions = []
+    for name, points in results['cases'].items():
+        old = {p['size']: p for p in baseline['cases'].get(name, ())}
+        for point in points:
+            before = old.get(point['size'])
+            if before is None:
+                continue
+            if 'seconds' not in point:
+                if 'seconds' in before:
+                    regressions.append((name, point['size'], 'seconds', before['seconds'], point.get('error') or point.get('skipped')))
+                continue
+            if 'seconds' not in before:
+                continue
+            for metric, floor in (('seconds', MIN_SECONDS), ('peak_bytes', MIN_BYTES)):
+                if point[metric] > before[metric] * (1 + tolerance) and point[metric] - before[metric] > floor:
+                    regressions.append((name, point['size'], metric, before[metric], point[metric]))
+    return regressions
+
+def _format(point):
+    if 'seconds' not in point:
+        return point.get('error') or point.get('skipped')
+    return f"{point['seconds'] * 1000:10.2f} ms  {point['peak_bytes'] / 1024:10.0f} KiB"
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Scaling curves for the deadlock algorithms')
+    parser.add_argument('--cases', default=','.join(CASES), help='comma-separated subset of: ' + ', '.join(CASES))
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)))
+    parser.add_argument('--resources', type=int, default=8, help='resource types for matrix-based cases')
+    parser.add_argument('--density', type=float, default=2.0, help='average wait-for edges per process')
+    parser.add_argument('--cycles', type=int, default=1, help='planted deadlocks (unsafe processes for bankers)')
+    parser.add_argument('--cycle-length', type=int, default=3)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--budget', type=float, default=10.0, help='seconds allowed for one run of one point')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--save', nargs='?', const=DEFAULT_BASELINE, help='write results as a baseline')
+    parser.add_argument('--compare', nargs='?', const=DEFAULT_BASELINE, help='baseline to check against')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed relative slowdown or growth')
+    opts = parser.parse_args(argv)
+
+    names = [n for n in opts.cases.split(',') if n]
+    unknown = [n for n in names if n not in CASES]
+    if unknown:
+        parser.error(f"unknown case(s): {', '.join(unknown)}")
+    sizes = [int(s) for s in opts.sizes.split(',')]
+    # Deep recursive DFS in the monitor should be measured, not crash the run
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 10000))
+
+    results = {
+        'environment': environment(),
+        'parameters': {k: getattr(opts, k) for k in ('resources', 'density', 'cycles', 'cycle_length', 'repeat', 'seed')},
+        'cases': {}
+    }
+    for name in names:
+        print(name)
+        points = curve(name, sizes, opts)
+        for point in points:
+            print(f"  {point['size']:>8}  {_format(point)}")
+        results['cases'][name] = points
+
+    if opts.save:
+        os.makedirs(os.path.dirname(os.path.abspath(opts.save)), exist_ok=True)
+        with open(opts.save, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f'baseline written to {opts.save}')
+
+    if opts.compare:
+        with open(opts.compare) as f:
+            baseline = json.load(f)
+        if baseline.get('environment') != results['environment']:
+            print('warning: baseline was recorded on a different environment')
+        if baseline.get('parameters') != results['parameters']:
+            print('warning: baseline was recorded with different parameters')
+        regressions = compare(results, baseline, opts.tolerance)
+        for name, size, metric, before, after in regressions:
+            print(f'REGRESSION {name} size={size} {metric}: {before} -> {after}')
+        if regressions:
+            return 1
+        print('no regressions against baseline')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
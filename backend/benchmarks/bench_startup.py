@@ -0,0 +1,55 @@
+"""Import-time budget for the API and the Flask-free algorithm core.
+
+Each target is imported in fresh interpreters; the median wall time is
+checked against its budget and heavy optional subsystems must not have been
+loaded as a side effect. Exits non-zero when a check fails.
+
+Run from the backend directory:
+    python -m benchmarks.bench_startup [runs]
+"""
+import statistics
+import subprocess
+import sys
+
+# target module -> (budget in ms, modules that must stay unloaded)
+TARGETS = {
+    'algorithms.bankers_algorithm': (250, ('flask', 'reportlab', 'psutil', 'pandas', 'matplotlib')),
+    'algorithms.wait_for_graph': (50, ('flask', 'numpy', 'reportlab', 'psutil')),
+    'models.monte_carlo': (250, ('flask', 'reportlab', 'psutil', 'concurrent.futures.process')),
+    'app': (800, ('reportlab', 'psutil', 'pandas', 'matplotlib', 'multiprocessing.pool')),
+}
+
+PROBE = """
+import sys, time
+start = time.perf_counter()
+import {target}
+elapsed = time.perf_counter() - start
+forbidden = [m for m in {forbidden!r} if m in sys.modules]
+print(elapsed * 1000, ','.join(forbidden))
+"""
+
+def measure(target, forbidden, runs):
+    times = []
+    loaded = set()
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, '-c', PROBE.format(target=target, forbidden=forbidden)],
+            capture_output=True, text=True, check=True
+        ).stdout.split()
+        times.append(float(out[0]))
+        if len(out) > 1:
+            loaded.update(out[1].split(','))
+    return statistics.median(times), sorted(loaded)
+
+def run(runs):
+    failed = False
+    print(f"{'module':<32} {'median':>9} {'budget':>8}  unexpected imports")
+    for target, (budget, forbidden) in TARGETS.items():
+        median, loaded = measure(target, forbidden, runs)
+        ok = median <= budget and not loaded
+        failed |= not ok
+        print(f"{target:<32} {median:7.1f}ms {budget:6d}ms  {', '.join(loaded) or '-'}{'' if ok else '  FAIL'}")
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(run(int(sys.argv[1]) if len(sys.argv) > 1 else 5))
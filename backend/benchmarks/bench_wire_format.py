@@ -0,0 +1,61 @@
+"""JSON versus the binary array format for /api/bankers round trips.
+
+Run from the backend directory:
+    python -m benchmarks.bench_wire_format [processes] [resources]
+"""
+import json
+import sys
+import time
+
+import numpy as np
+
+from api.wire_format import MIMETYPE, decode, encode
+from app import app
+
+def system(processes, resources, seed=0):
+    rng = np.random.default_rng(seed)
+    max_need = rng.integers(0, 10, size=(processes, resources), dtype=np.int64)
+    allocation = (max_need * rng.random((processes, resources))).astype(np.int64)
+    available = rng.integers(processes, processes * 4, size=resources, dtype=np.int64)
+    return {
+        'processes': processes, 'resources': resources,
+        'allocation': allocation, 'max_need': max_need, 'available': available
+    }
+
+def timed(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def run(processes, resources, repeat=5):
+    payload = system(processes, resources)
+    as_json = {k: v.tolist() if isinstance(v, np.ndarray) else v for k, v in payload.items()}
+    json_body = json.dumps(as_json).encode()
+    binary_body = encode(payload)
+
+    print(f"{processes}x{resources}: request body JSON {len(json_body):,} B, binary {len(binary_body):,} B")
+    codec = {
+        'JSON encode': timed(lambda: json.dumps({k: np.asarray(v).tolist() for k, v in payload.items()}), repeat),
+        'JSON decode': timed(lambda: {k: np.array(v) for k, v in json.loads(json_body).items()}, repeat),
+        'binary encode': timed(lambda: encode(payload), repeat),
+        'binary decode': timed(lambda: decode(binary_body), repeat)
+    }
+    for name, seconds in codec.items():
+        print(f"  {name:<14} {seconds * 1e3:9.3f} ms")
+
+    client = app.test_client()
+    # Distinct bodies per call so the result cache does not answer
+    def post_json():
+        client.post('/api/bankers', data=json.dumps(dict(as_json, nonce=time.perf_counter())),
+                    content_type='application/json')
+    def post_binary():
+        client.post('/api/bankers', data=encode(dict(payload, nonce=time.perf_counter())),
+                    content_type=MIMETYPE, headers={'Accept': MIMETYPE})
+    print(f"  end-to-end JSON   {timed(post_json, repeat) * 1e3:9.3f} ms")
+    print(f"  end-to-end binary {timed(post_binary, repeat) * 1e3:9.3f} ms")
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1000, int(sys.argv[2]) if len(sys.argv) > 2 else 100)
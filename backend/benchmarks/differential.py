@@ -0,0 +1,243 @@
+"""Differential test of the deadlock detectors against planted ground truth.
+
+Every trial draws a wait-for system from workloads.planted_system (every
+process holds one single-unit resource and waits on others' resources, so
+all engines share the same semantics: a process is deadlocked exactly when
+it waits, directly or transitively, on a cycle). Each engine's verdict is
+checked against the known answer, and cycles it reports must exist in the
+graph. A disagreement is shrunk by deleting edges while it still
+reproduces, and printed as a JSON repro that --replay accepts.
+
+New or optimized detectors are compared by adding them to ENGINES.
+
+Run from the backend directory:
+    python -m benchmarks.differential [--trials 2000] [--max-size 300]
+    python -m benchmarks.differential --replay repro.json
+"""
+import argparse
+import json
+import math
+import random
+import sys
+import time
+
+import numpy as np
+
+from algorithms.detection_algorithm import DeadlockDetection
+from algorithms.preemption_planner import PreemptionPlanner
+from algorithms.wait_for_graph import WaitForGraph
+from benchmarks.workloads import build_monitor, planted_system
+from models.monte_carlo import deadlocked as monte_carlo_deadlocked
+
+# Dense n x n matrices: engines working on them are skipped above this size
+MATRIX_LIMIT = 400
+
+def matrices(processes, edges):
+    """Allocation, request and available for the single-unit system"""
+    allocation = np.eye(processes, dtype=np.int64)
+    request = np.zeros((processes, processes), dtype=np.int64)
+    for waiter, holder in edges:
+        request[waiter, holder] = 1
+    return allocation, request, np.zeros(processes, dtype=np.int64)
+
+def _wait_for_graph(processes, edges):
+    wfg = WaitForGraph(processes)
+    for waiter, holder in edges:
+        wfg.add_edge(waiter, holder)
+    return wfg
+
+def run_wait_for_graph(processes, edges):
+    has_deadlock, cycle = _wait_for_graph(processes, edges).detect_deadlock()
+    return {'has_deadlock': has_deadlock, 'cycle': cycle}
+
+def run_components(processes, edges):
+    components = _wait_for_graph(processes, edges).deadlocked_components()
+    return {'has_deadlock': bool(components), 'members': sorted(p for c in components for p in c)}
+
+def run_monitor(processes, edges):
+    monitor = build_monitor(processes, edges)
+    monitor.last_check_time = 0  # bypass the 100 ms throttle
+    has_deadlock, cycle = monitor.detect_deadlock()
+    return {'has_deadlock': has_deadlock, 'cycle': cycle}
+
+def run_detection(processes, edges):
+    allocation, request, available = matrices(processes, edges)
+    result = DeadlockDetection(processes, processes, allocation, request, available).detect_deadlock_step_by_step()
+    return {'has_deadlock': result['has_deadlock'], 'deadlocked': result['deadlocked_processes']}
+
+def run_planner(processes, edges):
+    allocation, request, available = matrices(processes, edges)
+    stuck = PreemptionPlanner(allocation, request, available).deadlocked().tolist()
+    return {'has_deadlock': bool(stuck), 'deadlocked': stuck}
+
+def run_monte_carlo(processes, edges):
+    allocation, request, available = matrices(processes, edges)
+    stuck = monte_carlo_deadlocked(available.tolist(), allocation.tolist(), request.tolist())
+    return {'has_deadlock': bool(stuck), 'deadlocked': sorted(stuck)}
+
+# engine -> (runner, needs dense matrices)
+ENGINES = {
+    'wait_for_graph': (run_wait_for_graph, False),
+    'wait_for_graph_components': (run_components, False),
+    'realtime_monitor': (run_monitor, False),
+    'detection': (run_detection, True),
+    'preemption_planner': (run_planner, True),
+    'monte_carlo': (run_monte_carlo, True),
+}
+
+def reference(processes, edges):
+    """Obviously-correct oracle used while shrinking: repeatedly finish
+    processes that wait on nobody still running"""
+    waiting_on = [0] * processes
+    waiters_of = [[] for _ in range(processes)]
+    for waiter, holder in set(map(tuple, edges)):
+        waiting_on[waiter] += 1
+        waiters_of[holder].append(waiter)
+    ready = [p for p in range(processes) if not waiting_on[p]]
+    while ready:
+        for waiter in waiters_of[ready.pop()]:
+            waiting_on[waiter] -= 1
+            if not waiting_on[waiter]:
+                ready.append(waiter)
+    stuck = [p for p in range(processes) if waiting_on[p]]
+    return {'has_deadlock': bool(stuck), 'deadlocked': stuck}
+
+def disagreement(engine, processes, edges, truth=None):
+    """None when the engine agrees with the truth, else what went wrong"""
+    truth = truth or reference(processes, edges)
+    runner, _ = ENGINES[engine]
+    try:
+        result = runner(processes, edges)
+    except Exception as e:
+        return f'raised {type(e).__name__}: {e}'
+    if result['has_deadlock'] != truth['has_deadlock']:
+        return f"has_deadlock={result['has_deadlock']}, expected {truth['has_deadlock']}"
+    stuck = set(truth['deadlocked'])
+    if 'cycle' in result and result['has_deadlock']:
+        cycle = result['cycle']
+        present = set(map(tuple, edges))
+        missing = [(cycle[k], cycle[(k + 1) % len(cycle)]) for k in range(len(cycle))
+                   if (cycle[k], cycle[(k + 1) % len(cycle)]) not in present]
+        if not cycle or missing:
+            return f'reported cycle {cycle} is not in the graph (missing edges {missing})'
+    if 'deadlocked' in result and set(result['deadlocked']) != stuck:
+        return f"deadlocked={sorted(result['deadlocked'])}, expected {sorted(stuck)}"
+    if 'members' in result and not set(result['members']) <= stuck:
+        return f"component members {sorted(set(result['members']) - stuck)} are not deadlocked"
+    return None
+
+def _compact(edges):
+    """Relabel the processes that appear in edges to 0..k-1"""
+    labels = {}
+    for edge in edges:
+        for p in edge:
+            labels.setdefault(p, len(labels))
+    return len(labels), [[labels[w], labels[h]] for w, h in edges]
+
+def shrink(engine, processes, edges):
+    """Delta-debug the edge list down to a minimal failing system"""
+    def fails(candidate):
+        return disagreement(engine, *_compact(candidate)) is not None
+
+    if not fails(edges):
+        # Needs the isolated processes too: keep the original labelling
+        return processes, edges
+    chunk = max(1, len(edges) // 2)
+    while True:
+        removed = False
+        i = 0
+        while i < len(edges):
+            candidate = edges[:i] + edges[i + chunk:]
+            if fails(candidate):
+                edges = candidate
+                removed = True
+            else:
+                i += chunk
+        if chunk == 1 and not removed:
+            break
+        if not removed:
+            chunk //= 2
+    return _compact(edges)
+
+def run(trials, min_size, max_size, engines, seed, max_failures, matrix_limit):
+    rng = random.Random(seed)
+    failures = []
+    checked = {engine: 0 for engine in engines}
+    started = time.perf_counter()
+    for trial in range(trials):
+        size = int(math.exp(rng.uniform(math.log(min_size), math.log(max_size))))
+        params = {
+            'processes': max(2, size),
+            'density': round(rng.uniform(0.0, 3.0), 2),
+            'cycles': rng.choice((0, 0, 1, 1, 2, 3)),
+            'cycle_length': rng.randint(2, 6),
+            'seed': rng.getrandbits(32)
+        }
+        system = planted_system(**params)
+        truth = {'has_deadlock': system['has_deadlock'], 'deadlocked': system['deadlocked']}
+        oracle = reference(system['processes'], system['edges'])
+        if oracle != truth:
+            failures.append({'engine': 'reference', 'params': params, 'problem': 'oracle disagrees with planted truth'})
+
+        for engine in engines:
+            if ENGINES[engine][1] and system['processes'] > matrix_limit:
+                continue
+            checked[engine] += 1
+            problem = disagreement(engine, system['processes'], system['edges'], truth)
+            if problem is None:
+                continue
+            processes, edges = shrink(engine, system['processes'], system['edges'])
+            repro = {
+                'engine': engine,
+                'params': params,
+                'problem': problem,
+                'repro': {'processes': processes, 'edges': edges},
+                'repro_problem': disagreement(engine, processes, edges)
+            }
+            failures.append(repro)
+            print(json.dumps(repro))
+        if len(failures) >= max_failures:
+            break
+
+    elapsed = time.perf_counter() - started
+    print(f"{trial + 1} systems in {elapsed:.1f}s; checks per engine: "
+          + ', '.join(f'{engine}={count}' for engine, count in checked.items()))
+    print(f'{len(failures)} disagreement(s)' if failures else 'all engines agree with ground truth')
+    return failures
+
+def replay(path, engines):
+    with open(path) as f:
+        repro = json.load(f)
+    system = repro.get('repro', repro)
+    processes, edges = system['processes'], system['edges']
+    print(f'reference: {reference(processes, edges)}')
+    failed = False
+    for engine in engines:
+        problem = disagreement(engine, processes, edges)
+        failed |= problem is not None
+        print(f"{engine}: {problem or 'agrees'}")
+    return failed
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Differential test of the deadlock detectors')
+    parser.add_argument('--trials', type=int, default=2000)
+    parser.add_argument('--min-size', type=int, default=2)
+    parser.add_argument('--max-size', type=int, default=300)
+    parser.add_argument('--engines', default=','.join(ENGINES), help='comma-separated subset of: ' + ', '.join(ENGINES))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-failures', type=int, default=10)
+    parser.add_argument('--matrix-limit', type=int, default=MATRIX_LIMIT, help='largest system given to matrix engines')
+    parser.add_argument('--replay', help='repro JSON printed by an earlier run')
+    args = parser.parse_args(argv)
+
+    engines = [e for e in args.engines.split(',') if e]
+    unknown = [e for e in engines if e not in ENGINES]
+    if unknown:
+        parser.error(f"unknown engine(s): {', '.join(unknown)}")
+    if args.replay:
+        return 1 if replay(args.replay, engines) else 0
+    failures = run(args.trials, args.min_size, args.max_size, engines, args.seed, args.max_failures, args.matrix_limit)
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
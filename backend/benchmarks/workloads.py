@@ -0,0 +1,129 @@
+"""Parameterized inputs for the algorithm benchmarks.
+
+Every generator is seeded and returns plain lists/arrays in the shapes the
+algorithm classes and API payloads take, built with NumPy so large sizes
+stay cheap to produce.
+"""
+import numpy as np
+
+from algorithms.realtime_monitor import RealTimeDeadlockMonitor
+
+def _feasible_available(order, allocation, demand, extra):
+    """Smallest available vector that lets processes finish in `order`,
+    plus `extra` spare units per type"""
+    if len(order) == 0:
+        return np.full(allocation.shape[1], extra, dtype=np.int64)
+    released = np.cumsum(allocation[order], axis=0)
+    released = np.vstack([np.zeros(allocation.shape[1], dtype=np.int64), released[:-1]])
+    return np.maximum((demand[order] - released).max(axis=0), 0) + extra
+
+def banker_state(processes, resources, unsafe=0, max_units=10, seed=0):
+    """Banker's input that is safe by construction; `unsafe` processes are
+    made unable to finish (they need one more unit of resource type 0, which
+    nobody else holds or needs)"""
+    rng = np.random.default_rng(seed)
+    max_need = rng.integers(0, max_units, size=(processes, resources), dtype=np.int64)
+    allocation = (max_need * rng.random((processes, resources))).astype(np.int64)
+    blocked = rng.permutation(processes)[:unsafe]
+    if unsafe:
+        allocation[:, 0] = 0
+        max_need[:, 0] = 0
+        allocation[blocked, 0] = 1
+        max_need[blocked, 0] = 2
+    order = np.setdiff1d(rng.permutation(processes), blocked, assume_unique=True)
+    available = _feasible_available(rng.permutation(order), allocation, max_need - allocation, extra=0)
+    if unsafe:
+        available[0] = 0
+    return {
+        'processes': processes, 'resources': resources,
+        'allocation': allocation, 'max_need': max_need, 'available': available,
+        'unsafe_processes': sorted(blocked.tolist())
+    }
+
+def detection_state(processes, resources, deadlocked=0, max_units=5, seed=0):
+    """Detection input whose only deadlock is `deadlocked` processes each
+    holding one unit of resource type 0 and requesting another"""
+    rng = np.random.default_rng(seed)
+    allocation = rng.integers(0, max_units, size=(processes, resources), dtype=np.int64)
+    request = rng.integers(0, max_units, size=(processes, resources), dtype=np.int64)
+    stuck = rng.permutation(processes)[:deadlocked]
+    if deadlocked:
+        allocation[:, 0] = 0
+        request[:, 0] = 0
+        allocation[stuck, 0] = 1
+        request[stuck, 0] = 1
+        request[stuck, 1:] = 0
+    order = np.setdiff1d(rng.permutation(processes), stuck, assume_unique=True)
+    available = _feasible_available(rng.permutation(order), allocation, request, extra=0)
+    if deadlocked:
+        available[0] = 0
+    return {
+        'processes': processes, 'resources': resources,
+        'allocation': allocation, 'request': request, 'available': available,
+        'deadlocked_processes': sorted(stuck.tolist())
+    }
+
+def wait_graph(processes, density=2.0, cycles=0, cycle_length=3, seed=0):
+    """Random wait-for edges that only point from lower to higher rank (so
+    acyclic), averaging `density` out-edges per process, plus `cycles`
+    disjoint planted rings. Returns (edges, rings)."""
+    rng = np.random.default_rng(seed)
+    rank = rng.permutation(processes)
+    count = int(processes * density)
+    src = rng.integers(0, processes, size=count)
+    dst = rng.integers(0, processes, size=count)
+    keep = src != dst
+    src, dst = src[keep], dst[keep]
+    forward = rank[src] < rank[dst]
+    waiters = np.where(forward, src, dst)
+    holders = np.where(forward, dst, src)
+    edges = np.unique(np.stack([waiters, holders], axis=1), axis=0).tolist() if len(waiters) else []
+
+    rings = []
+    members = rng.permutation(processes)[:min(cycles * cycle_length, processes)]
+    for start in range(0, len(members) - cycle_length + 1, cycle_length):
+        ring = members[start:start + cycle_length].tolist()
+        rings.append(ring)
+        edges.extend([ring[k], ring[(k + 1) % len(ring)]] for k in range(len(ring)))
+    return edges, rings
+
+def build_monitor(processes, edges):
+    """RealTimeDeadlockMonitor where every process holds its own resource
+    r<p> and then waits on the resources of its wait-for successors"""
+    monitor = RealTimeDeadlockMonitor()
+    monitor.reset_system()
+    for p in range(processes):
+        monitor.add_process(p, f'P{p}', ('High', 'Medium', 'Low')[p % 3])
+        monitor.add_resource(f'r{p}', f'R{p}', 1)
+        monitor.request_resource(p, f'r{p}')
+    for waiter, holder in edges:
+        monitor.request_resource(waiter, f'r{holder}')
+    return monitor
+
+def monitor_system(processes, density=1.0, cycles=0, cycle_length=3, seed=0):
+    """build_monitor() over wait_graph(); returns (monitor, rings)"""
+    edges, rings = wait_graph(processes, density, cycles, cycle_length, seed)
+    return build_monitor(processes, edges), rings
+
+def planted_system(processes, density=1.0, cycles=0, cycle_length=3, seed=0):
+    """Wait-for graph with its ground truth known from construction: it is
+    deadlocked exactly when a ring was planted, and the deadlocked processes
+    are the ring members plus everything waiting on them, directly or not"""
+    edges, rings = wait_graph(processes, density, cycles, cycle_length, seed)
+    waiters_of = {}
+    for waiter, holder in edges:
+        waiters_of.setdefault(holder, []).append(waiter)
+    stuck = {p for ring in rings for p in ring}
+    frontier = list(stuck)
+    while frontier:
+        for waiter in waiters_of.get(frontier.pop(), ()):
+            if waiter not in stuck:
+                stuck.add(waiter)
+                frontier.append(waiter)
+    return {
+        'processes': processes,
+        'edges': edges,
+        'rings': rings,
+        'has_deadlock': bool(rings),
+        'deadlocked': sorted(stuck)
+    }
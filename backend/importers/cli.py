@@ -0,0 +1,38 @@
+"""Scan lock dumps for deadlocks from the command line.
+
+Run from the backend directory:
+    python -m importers.cli pg_locks locks.csv [--activity activity.csv]
+    jstack <pid> | python -m importers.cli jvm -
+"""
+import argparse
+import json
+import sys
+
+from importers.jvm_threads import JvmThreadDumpImporter
+from importers.pg_locks import PgLocksImporter
+
+FORMATS = ('pg_locks', 'jvm')
+
+def import_dump(fmt, source, activity=None):
+    if fmt == 'pg_locks':
+        return PgLocksImporter().run(source, activity=activity)
+    if fmt == 'jvm':
+        return JvmThreadDumpImporter().run(source)
+    raise ValueError(f"Unknown dump format {fmt!r}, expected one of: {', '.join(FORMATS)}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Find deadlocks in database lock exports and JVM thread dumps')
+    parser.add_argument('format', choices=FORMATS)
+    parser.add_argument('file', help="dump file, or '-' for stdin")
+    parser.add_argument('--activity', help='pg_stat_activity CSV export (pg_locks only)')
+    args = parser.parse_args(argv)
+
+    summary = import_dump(args.format, args.file, activity=args.activity)
+    json.dump(summary, sys.stdout, indent=2)
+    sys.stdout.write('\n')
+    # Non-zero exit so scripts can alert on a deadlock
+    deadlocked = summary.get('deadlocked_snapshots', 0) or summary.get('deadlocked_dumps', 0)
+    return 1 if deadlocked else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,77 @@
+import io
+import sys
+from algorithms.wait_for_graph import WaitForGraph
+
+CHUNK_SIZE = 1 << 20
+
+def open_text(source, chunk_size=CHUNK_SIZE):
+    """Line-iterable text stream over a path, '-' (stdin) or a file object.
+
+    Reads go through a fixed-size buffer, so memory does not grow with the
+    size of the dump."""
+    if source == '-':
+        return io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8', errors='replace')
+    if isinstance(source, str):
+        return open(source, 'r', encoding='utf-8', errors='replace', buffering=chunk_size, newline='')
+    if isinstance(source, io.TextIOBase):
+        return source
+    return io.TextIOWrapper(source, encoding='utf-8', errors='replace', newline='')
+
+class WaitGraphBuilder:
+    """Collects waiter -> holder edges between externally identified parties
+    (PIDs, thread names) and reports every deadlocked component"""
+    def __init__(self):
+        self.ids = {}
+        self.parties = []
+        self.edges = {}
+
+    def node(self, key, info):
+        node = self.ids.get(key)
+        if node is None:
+            node = len(self.parties)
+            self.ids[key] = node
+            self.parties.append(info)
+        return node
+
+    def add_wait(self, waiter_key, waiter_info, holder_key, holder_info, lock):
+        waiter = self.node(waiter_key, waiter_info)
+        holder = self.node(holder_key, holder_info)
+        if waiter != holder:
+            self.edges.setdefault((waiter, holder), lock)
+
+    def to_wait_for_graph(self):
+        wfg = WaitForGraph(len(self.parties))
+        for waiter, holder in self.edges:
+            wfg.add_edge(waiter, holder)
+        return wfg
+
+    def deadlocks(self):
+        wfg = self.to_wait_for_graph()
+        results = []
+        for component in wfg.deadlocked_components():
+            # Concrete cycle inside the component, found on its own subgraph
+            members = set(component)
+            local = {node: i for i, node in enumerate(component)}
+            sub = WaitForGraph(len(component))
+            for (waiter, holder) in self.edges:
+                if waiter in members and holder in members:
+                    sub.add_edge(local[waiter], local[holder])
+            _, cycle = sub.detect_deadlock()
+            cycle = [component[i] for i in cycle]
+
+            results.append({
+                'members': [self.parties[n] for n in component],
+                'cycle': [self.parties[n] for n in cycle],
+                'waits': [
+                    {
+                        'waiter': self.parties[waiter],
+                        'holder': self.parties[cycle[(k + 1) % len(cycle)]],
+                        'lock': self.edges[(waiter, cycle[(k + 1) % len(cycle)])]
+                    }
+                    for k, waiter in enumerate(cycle)
+                ]
+            })
+        return results
+
+    def summary(self):
+        return {'parties': len(self.parties), 'wait_edges': len(self.edges)}
@@ -0,0 +1,136 @@
+"""Streaming importer for JVM thread dumps (jstack, jcmd Thread.print, kill -3).
+
+A file may hold many consecutive dumps; each one starts at a
+"Full thread dump" line and is analysed on its own. Per thread only the
+monitors/synchronizers it owns, the one it is blocked on and the top few
+frames are kept, so memory is bounded by a single dump's lock table.
+"""
+import re
+from importers.common import WaitGraphBuilder, open_text
+
+THREAD_RE = re.compile(r'^"(?P<name>(?:[^"\\]|\\.)*)"(?P<rest>.*)$')
+TID_RE = re.compile(r'\btid=(0x[0-9a-f]+)')
+NID_RE = re.compile(r'\bnid=(0x[0-9a-f]+|\d+)')
+STATE_RE = re.compile(r'^\s*java\.lang\.Thread\.State: (\S+)')
+LOCK_RE = re.compile(r'<(0x[0-9a-f]+)>(?: \(a ([^)]+)\))?')
+FRAME_PREFIX = 'at '
+
+# "- waiting on <..>" is Object.wait(), which releases the monitor, so it is
+# not a wait-for edge
+WAIT_PREFIXES = ('- waiting to lock', '- parking to wait for', '- waiting to re-lock in wait()')
+HOLD_PREFIXES = ('- locked',)
+
+class _Thread:
+    __slots__ = ('name', 'tid', 'nid', 'state', 'frames', 'holds', 'waits_for')
+
+    def __init__(self, name, header):
+        self.name = name
+        tid = TID_RE.search(header)
+        nid = NID_RE.search(header)
+        self.tid = tid.group(1) if tid else None
+        self.nid = nid.group(1) if nid else None
+        self.state = None
+        self.frames = []
+        self.holds = {}
+        self.waits_for = None
+
+    def key(self):
+        return (self.name, self.nid or self.tid)
+
+    def info(self):
+        return {'name': self.name, 'tid': self.tid, 'nid': self.nid, 'state': self.state, 'frames': self.frames}
+
+class JvmThreadDumpImporter:
+    def __init__(self, max_frames=8, max_reported_dumps=100):
+        self.max_frames = max_frames
+        self.max_reported_dumps = max_reported_dumps
+
+    def run(self, source):
+        summary = {'format': 'jvm', 'dumps': 0, 'threads': 0, 'deadlocked_dumps': 0, 'dumps_with_deadlock': []}
+        threads = []
+        thread = None
+        dump_header = None
+        in_synchronizers = False
+        in_trailer = False
+
+        for line in open_text(source):
+            stripped = line.strip()
+            if stripped.startswith('Full thread dump'):
+                if dump_header is not None or threads:
+                    self._finish(dump_header, threads, summary)
+                dump_header, threads, thread = stripped, [], None
+                in_trailer = False
+                continue
+            # The JVM's own "Found one Java-level deadlock" report and JNI
+            # stats quote thread names too; they are not thread entries
+            if stripped.startswith(('Found one Java-level deadlock', 'Found a total of', 'JNI global ref')):
+                in_trailer, thread = True, None
+            if in_trailer:
+                continue
+
+            match = THREAD_RE.match(stripped)
+            if match:
+                thread = _Thread(match.group('name'), match.group('rest'))
+                threads.append(thread)
+                in_synchronizers = False
+                continue
+            if thread is None or not stripped:
+                continue
+
+            if stripped.startswith('Locked ownable synchronizers:'):
+                in_synchronizers = True
+                continue
+            if stripped.startswith(FRAME_PREFIX):
+                if len(thread.frames) < self.max_frames:
+                    thread.frames.append(stripped[len(FRAME_PREFIX):])
+                continue
+
+            state = STATE_RE.match(stripped)
+            if state:
+                thread.state = state.group(1)
+            elif stripped.startswith('-'):
+                lock = LOCK_RE.search(stripped)
+                if lock is None:
+                    continue
+                address, cls = lock.group(1), lock.group(2)
+                if in_synchronizers or stripped.startswith(HOLD_PREFIXES):
+                    thread.holds[address] = cls
+                elif stripped.startswith(WAIT_PREFIXES) and thread.waits_for is None:
+                    # The first wait line is the innermost frame, i.e. the
+                    # lock the thread is actually blocked on
+                    thread.waits_for = (address, cls)
+
+        if dump_header is not None or threads:
+            self._finish(dump_header, threads, summary)
+        return summary
+
+    def _finish(self, header, threads, summary):
+        summary['dumps'] += 1
+        summary['threads'] += len(threads)
+
+        owners = {}
+        for thread in threads:
+            for address in thread.holds:
+                owners[address] = thread
+
+        builder = WaitGraphBuilder()
+        for thread in threads:
+            if thread.waits_for is None:
+                continue
+            address, cls = thread.waits_for
+            owner = owners.get(address)
+            if owner is None or owner is thread:
+                continue
+            builder.add_wait(thread.key(), thread.info(), owner.key(), owner.info(),
+                             {'address': address, 'class': cls or owner.holds[address]})
+
+        deadlocks = builder.deadlocks()
+        if deadlocks:
+            summary['deadlocked_dumps'] += 1
+            if len(summary['dumps_with_deadlock']) < self.max_reported_dumps:
+                summary['dumps_with_deadlock'].append({
+                    'dump': summary['dumps'],
+                    'header': header,
+                    'graph': builder.summary(),
+                    'deadlocks': deadlocks
+                })
@@ -0,0 +1,198 @@
+"""Streaming importer for PostgreSQL pg_locks exports.
+
+Expects CSV with a header, e.g. from
+
+    COPY (SELECT now() AS sample_time, l.*, pg_blocking_pids(l.pid) AS blocking_pids,
+                 a.query, a.state, a.usename
+          FROM pg_locks l LEFT JOIN pg_stat_activity a USING (pid))
+    TO STDOUT WITH CSV HEADER
+
+Only pid, mode, granted and the lock-identifying columns are required.
+When a blocking_pids column is present, the server's own answer decides who
+blocks an ungranted request; otherwise waiters block on granted holders in
+a conflicting mode, since row order says nothing about the wait queue.
+A separate pg_stat_activity export can be given to describe the backends
+that end up in a deadlock. Rows are grouped into snapshots by a sample_time-like column when present,
+and each snapshot is analysed and discarded before the next one is read,
+so memory is bounded by one lock table rather than by the file size.
+"""
+import csv
+from importers.common import WaitGraphBuilder, open_text
+
+MODES = [
+    'AccessShareLock', 'RowShareLock', 'RowExclusiveLock', 'ShareUpdateExclusiveLock',
+    'ShareLock', 'ShareRowExclusiveLock', 'ExclusiveLock', 'AccessExclusiveLock'
+]
+
+# PostgreSQL table-level lock conflict matrix, indexed like MODES
+_CONFLICTS = {
+    'AccessShareLock': {'AccessExclusiveLock'},
+    'RowShareLock': {'ExclusiveLock', 'AccessExclusiveLock'},
+    'RowExclusiveLock': {'ShareLock', 'ShareRowExclusiveLock', 'ExclusiveLock', 'AccessExclusiveLock'},
+    'ShareUpdateExclusiveLock': {'ShareUpdateExclusiveLock', 'ShareLock', 'ShareRowExclusiveLock',
+                                 'ExclusiveLock', 'AccessExclusiveLock'},
+    'ShareLock': {'RowExclusiveLock', 'ShareUpdateExclusiveLock', 'ShareRowExclusiveLock',
+                  'ExclusiveLock', 'AccessExclusiveLock'},
+    'ShareRowExclusiveLock': {'RowExclusiveLock', 'ShareUpdateExclusiveLock', 'ShareLock',
+                              'ShareRowExclusiveLock', 'ExclusiveLock', 'AccessExclusiveLock'},
+    'ExclusiveLock': set(MODES[1:]),
+    'AccessExclusiveLock': set(MODES)
+}
+CONFLICT_MASK = {
+    mode: sum(1 << MODES.index(other) for other in conflicts)
+    for mode, conflicts in _CONFLICTS.items()
+}
+
+LOCK_COLUMNS = ('locktype', 'database', 'relation', 'page', 'tuple', 'virtualxid',
+                'transactionid', 'classid', 'objid', 'objsubid')
+SNAPSHOT_COLUMNS = ('sample_time', 'snapshot', 'captured_at', 'ts')
+ACTIVITY_COLUMNS = ('query', 'state', 'usename', 'application_name', 'wait_event_type', 'wait_event')
+
+def _is_true(value):
+    return value.strip().lower() in ('t', 'true', '1', 'yes')
+
+def _pid_array(value):
+    """Parse a PostgreSQL integer array such as '{101,202}'"""
+    return [int(pid) for pid in value.strip().strip('{}').split(',') if pid.strip().isdigit()]
+
+class PgLocksImporter:
+    def __init__(self, max_reported_snapshots=100):
+        self.max_reported_snapshots = max_reported_snapshots
+        self.lock_names = ()
+
+    def run(self, source, activity=None):
+        stream = open_text(source)
+        reader = csv.reader(stream)
+        header = next(reader, None)
+        if header is None:
+            raise ValueError('empty pg_locks dump')
+        header = [h.strip().lower() for h in header]
+        col = {name: i for i, name in enumerate(header)}
+        for required in ('pid', 'mode', 'granted'):
+            if required not in col:
+                raise ValueError(f"pg_locks export is missing the '{required}' column")
+
+        lock_cols = [(name, col[name]) for name in LOCK_COLUMNS if name in col]
+        self.lock_names = [name for name, _ in lock_cols]
+        activity_cols = [(name, col[name]) for name in ACTIVITY_COLUMNS if name in col]
+        snapshot_col = next((col[name] for name in SNAPSHOT_COLUMNS if name in col), None)
+        vxid_col = col.get('virtualtransaction')
+        blocking_col = col.get('blocking_pids')
+        pid_col, mode_col, granted_col = col['pid'], col['mode'], col['granted']
+
+        summary = {'format': 'pg_locks', 'rows': 0, 'snapshots': 0, 'deadlocked_snapshots': 0, 'snapshots_with_deadlock': []}
+        current = None
+        state = self._new_state()
+
+        for row in reader:
+            if not row:
+                continue
+            if snapshot_col is not None and row[snapshot_col] != current:
+                if current is not None:
+                    self._finish(current, state, summary)
+                current = row[snapshot_col]
+                state = self._new_state()
+
+            summary['rows'] += 1
+            pid = row[pid_col].strip()
+            vxid = row[vxid_col].strip() if vxid_col is not None else ''
+            # Prepared transactions have no backend pid
+            party = f'pid:{pid}' if pid else f'vxid:{vxid}'
+            if party not in state['parties']:
+                info = {'pid': int(pid) if pid.isdigit() else None, 'virtualtransaction': vxid or None}
+                for name, i in activity_cols:
+                    if row[i]:
+                        info[name] = row[i]
+                state['parties'][party] = info
+
+            key = tuple(row[i] for _, i in lock_cols)
+            mode = row[mode_col].strip()
+            entry = (party, mode)
+            if _is_true(row[granted_col]):
+                state['holders'].setdefault(key, []).append(entry)
+            else:
+                state['waiters'].setdefault(key, []).append(entry)
+                if blocking_col is not None:
+                    state['blocking_pids'][(party, key)] = _pid_array(row[blocking_col])
+
+        self._finish(current, state, summary)
+        if activity is not None:
+            self._attach_activity(activity, summary)
+        return summary
+
+    def _new_state(self):
+        return {'parties': {}, 'holders': {}, 'waiters': {}, 'blocking_pids': {}}
+
+    def _finish(self, snapshot, state, summary):
+        summary['snapshots'] += 1
+        builder = WaitGraphBuilder()
+        parties = state['parties']
+
+        for key, waiters in state['waiters'].items():
+            lock = {name: value for name, value in zip(self.lock_names, key) if value}
+            holders = state['holders'].get(key, [])
+            for waiter, wanted in waiters:
+                blocking_pids = state['blocking_pids'].get((waiter, key))
+                if blocking_pids is not None:
+                    modes = dict(holders)
+                    for pid in blocking_pids:
+                        blocker = f'pid:{pid}'
+                        if blocker == waiter:
+                            continue
+                        info = parties.setdefault(blocker, {'pid': pid, 'virtualtransaction': None})
+                        builder.add_wait(waiter, parties[waiter], blocker, info,
+                                         dict(lock, requested_mode=wanted, blocking_mode=modes.get(blocker)))
+                    continue
+
+                # Without the server's answer only granted holders in a
+                # conflicting mode are known to block
+                conflicts = CONFLICT_MASK.get(wanted, CONFLICT_MASK['AccessExclusiveLock'])
+                for blocker, held in holders:
+                    if blocker == waiter or held not in CONFLICT_MASK:
+                        continue
+                    if conflicts & (1 << MODES.index(held)):
+                        builder.add_wait(waiter, parties[waiter], blocker, parties[blocker],
+                                         dict(lock, requested_mode=wanted, blocking_mode=held))
+
+        deadlocks = builder.deadlocks()
+        if deadlocks:
+            summary['deadlocked_snapshots'] += 1
+            if len(summary['snapshots_with_deadlock']) < self.max_reported_snapshots:
+                summary['snapshots_with_deadlock'].append({
+                    'snapshot': snapshot,
+                    'graph': builder.summary(),
+                    'deadlocks': deadlocks
+                })
+
+    def _attach_activity(self, source, summary):
+        """Second streaming pass over pg_stat_activity, keeping only rows for
+        backends that appear in a reported deadlock"""
+        wanted = {}
+        for report in summary['snapshots_with_deadlock']:
+            for deadlock in report['deadlocks']:
+                for party in deadlock['members']:
+                    if party['pid'] is not None:
+                        wanted.setdefault(party['pid'], []).append(party)
+        if not wanted:
+            return
+
+        reader = csv.reader(open_text(source))
+        header = next(reader, None)
+        if header is None:
+            raise ValueError('empty pg_stat_activity export')
+        header = [h.strip().lower() for h in header]
+        col = {name: i for i, name in enumerate(header)}
+        if 'pid' not in col:
+            raise ValueError("pg_stat_activity export is missing the 'pid' column")
+        activity_cols = [(name, col[name]) for name in ACTIVITY_COLUMNS + ('backend_start', 'xact_start', 'query_start')
+                         if name in col]
+
+        for row in reader:
+            if not row:
+                continue
+            pid = row[col['pid']].strip()
+            if not pid.isdigit() or int(pid) not in wanted:
+                continue
+            details = {name: row[i] for name, i in activity_cols if row[i]}
+            for party in wanted[int(pid)]:
+                party.update(details)
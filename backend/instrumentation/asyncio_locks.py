@@ -0,0 +1,290 @@
+"""Deadlock detection for asyncio tasks, locks and events.
+
+Tracked primitives keep a WaitForGraph up to date as they are used. Tasks
+and primitives share one integer node space, so the graph is bipartite:
+
+    task -> primitive   the task is awaiting the primitive
+    lock -> task        the task holds the lock
+    event -> task       the task is responsible for setting the event
+
+Every update touches a single edge, so acquire/release stay O(1). Tasks that
+await other tasks directly (or through gather) are picked up by a sampler
+that runs a few times per second on the loop, refreshes those edges from
+each task's pending future and runs cycle detection only when the graph has
+changed since the previous sample.
+
+    detector = AsyncDeadlockDetector()
+    detector.start()
+    lock = detector.Lock('orders')
+"""
+import asyncio
+import time
+import weakref
+
+from algorithms.wait_for_graph import WaitForGraph
+
+class _TrackedLock(asyncio.Lock):
+    def __init__(self, detector, name):
+        super().__init__()
+        self._detector = detector
+        self._owner = None
+        self._node_id = detector._node(self)
+        self.name = name
+
+    async def acquire(self):
+        detector = self._detector
+        task = detector._node(asyncio.current_task())
+        # A just-released lock with queued waiters is handed to them first,
+        # so this acquire suspends too
+        if self.locked() or self._waiters:
+            detector._add(task, self._node_id)
+            try:
+                await super().acquire()
+            finally:
+                detector._remove(task, self._node_id)
+        else:
+            await super().acquire()
+        self._owner = task
+        detector._add(self._node_id, task)
+        return True
+
+    def release(self):
+        owner = self._owner
+        super().release()
+        self._owner = None
+        if owner is not None:
+            self._detector._remove(self._node_id, owner)
+
+class _TrackedEvent(asyncio.Event):
+    def __init__(self, detector, name, owner=None):
+        super().__init__()
+        self._detector = detector
+        self._owner = None
+        self._node_id = detector._node(self)
+        self.name = name
+        if owner is not None:
+            self.set_owner(owner)
+
+    def set_owner(self, task):
+        """Declare the task expected to call set()"""
+        if self._owner is not None:
+            self._detector._remove(self._node_id, self._owner)
+        self._owner = None if task is None else self._detector._node(task)
+        if self._owner is not None:
+            self._detector._add(self._node_id, self._owner)
+
+    async def wait(self):
+        if self.is_set():
+            return True
+        task = self._detector._node(asyncio.current_task())
+        self._detector._add(task, self._node_id)
+        try:
+            return await super().wait()
+        finally:
+            self._detector._remove(task, self._node_id)
+
+    def set(self):
+        super().set()
+        self.set_owner(None)
+
+class AsyncDeadlockDetector:
+    def __init__(self, interval=0.5, stack_limit=8):
+        self.interval = interval
+        self.stack_limit = stack_limit
+        self.graph = WaitForGraph(0)
+        self.reports = []
+        self.callbacks = []
+        self.stats = {
+            'samples': 0,
+            'checks': 0,
+            'check_time': 0.0,
+            'deadlocks_reported': 0
+        }
+
+        # Objects are held weakly: a collected primitive or task gives its
+        # node id back at the next safe point
+        self._ids = weakref.WeakKeyDictionary()
+        self._objects = {}
+        self._finalizers = {}
+        self._collected = []
+        self._free_ids = []
+        self._task_edges = {}
+        self._version = 0
+        self._checked_version = -1
+        self._reported = set()
+        self._sampler = None
+
+    # Primitive factories
+    def Lock(self, name=None):
+        return _TrackedLock(self, name or f'lock-{len(self._ids)}')
+
+    def Event(self, name=None, owner=None):
+        return _TrackedEvent(self, name or f'event-{len(self._ids)}', owner)
+
+    # Graph maintenance
+    def _node(self, obj):
+        node = self._ids.get(obj)
+        if node is None:
+            self._reclaim()
+            if self._free_ids:
+                node = self._free_ids.pop()
+            else:
+                node = self.graph.processes
+                self.graph.processes += 1
+            self._ids[obj] = node
+            self._objects[node] = weakref.ref(obj)
+            # Finalizers may run mid-update, so they only queue the node
+            self._finalizers[node] = weakref.finalize(obj, self._collected.append, node)
+        return node
+
+    def _object(self, node):
+        ref = self._objects.get(node)
+        return ref() if ref is not None else None
+
+    def _reclaim(self):
+        """Drop the nodes of collected objects and their edges"""
+        while self._collected:
+            node = self._collected.pop()
+            if self._finalizers.pop(node, None) is None:
+                continue
+            graph = self.graph
+            for target in graph.graph.pop(node, ()):
+                graph.in_degree[target] -= 1
+            if graph.in_degree.pop(node, 0):
+                for targets in graph.graph.values():
+                    targets[:] = [t for t in targets if t != node]
+            del self._objects[node]
+            self._free_ids.append(node)
+            self._version += 1
+
+    # Edges are between node ids
+    def _add(self, source, target):
+        self.graph.add_edge(source, target)
+        self._version += 1
+
+    def _remove(self, source, target):
+        self.graph.remove_edge(source, target)
+        self._version += 1
+
+    def _release_task(self, task):
+        node = self._ids[task]
+        if self.graph.graph.get(node) or self.graph.in_degree.get(node):
+            return
+        self.graph.graph.pop(node, None)
+        self.graph.in_degree.pop(node, None)
+        del self._ids[task]
+        del self._objects[node]
+        self._finalizers.pop(node).detach()
+        self._free_ids.append(node)
+
+    # Sampling
+    def _awaited_tasks(self, task):
+        waiter = getattr(task, '_fut_waiter', None)
+        if waiter is None:
+            return ()
+        if isinstance(waiter, asyncio.Task):
+            return (waiter,)
+        children = getattr(waiter, '_children', None)
+        if children:
+            return tuple(c for c in children if isinstance(c, asyncio.Task) and not c.done())
+        return ()
+
+    def _refresh_task_edges(self):
+        for task in asyncio.all_tasks():
+            awaited = self._awaited_tasks(task)
+            previous = self._task_edges.get(task, ())
+            if awaited == previous:
+                continue
+            node = self._node(task)
+            for target in previous:
+                self._remove(node, self._ids[target])
+            for target in awaited:
+                self._add(node, self._node(target))
+            if awaited:
+                self._task_edges[task] = awaited
+            else:
+                self._task_edges.pop(task, None)
+
+        # Finished tasks drop their sampled edges and give their node back
+        for task in [t for t in self._ids if isinstance(t, asyncio.Task) and t.done()]:
+            for target in self._task_edges.pop(task, ()):
+                self._remove(self._ids[task], self._ids[target])
+            self._release_task(task)
+
+    def sample(self):
+        """Refresh task-to-task edges and check for cycles if anything changed"""
+        self.stats['samples'] += 1
+        self._reclaim()
+        self._refresh_task_edges()
+        if self._version == self._checked_version:
+            return []
+        self._checked_version = self._version
+
+        start = time.perf_counter()
+        components = self.graph.deadlocked_components()
+        self.stats['checks'] += 1
+        self.stats['check_time'] += time.perf_counter() - start
+
+        # Each independent deadlock is reported once, for as long as it lasts
+        keys = set()
+        reports = []
+        for component in components:
+            key = frozenset(component)
+            keys.add(key)
+            if key in self._reported:
+                continue
+            report = self._build_report(component)
+            reports.append(report)
+            self.reports.append(report)
+            self.stats['deadlocks_reported'] += 1
+            for callback in self.callbacks:
+                callback(report)
+        self._reported = keys
+        return reports
+
+    def _build_report(self, cycle):
+        members = []
+        for node in cycle:
+            obj = self._object(node)
+            if isinstance(obj, asyncio.Task):
+                members.append({
+                    'kind': 'task',
+                    'name': obj.get_name(),
+                    'stack': [
+                        f"{f.f_code.co_filename}:{f.f_lineno} in {f.f_code.co_name}"
+                        for f in obj.get_stack(limit=self.stack_limit)
+                    ]
+                })
+            else:
+                members.append({
+                    'kind': 'event' if isinstance(obj, asyncio.Event) else 'lock',
+                    'name': getattr(obj, 'name', str(node))
+                })
+        return {
+            'timestamp': time.time(),
+            'type': 'ASYNC_DEADLOCK',
+            'cycle': [m['name'] for m in members],
+            'members': members
+        }
+
+    def add_callback(self, callback):
+        self.callbacks.append(callback)
+
+    # Lifecycle
+    def start(self):
+        """Start the sampler on the running loop"""
+        if self._sampler is None:
+            self._sampler = asyncio.get_running_loop().create_task(
+                self._sample_loop(), name='async-deadlock-sampler'
+            )
+        return self._sampler
+
+    def stop(self):
+        if self._sampler is not None:
+            self._sampler.cancel()
+            self._sampler = None
+
+    async def _sample_loop(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            self.sample()
@@ -0,0 +1,361 @@
+"""Opt-in deadlock watchdog for threading locks.
+
+Every thread that touches a watched lock owns a small record: the list of
+lock ids it holds and the lock it is currently blocked on. Acquire and
+release only update the calling thread's own record, so the hot path takes
+no shared lock. A publisher thread snapshots the records on a fixed cadence,
+applies the differences to a RealTimeDeadlockMonitor (threads as processes,
+locks as single-instance resources) and reports wait-for cycles that persist
+across two consecutive snapshots.
+
+    watchdog = LockWatchdog()
+    watchdog.start()
+    lock = watchdog.Lock('accounts')
+
+or patch threading.Lock / RLock / Condition for the whole program with
+watchdog.install().
+"""
+import _thread
+import itertools
+import sys
+import threading
+import time
+import traceback
+
+from algorithms.realtime_monitor import RealTimeDeadlockMonitor
+from algorithms.wait_for_graph import WaitForGraph
+
+def _creation_site(kind):
+    frame = sys._getframe(3)
+    return f"{kind}@{frame.f_code.co_filename}:{frame.f_lineno}"
+
+class _ThreadRecord:
+    __slots__ = ('held', 'waiting')
+
+    def __init__(self):
+        self.held = []
+        self.waiting = None
+
+class _WatchedLock:
+    __slots__ = ('_lock', '_local', '_watchdog', '_holder', 'lock_id', 'name', '__weakref__')
+
+    def __init__(self, watchdog, name=None):
+        self._lock = _thread.allocate_lock()
+        self._local = watchdog._local
+        self._watchdog = watchdog
+        # Record of the thread holding the lock; any thread may release it
+        self._holder = None
+        self.lock_id = next(watchdog._lock_ids)
+        self.name = name or _creation_site('Lock')
+        watchdog._lock_names[self.lock_id] = self.name
+
+    def acquire(self, blocking=True, timeout=-1):
+        # Uncontended fast path: one try-acquire and one list append
+        if self._lock.acquire(False):
+            try:
+                record = self._local.record
+            except AttributeError:
+                record = self._watchdog._register_thread()
+            record.held.append(self.lock_id)
+            self._holder = record
+            return True
+        if not blocking:
+            return False
+        try:
+            record = self._local.record
+        except AttributeError:
+            record = self._watchdog._register_thread()
+        record.waiting = self.lock_id
+        acquired = self._lock.acquire(True, timeout)
+        if acquired:
+            record.held.append(self.lock_id)
+            self._holder = record
+        record.waiting = None
+        return acquired
+
+    def release(self):
+        # Clear the holder before the real release so the next owner's is kept
+        holder, self._holder = self._holder, None
+        self._lock.release()
+        if holder is not None:
+            holder.held.remove(self.lock_id)
+
+    def locked(self):
+        return self._lock.locked()
+
+    def __enter__(self):
+        return self.acquire()
+
+    def __exit__(self, *args):
+        self.release()
+
+    def __repr__(self):
+        return f"<watched lock {self.name!r} locked={self.locked()}>"
+
+class _WatchedRLock(_WatchedLock):
+    __slots__ = ('_owner', '_count')
+
+    def __init__(self, watchdog, name=None):
+        _WatchedLock.__init__(self, watchdog, name or _creation_site('RLock'))
+        self._owner = None
+        self._count = 0
+
+    def acquire(self, blocking=True, timeout=-1):
+        me = _thread.get_ident()
+        if self._owner == me:
+            self._count += 1
+            return True
+        if _WatchedLock.acquire(self, blocking, timeout):
+            self._owner = me
+            self._count = 1
+            return True
+        return False
+
+    def release(self):
+        if self._owner != _thread.get_ident():
+            raise RuntimeError("cannot release un-acquired lock")
+        self._count -= 1
+        if self._count == 0:
+            self._owner = None
+            _WatchedLock.release(self)
+
+    def __enter__(self):
+        return self.acquire()
+
+    def __exit__(self, *args):
+        self.release()
+
+    # Hooks used by threading.Condition so wait() fully releases a nested RLock
+    def _release_save(self):
+        state = (self._owner, self._count)
+        self._count = 1
+        self.release()
+        return state
+
+    def _acquire_restore(self, state):
+        _WatchedLock.acquire(self)
+        self._owner, self._count = state
+
+    def _is_owned(self):
+        return self._owner == _thread.get_ident()
+
+class LockWatchdog:
+    def __init__(self, monitor=None, publish_interval=0.05):
+        self.monitor = monitor or RealTimeDeadlockMonitor()
+        self.publish_interval = publish_interval
+        self.reports = []
+        self.callbacks = []
+        self.stats = {
+            'snapshots': 0,
+            'threads_updated': 0,
+            'deadlocks_reported': 0
+        }
+
+        self._lock_ids = itertools.count(1)
+        self._lock_names = {}
+        self._local = threading.local()
+        self._records = {}
+        self._registry_lock = _thread.allocate_lock()
+        self._last_snapshot = {}
+        self._suspected = set()
+        self._reported = set()
+        self._running = False
+        self._thread = None
+        self._originals = None
+
+    # Lock factories
+    def Lock(self, name=None):
+        return _WatchedLock(self, name)
+
+    def RLock(self, name=None):
+        return _WatchedRLock(self, name)
+
+    def Condition(self, lock=None):
+        return self._original('Condition')(lock if lock is not None else self.RLock())
+
+    def _original(self, attr):
+        if self._originals:
+            return self._originals[attr]
+        return getattr(threading, attr)
+
+    def _register_thread(self):
+        # current_thread() is unsafe here: Thread.start() takes locks before
+        # the new thread is registered, so key by ident and resolve names later
+        record = _ThreadRecord()
+        with self._registry_lock:
+            self._records[_thread.get_ident()] = record
+        self._local.record = record
+        return record
+
+    # Publication
+    def publish(self):
+        """Snapshot every thread record and apply what changed"""
+        with self._registry_lock:
+            records = list(self._records.items())
+        live = {thread.ident: thread for thread in threading.enumerate()}
+
+        snapshot = {}
+        for ident, record in records:
+            state = (tuple(record.held), record.waiting)
+            snapshot[ident] = state
+            if ident not in live and not state[0]:
+                with self._registry_lock:
+                    self._records.pop(ident, None)
+
+        for ident, state in snapshot.items():
+            if self._last_snapshot.get(ident) != state:
+                self._apply(ident, state, live.get(ident))
+                self.stats['threads_updated'] += 1
+        for ident in self._last_snapshot.keys() - snapshot.keys():
+            self._apply(ident, ((), None), None)
+        self._last_snapshot = snapshot
+        self.stats['snapshots'] += 1
+
+        if any(waiting is not None for _, waiting in snapshot.values()):
+            return self._check()
+        self._suspected.clear()
+        self._reported.clear()
+        return []
+
+    def _apply(self, ident, state, thread):
+        monitor = self.monitor
+        held, waiting = state
+        if ident not in monitor.processes:
+            monitor.add_process(ident, thread.name if thread else f'thread-{ident}', 'Medium')
+        process = monitor.processes[ident]
+
+        for lock_id in list(process.resources):
+            if lock_id not in held:
+                monitor.release_resource(ident, lock_id)
+        for lock_id in held:
+            self._ensure_resource(lock_id)
+            if lock_id in process.resources:
+                continue
+            # Snapshots are not atomic across threads; the real lock is exclusive
+            for holder in list(monitor.resources[lock_id].holders):
+                monitor.release_resource(holder, lock_id)
+            monitor._grant(ident, lock_id)
+
+        for lock_id in list(process.waiting_for):
+            if lock_id != waiting:
+                monitor._unwait(ident, lock_id)
+        if waiting is not None and waiting not in process.waiting_for:
+            self._ensure_resource(waiting)
+            monitor._wait(ident, waiting)
+            monitor._log_event('WAIT', ident, waiting, time.time())
+
+    def _ensure_resource(self, lock_id):
+        if lock_id not in self.monitor.resources:
+            self.monitor.add_resource(lock_id, self._lock_names.get(lock_id, f'lock-{lock_id}'), 1)
+
+    def _check(self):
+        found = []
+
+        # A thread waiting on a plain Lock it already holds never wakes up
+        for ident, process in self.monitor.processes.items():
+            if any(lock_id in process.resources for lock_id in process.waiting_for):
+                found.append([ident])
+
+        # Locks are single-instance, so every wait-for cycle is a deadlock
+        graph = WaitForGraph(0)
+        for ident, process in self.monitor.processes.items():
+            for lock_id in process.waiting_for:
+                for holder in self.monitor.resources[lock_id].holders:
+                    if holder != ident:
+                        graph.add_edge(ident, holder)
+        found.extend(graph.deadlocked_components())
+
+        # Only cycles seen in two consecutive snapshots are real deadlocks
+        suspected = set()
+        reports = []
+        for cycle in found:
+            key = frozenset(cycle)
+            suspected.add(key)
+            if key not in self._suspected or key in self._reported:
+                continue
+            report = self._build_report(cycle)
+            reports.append(report)
+            self.reports.append(report)
+            self._reported.add(key)
+            self.stats['deadlocks_reported'] += 1
+            self.monitor.performance_metrics['deadlocks_detected'] += 1
+            for callback in self.callbacks:
+                callback(report)
+        self._suspected = suspected
+        self._reported &= suspected
+        return reports
+
+    def _build_report(self, cycle):
+        frames = sys._current_frames()
+        threads = []
+        for ident in cycle:
+            process = self.monitor.processes[ident]
+            frame = frames.get(ident)
+            threads.append({
+                'thread_id': ident,
+                'thread_name': process.name,
+                'holds': [self._lock_names.get(l, l) for l in process.resources],
+                'waiting_for': [self._lock_names.get(l, l) for l in process.waiting_for],
+                'stack': traceback.format_stack(frame) if frame else []
+            })
+        return {
+            'timestamp': time.time(),
+            'type': 'THREAD_DEADLOCK',
+            'cycle': [self.monitor.processes[i].name for i in cycle],
+            'threads': threads
+        }
+
+    def format_report(self, report):
+        lines = [f"Deadlock between threads: {' -> '.join(report['cycle'])}"]
+        for thread in report['threads']:
+            lines.append(f"  {thread['thread_name']} ({thread['thread_id']})")
+            lines.append(f"    holds:       {', '.join(map(str, thread['holds'])) or '-'}")
+            lines.append(f"    waiting for: {', '.join(map(str, thread['waiting_for'])) or '-'}")
+            for entry in thread['stack']:
+                lines.extend("      " + line for line in entry.rstrip().splitlines())
+        return "\n".join(lines)
+
+    def add_callback(self, callback):
+        self.callbacks.append(callback)
+
+    # Lifecycle
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+
+        def publish_loop():
+            while self._running:
+                self.publish()
+                time.sleep(self.publish_interval)
+
+        self._thread = threading.Thread(target=publish_loop, name='lock-watchdog', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        self.publish()
+
+    def install(self):
+        """Make threading.Lock/RLock/Condition return watched primitives"""
+        if self._originals:
+            return
+        self._originals = {
+            'Lock': threading.Lock,
+            'RLock': threading.RLock,
+            'Condition': threading.Condition
+        }
+        threading.Lock = self.Lock
+        threading.RLock = self.RLock
+        threading.Condition = self.Condition
+
+    def uninstall(self):
+        if not self._originals:
+            return
+        threading.Lock = self._originals['Lock']
+        threading.RLock = self._originals['RLock']
+        threading.Condition = self._originals['Condition']
+        self._originals = None
@@ -0,0 +1,350 @@
+import heapq
+import random
+import time
+import numpy as np
+from models.monte_carlo import deadlocked
+
+ARRIVAL, STEP_DONE, COMPLETE, RESTART, DETECT = range(5)
+
+class _Process:
+    __slots__ = ('pid', 'arrival', 'max_need', 'plan', 'service', 'position', 'allocation',
+                 'epoch', 'waiting_since', 'aborts')
+
+    def __init__(self, pid, arrival, max_need, plan, service):
+        self.pid = pid
+        self.arrival = arrival
+        self.max_need = max_need
+        self.plan = plan
+        self.service = service
+        self.position = 0
+        self.allocation = [0] * len(max_need)
+        # Bumped on abort so events scheduled before it are ignored
+        self.epoch = 0
+        self.waiting_since = None
+        self.aborts = 0
+
+class BankersStrategy:
+    """Avoidance: grant only if the state stays safe for the active claims"""
+    name = 'avoidance'
+
+    def plan(self, plan):
+        return plan
+
+    def can_grant(self, sim, process, r, units):
+        if sim.available[r] < units:
+            return False
+        work = list(sim.available)
+        work[r] -= units
+        need = [c - a for c, a in zip(process.max_need, process.allocation)]
+        need[r] -= units
+
+        # The current state is safe, so the grant is safe iff the requester
+        # can still finish: reduce the others only until it can
+        others = [p for p in sim.active.values() if p is not process]
+        while not all(n <= w for n, w in zip(need, work)):
+            remaining = []
+            for p in others:
+                if all(c - a <= w for c, a, w in zip(p.max_need, p.allocation, work)):
+                    work = [w + a for w, a in zip(work, p.allocation)]
+                else:
+                    remaining.append(p)
+            if len(remaining) == len(others):
+                return False
+            others = remaining
+        return True
+
+class DetectionStrategy:
+    """Detection + recovery: grant whenever free, periodically abort victims"""
+    name = 'detection'
+
+    def __init__(self, interval=5.0, backoff=2.0):
+        self.interval = interval
+        self.backoff = backoff
+
+    def plan(self, plan):
+        return plan
+
+    def can_grant(self, sim, process, r, units):
+        return sim.available[r] >= units
+
+class OrderingStrategy:
+    """Prevention: acquire resource types in a global order, all units of a
+    type in one step"""
+    name = 'prevention'
+
+    def plan(self, plan):
+        merged = {}
+        for r, units, hold in plan:
+            prev_units, prev_hold = merged.get(r, (0, 0.0))
+            merged[r] = (prev_units + units, prev_hold + hold)
+        return [(r, units, hold) for r, (units, hold) in sorted(merged.items())]
+
+    def can_grant(self, sim, process, r, units):
+        return sim.available[r] >= units
+
+STRATEGIES = {
+    'avoidance': BankersStrategy,
+    'detection': DetectionStrategy,
+    'prevention': OrderingStrategy
+}
+
+class EventSimulation:
+    """Discrete-event simulation of an open system under load.
+
+    Processes arrive as a Poisson stream, acquire their claim one unit at a
+    time with exponential holding times between requests, compute, then
+    release everything. A heap-ordered event calendar advances a virtual
+    clock, so simulated hours take seconds of wall time."""
+    def __init__(self, strategy, total=(6, 4, 4), arrival_rate=0.2, mean_hold=2.0, max_claim=None,
+                 max_active=16, horizon=10000.0, warmup=0.0, seed=0, windows=50):
+        self.strategy = STRATEGIES[strategy]() if isinstance(strategy, str) else strategy
+        self.total = list(total)
+        self.arrival_rate = arrival_rate
+        self.mean_hold = mean_hold
+        # Per-type claim cap; half the total keeps several processes runnable
+        self.max_claim = list(max_claim) if max_claim else [max(1, t // 2) for t in self.total]
+        self.max_active = max_active
+        self.horizon = horizon
+        self.warmup = warmup
+        self.windows = windows
+        self.rng = random.Random(seed)
+
+        self.now = 0.0
+        self.available = list(self.total)
+        self.calendar = []
+        self._seq = 0
+        self.active = {}
+        self.admission = []
+        self.blocked = []
+
+        self.events = 0
+        self.arrivals = 0
+        self.latencies = []
+        self.completion_times = []
+        self.wait_times = []
+        self.deadlocks = 0
+        self.aborts = 0
+        self._allocated = 0
+        self._allocated_area = 0.0
+        self._last_change = 0.0
+
+    def schedule(self, at, kind, process=None):
+        self._seq += 1
+        heapq.heappush(self.calendar, (at, self._seq, kind, process, process.epoch if process else 0))
+
+    def run(self):
+        start = time.perf_counter()
+        self.schedule(self.rng.expovariate(self.arrival_rate), ARRIVAL)
+        if isinstance(self.strategy, DetectionStrategy):
+            self.schedule(self.strategy.interval, DETECT)
+
+        calendar = self.calendar
+        pop = heapq.heappop
+        while calendar:
+            at, _, kind, process, epoch = pop(calendar)
+            if at > self.horizon:
+                break
+            self.now = at
+            self.events += 1
+
+            if kind == ARRIVAL:
+                self._arrive()
+            elif kind == DETECT:
+                self._detect()
+                self.schedule(at + self.strategy.interval, DETECT)
+            elif epoch != process.epoch:
+                continue  # stale: the process was aborted after scheduling
+            elif kind == STEP_DONE:
+                process.position += 1
+                self._request(process)
+            elif kind == COMPLETE:
+                self._complete(process)
+            elif kind == RESTART:
+                self._request(process)
+
+        self._account(self.horizon)
+        return self.report(time.perf_counter() - start)
+
+    def _arrive(self):
+        self.arrivals += 1
+        rng = self.rng
+        max_need = [rng.randint(0, cap) for cap in self.max_claim]
+        units = [r for r, need in enumerate(max_need) for _ in range(need)]
+        rng.shuffle(units)
+        plan = self.strategy.plan([(r, 1, rng.expovariate(1 / self.mean_hold)) for r in units])
+        process = _Process(self.arrivals, self.now, max_need, plan, rng.expovariate(1 / self.mean_hold))
+
+        if len(self.active) < self.max_active:
+            self.active[process.pid] = process
+            self._request(process)
+        else:
+            self.admission.append(process)
+        self.schedule(self.now + rng.expovariate(self.arrival_rate), ARRIVAL)
+
+    def _request(self, process):
+        if process.position == len(process.plan):
+            self.schedule(self.now + process.service, COMPLETE, process)
+            return
+        r, units, hold = process.plan[process.position]
+        if self.strategy.can_grant(self, process, r, units):
+            self._grant(process, r, units)
+            self.schedule(self.now + hold, STEP_DONE, process)
+        elif process.waiting_since is None:
+            process.waiting_since = self.now
+            self.blocked.append(process)
+
+    def _grant(self, process, r, units):
+        self._account(self.now)
+        self.available[r] -= units
+        process.allocation[r] += units
+        self._allocated += units
+        if process.waiting_since is not None:
+            self.wait_times.append(self.now - process.waiting_since)
+            process.waiting_since = None
+
+    def _release_all(self, process):
+        self._account(self.now)
+        for r, units in enumerate(process.allocation):
+            self.available[r] += units
+            self._allocated -= units
+            process.allocation[r] = 0
+
+    def _complete(self, process):
+        self._release_all(process)
+        del self.active[process.pid]
+        if process.arrival >= self.warmup:
+            self.latencies.append(self.now - process.arrival)
+            self.completion_times.append(self.now)
+
+        if self.admission:
+            admitted = self.admission.pop(0)
+            self.active[admitted.pid] = admitted
+            self._request(admitted)
+        self._retry_blocked()
+
+    def _retry_blocked(self):
+        # FIFO retry; a grant moves the process off the blocked list
+        still_blocked = []
+        for process in self.blocked:
+            r, units, hold = process.plan[process.position]
+            if self.strategy.can_grant(self, process, r, units):
+                self._grant(process, r, units)
+                self.schedule(self.now + hold, STEP_DONE, process)
+            else:
+                still_blocked.append(process)
+        self.blocked = still_blocked
+
+    def _detect(self):
+        if not self.blocked:
+            return
+        active = list(self.active.values())
+        request = []
+        for p in active:
+            row = [0] * len(self.total)
+            if p.waiting_since is not None:
+                r, units, _ = p.plan[p.position]
+                row[r] = units
+            request.append(row)
+        allocation = [p.allocation for p in active]
+
+        stuck = [active[i] for i in deadlocked(self.available, allocation, request) if any(active[i].allocation)]
+        if not stuck:
+            return
+        self.deadlocks += 1
+        while stuck:
+            # Cheapest victim first; it restarts from scratch after an
+            # exponential backoff so it does not re-form the same cycle
+            victim = min(stuck, key=lambda p: (sum(p.allocation), p.pid))
+            self._release_all(victim)
+            victim.epoch += 1
+            victim.position = 0
+            victim.aborts += 1
+            self.aborts += 1
+            if victim.waiting_since is not None:
+                victim.waiting_since = None
+                self.blocked.remove(victim)
+            self.schedule(self.now + self.strategy.backoff * (1 << min(victim.aborts, 6)), RESTART, victim)
+
+            i = active.index(victim)
+            request[i] = [0] * len(self.total)
+            stuck = [active[j] for j in deadlocked(self.available, allocation, request) if any(active[j].allocation)]
+        self._retry_blocked()
+
+    def _account(self, at):
+        self._allocated_area += self._allocated * (at - self._last_change)
+        self._last_change = at
+
+    def report(self, elapsed):
+        measured = self.horizon - self.warmup
+        latencies = np.asarray(self.latencies)
+        completions = np.asarray(self.completion_times)
+        counts, edges = np.histogram(completions, bins=self.windows, range=(self.warmup, self.horizon))
+        width = edges[1] - edges[0]
+
+        def percentile(q):
+            return float(np.percentile(latencies, q)) if len(latencies) else None
+
+        return {
+            'strategy': self.strategy.name,
+            'arrival_rate': self.arrival_rate,
+            'simulated_time': self.horizon,
+            'arrivals': self.arrivals,
+            'completed': len(latencies),
+            'throughput': len(latencies) / measured if measured > 0 else 0.0,
+            'latency': {
+                'mean': float(latencies.mean()) if len(latencies) else None,
+                'p50': percentile(50),
+                'p95': percentile(95),
+                'p99': percentile(99),
+                'max': float(latencies.max()) if len(latencies) else None
+            },
+            'mean_wait': float(np.mean(self.wait_times)) if self.wait_times else 0.0,
+            'utilization': self._allocated_area / (sum(self.total) * self.horizon) if self.horizon else 0.0,
+            'backlog': len(self.admission) + len(self.active),
+            'deadlocks': self.deadlocks,
+            'aborts': self.aborts,
+            'throughput_curve': [
+                {'time': float(edges[i + 1]), 'throughput': float(counts[i] / width)}
+                for i in range(len(counts))
+            ],
+            'events': self.events,
+            'elapsed': elapsed,
+            'events_per_second': self.events / elapsed if elapsed > 0 else None
+        }
+
+# Server-side bounds for /simulate/load; expected arrivals summed over every
+# run bound the work of one request
+MAX_HORIZON = 100000.0
+MAX_ACTIVE = 64
+MAX_RATES = 20
+MAX_ARRIVALS = 100000
+
+def check_load(rates, strategies, horizon, max_active):
+    """Raise ValueError unless a load request stays within the server bounds"""
+    unknown = [s for s in strategies if s not in STRATEGIES]
+    if unknown:
+        raise ValueError(f"Unknown strategy(s) {', '.join(map(str, unknown))}, expected: {', '.join(STRATEGIES)}")
+    if not strategies or len(set(strategies)) != len(strategies):
+        raise ValueError('strategies must list each strategy at most once')
+    if not 1 <= len(rates) <= MAX_RATES:
+        raise ValueError(f'rates must list between 1 and {MAX_RATES} arrival rates')
+    if any(not rate > 0 for rate in rates):
+        raise ValueError('Arrival rates must be positive')
+    if not 0 < horizon <= MAX_HORIZON:
+        raise ValueError(f'horizon must be between 0 and {MAX_HORIZON:g}')
+    if not 1 <= max_active <= MAX_ACTIVE:
+        raise ValueError(f'max_active must be between 1 and {MAX_ACTIVE}')
+    if sum(rates) * horizon * len(strategies) > MAX_ARRIVALS:
+        raise ValueError(f'Too much load: rates x horizon x strategies must stay within {MAX_ARRIVALS} arrivals')
+
+def load_curves(rates, strategies=tuple(STRATEGIES), **options):
+    """Sweep arrival rates for each strategy: throughput and latency vs load"""
+    curves = {}
+    for strategy in strategies:
+        points = []
+        for rate in rates:
+            result = EventSimulation(strategy, arrival_rate=rate, **options).run()
+            result.pop('throughput_curve')
+            points.append(result)
+        curves[strategy] = points
+    return curves
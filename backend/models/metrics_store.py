@@ -0,0 +1,184 @@
+import threading
+import numpy as np
+
+class _RingSeries:
+    """Fixed-capacity columnar ring of (timestamp, min, avg, max) rows"""
+    def __init__(self, capacity, columns):
+        self.capacity = capacity
+        self.timestamps = np.zeros(capacity, dtype=np.float64)
+        self.mins = np.full((capacity, columns), np.nan, dtype=np.float32)
+        self.avgs = np.full((capacity, columns), np.nan, dtype=np.float32)
+        self.maxs = np.full((capacity, columns), np.nan, dtype=np.float32)
+        self.head = 0
+        self.size = 0
+
+    def append(self, timestamp, mins, avgs, maxs):
+        i = self.head
+        self.timestamps[i] = timestamp
+        self.mins[i] = mins
+        self.avgs[i] = avgs
+        self.maxs[i] = maxs
+        self.head = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def oldest(self):
+        if not self.size:
+            return None
+        return self.timestamps[self.head if self.size == self.capacity else 0]
+
+    def query(self, since=None, until=None):
+        if self.size < self.capacity:
+            order = np.arange(self.size)
+        else:
+            order = np.concatenate((np.arange(self.head, self.capacity), np.arange(self.head)))
+        timestamps = self.timestamps[order]
+        lo = np.searchsorted(timestamps, since, side='left') if since is not None else 0
+        hi = np.searchsorted(timestamps, until, side='right') if until is not None else len(order)
+        rows = order[lo:hi]
+        return self.timestamps[rows], self.mins[rows], self.avgs[rows], self.maxs[rows]
+
+    def nbytes(self):
+        return self.timestamps.nbytes + self.mins.nbytes + self.avgs.nbytes + self.maxs.nbytes
+
+class _Bucket:
+    """Running min/sum/max/count for the rollup currently being filled"""
+    def __init__(self, columns):
+        self.start = None
+        self.mins = np.full(columns, np.inf)
+        self.sums = np.zeros(columns)
+        self.maxs = np.full(columns, -np.inf)
+        self.counts = np.zeros(columns)
+
+    def add(self, mins, avgs, maxs, weights):
+        valid = ~np.isnan(avgs) & (weights > 0)
+        self.mins = np.where(valid, np.fmin(self.mins, mins), self.mins)
+        self.maxs = np.where(valid, np.fmax(self.maxs, maxs), self.maxs)
+        self.sums[valid] += (avgs * weights)[valid]
+        self.counts[valid] += weights[valid]
+
+    def flush(self):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            avgs = np.where(self.counts > 0, self.sums / self.counts, np.nan)
+        empty = self.counts == 0
+        mins = np.where(empty, np.nan, self.mins)
+        maxs = np.where(empty, np.nan, self.maxs)
+        start, counts = self.start, self.counts
+        self.__init__(len(counts))
+        return start, mins, avgs, maxs, counts
+
+class MetricsStore:
+    """Embedded time-series store for system metrics.
+
+    Raw samples land in the 1s ring and are rolled up into 1m and 1h rings
+    with min/avg/max as each bucket closes, so days of history stay within a
+    few MB and range queries never touch psutil."""
+    RESOLUTIONS = (
+        ('1s', 1, 3600),        # last hour
+        ('1m', 60, 7 * 1440),   # last week
+        ('1h', 3600, 365 * 24)  # last year
+    )
+
+    def __init__(self, series, resolutions=None):
+        self.series = list(series)
+        self._index = {name: i for i, name in enumerate(self.series)}
+        self.resolutions = resolutions or self.RESOLUTIONS
+        columns = len(self.series)
+        self.rings = {name: _RingSeries(capacity, columns) for name, _, capacity in self.resolutions}
+        self._buckets = {name: _Bucket(columns) for name, _, _ in self.resolutions[1:]}
+        self._lock = threading.Lock()
+
+    def append(self, timestamp, values):
+        """Record one raw sample; values maps series name to a number"""
+        row = np.full(len(self.series), np.nan)
+        for name, value in values.items():
+            i = self._index.get(name)
+            if i is not None and value is not None:
+                row[i] = value
+
+        with self._lock:
+            first, step, _ = self.resolutions[0]
+            self.rings[first].append(timestamp - timestamp % step, row, row, row)
+            self._roll_up(1, timestamp, row, row, row, np.ones(len(row)))
+
+    def _roll_up(self, level, timestamp, mins, avgs, maxs, weights):
+        if level >= len(self.resolutions):
+            return
+        name, step, _ = self.resolutions[level]
+        bucket = self._buckets[name]
+        start = timestamp - timestamp % step
+
+        if bucket.start is not None and start != bucket.start:
+            closed_start, b_mins, b_avgs, b_maxs, counts = bucket.flush()
+            self.rings[name].append(closed_start, b_mins, b_avgs, b_maxs)
+            # Coarser levels weight each closed bucket by the samples it holds
+            self._roll_up(level + 1, closed_start, b_mins, b_avgs, b_maxs, counts)
+
+        bucket.start = start
+        bucket.add(mins, avgs, maxs, weights)
+
+    def pick_resolution(self, since, now):
+        """Finest resolution whose retained history reaches back to since"""
+        if since is None:
+            return self.resolutions[0][0]
+        for name, step, capacity in self.resolutions:
+            if now - since <= step * capacity:
+                return name
+        return self.resolutions[-1][0]
+
+    def query(self, since=None, until=None, resolution='auto', series=None, max_points=None, now=None):
+        if resolution == 'auto':
+            with self._lock:
+                latest = max((r.timestamps[(r.head - 1) % r.capacity] for r in self.rings.values() if r.size), default=0)
+            resolution = self.pick_resolution(since, now or latest)
+        if resolution not in self.rings:
+            raise ValueError(f"Unknown resolution {resolution!r}")
+
+        names = list(series) if series else self.series
+        missing = [n for n in names if n not in self._index]
+        if missing:
+            raise ValueError(f"Unknown series: {', '.join(missing)}")
+        columns = [self._index[n] for n in names]
+
+        with self._lock:
+            timestamps, mins, avgs, maxs = self.rings[resolution].query(since, until)
+            mins, avgs, maxs = mins[:, columns], avgs[:, columns], maxs[:, columns]
+
+        if max_points and len(timestamps) > max_points:
+            timestamps, mins, avgs, maxs = self._downsample(timestamps, mins, avgs, maxs, max_points)
+
+        def column(values, j):
+            return [None if np.isnan(v) else round(float(v), 3) for v in values[:, j]]
+
+        return {
+            'resolution': resolution,
+            'timestamps': timestamps.tolist(),
+            'series': {
+                name: {'min': column(mins, j), 'avg': column(avgs, j), 'max': column(maxs, j)}
+                for j, name in enumerate(names)
+            }
+        }
+
+    def _downsample(self, timestamps, mins, avgs, maxs, max_points):
+        edges = np.linspace(0, len(timestamps), max_points + 1).astype(int)[:-1]
+        edges = np.unique(edges)
+        with np.errstate(invalid='ignore'):
+            filled = np.nan_to_num(avgs, nan=0.0)
+            present = (~np.isnan(avgs)).astype(np.float64)
+            avg = np.add.reduceat(filled, edges) / np.add.reduceat(present, edges)
+        mins = np.fmin.reduceat(mins, edges)
+        maxs = np.fmax.reduceat(maxs, edges)
+        return timestamps[edges], mins, avg, maxs
+
+    def stats(self):
+        return {
+            'series': self.series,
+            'resolutions': {
+                name: {
+                    'step_seconds': step,
+                    'capacity': capacity,
+                    'points': self.rings[name].size,
+                    'oldest': self.rings[name].oldest()
+                } for name, step, capacity in self.resolutions
+            },
+            'memory_bytes': sum(r.nbytes() for r in self.rings.values())
+        }
@@ -0,0 +1,281 @@
+import math
+import os
+import random
+import time
+import numpy as np
+
+STRATEGIES = ('avoidance', 'detection', 'prevention')
+METRICS = ('throughput', 'makespan', 'utilization', 'mean_wait', 'deadlocks', 'restarts', 'completed')
+
+def is_safe(available, allocation, need):
+    """Banker's safety check on plain lists; the workloads here are a handful
+    of processes, where list loops beat numpy's per-call overhead"""
+    work = list(available)
+    pending = [p for p in range(len(allocation))]
+    while pending:
+        progressed = False
+        for p in list(pending):
+            if all(n <= w for n, w in zip(need[p], work)):
+                work = [w + a for w, a in zip(work, allocation[p])]
+                pending.remove(p)
+                progressed = True
+        if not progressed:
+            return False
+    return True
+
+def deadlocked(available, allocation, request):
+    """Processes left unfinished by the detection reduction"""
+    work = list(available)
+    pending = [p for p in range(len(allocation))]
+    progressed = True
+    while progressed and pending:
+        progressed = False
+        for p in list(pending):
+            if all(r <= w for r, w in zip(request[p], work)):
+                work = [w + a for w, a in zip(work, allocation[p])]
+                pending.remove(p)
+                progressed = True
+    return pending
+
+def generate_workload(rng, processes=(3, 8), resources=(2, 4), total=None, max_need=None,
+                      hold=(1, 4), arrival_spread=10):
+    """Random workload: each process acquires its max need one unit at a
+    time in random order, computing between acquisitions, then releases
+    everything. A fixed total/max_need keeps the shape and randomizes only
+    request order and timing."""
+    if max_need is None:
+        n = rng.randint(*processes)
+        m = rng.randint(*resources)
+        total = [rng.randint(n // 2 + 1, n + 2) for _ in range(m)]
+        max_need = [[rng.randint(0, max(1, t // 2)) for t in total] for _ in range(n)]
+    n, m = len(max_need), len(total)
+
+    plans = []
+    for p in range(n):
+        units = [r for r in range(m) for _ in range(max_need[p][r])]
+        rng.shuffle(units)
+        plans.append([(r, rng.randint(*hold)) for r in units])
+
+    return {
+        'total': list(total),
+        'max_need': [list(row) for row in max_need],
+        'plans': plans,
+        'arrivals': [rng.randint(0, arrival_spread) for _ in range(n)],
+        'service': [rng.randint(*hold) for _ in range(n)]
+    }
+
+def simulate(workload, strategy, max_ticks=5000, detect_interval=5):
+    """Tick-based execution of one workload under one strategy.
+
+    avoidance grants a unit only if the Banker's check stays safe, detection
+    grants whenever free and periodically aborts a victim out of any
+    deadlock, prevention acquires units in global resource order."""
+    total, max_need = workload['total'], workload['max_need']
+    n, m = len(max_need), len(total)
+    plans = [[(r, 1, hold) for r, hold in plan] for plan in workload['plans']]
+    if strategy == 'prevention':
+        # Ordering only rules out cycles across types, so all units of one
+        # type are taken in a single step
+        plans = [_ordered(plan, m) for plan in plans]
+
+    available = list(total)
+    allocation = [[0] * m for _ in range(n)]
+    position = [0] * n
+    busy = list(workload['arrivals'])
+    waiting_since = [None] * n
+    done = [False] * n
+    aborted = [0] * n
+    capacity = sum(total) or 1
+
+    completed = deadlocks = restarts = 0
+    wait_ticks = grants = 0
+    allocated_ticks = 0
+    tick = 0
+    for tick in range(1, max_ticks + 1):
+        allocated_ticks += capacity - sum(available)
+        # Rotate the scan start so no process is always served first
+        for k in range(n):
+            p = (tick + k) % n
+            if done[p]:
+                continue
+            if busy[p] > 0:
+                busy[p] -= 1
+                continue
+
+            plan = plans[p]
+            if position[p] == len(plan):
+                for r in range(m):
+                    available[r] += allocation[p][r]
+                    allocation[p][r] = 0
+                done[p] = True
+                completed += 1
+                continue
+
+            r, units, hold = plan[position[p]]
+            granted = available[r] >= units
+            if granted and strategy == 'avoidance':
+                available[r] -= units
+                allocation[p][r] += units
+                need = [[max_need[q][j] - allocation[q][j] for j in range(m)] for q in range(n)]
+                granted = is_safe(available, allocation, need)
+                available[r] += units
+                allocation[p][r] -= units
+
+            if not granted:
+                if waiting_since[p] is None:
+                    waiting_since[p] = tick
+                continue
+
+            available[r] -= units
+            allocation[p][r] += units
+            position[p] += 1
+            busy[p] = hold if position[p] < len(plan) else workload['service'][p]
+            grants += 1
+            if waiting_since[p] is not None:
+                wait_ticks += tick - waiting_since[p]
+                waiting_since[p] = None
+
+        if completed == n:
+            break
+
+        if strategy == 'detection' and tick % detect_interval == 0:
+            request = [[0] * m for _ in range(n)]
+            for p in range(n):
+                if waiting_since[p] is not None:
+                    r, units, _ = plans[p][position[p]]
+                    request[p][r] = units
+            # Processes holding nothing cannot be part of the cycle itself
+            stuck = [q for q in deadlocked(available, allocation, request) if any(allocation[q])]
+            if stuck:
+                deadlocks += 1
+            while stuck:
+                # Abort the cheapest victim (fewest units held) until the
+                # reduction completes; victims restart from scratch after an
+                # exponential backoff so they do not re-form the same cycle
+                victim = min(stuck, key=lambda q: (sum(allocation[q]), q))
+                for r in range(m):
+                    available[r] += allocation[victim][r]
+                    allocation[victim][r] = 0
+                position[victim] = 0
+                aborted[victim] += 1
+                busy[victim] = detect_interval << min(aborted[victim], 6)
+                waiting_since[victim] = None
+                request[victim] = [0] * m
+                restarts += 1
+                stuck = [q for q in deadlocked(available, allocation, request) if any(allocation[q])]
+
+    return {
+        'throughput': completed / tick,
+        'makespan': tick,
+        'utilization': allocated_ticks / (capacity * tick),
+        'mean_wait': wait_ticks / grants if grants else 0.0,
+        'deadlocks': deadlocks,
+        'restarts': restarts,
+        'completed': completed / n if n else 1.0
+    }
+
+def _ordered(plan, resources):
+    steps = []
+    for r in range(resources):
+        holds = [hold for res, _, hold in plan if res == r]
+        if holds:
+            steps.append((r, len(holds), sum(holds)))
+    return steps
+
+def _run_chunk(args):
+    seed, start, stop, options = args
+    workload_options, sim_options = options
+    results = {s: {metric: [] for metric in METRICS} for s in STRATEGIES}
+    for trial in range(start, stop):
+        # Per-trial seeding keeps results identical for any worker count;
+        # every strategy runs the same workload (common random numbers)
+        rng = random.Random(f'{seed}:{trial}')
+        workload = generate_workload(rng, **workload_options)
+        for strategy in STRATEGIES:
+            outcome = simulate(workload, strategy, **sim_options)
+            for metric in METRICS:
+                results[strategy][metric].append(outcome[metric])
+    return results
+
+def confidence_interval(values, confidence=0.95):
+    values = np.asarray(values, dtype=np.float64)
+    mean = float(values.mean()) if len(values) else 0.0
+    if len(values) < 2:
+        return {'mean': mean, 'std': 0.0, 'ci_low': mean, 'ci_high': mean}
+    std = float(values.std(ddof=1))
+    z = _z_score(confidence)
+    half = z * std / math.sqrt(len(values))
+    return {'mean': mean, 'std': std, 'ci_low': mean - half, 'ci_high': mean + half}
+
+def rate_interval(successes, trials, confidence=0.95):
+    """Wilson score interval, which stays inside [0, 1] for rare events"""
+    if not trials:
+        return {'rate': 0.0, 'ci_low': 0.0, 'ci_high': 0.0}
+    z = _z_score(confidence)
+    p = successes / trials
+    denom = 1 + z * z / trials
+    centre = (p + z * z / (2 * trials)) / denom
+    half = z * math.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denom
+    low = 0.0 if successes == 0 else max(0.0, centre - half)
+    high = 1.0 if successes == trials else min(1.0, centre + half)
+    return {'rate': p, 'ci_low': low, 'ci_high': high}
+
+def _z_score(confidence):
+    # Inverse normal CDF by bisection on erf; avoids a scipy dependency
+    target = (1 + confidence) / 2
+    lo, hi = 0.0, 10.0
+    for _ in range(60):
+        mid = (lo + hi) / 2
+        if 0.5 * (1 + math.erf(mid / math.sqrt(2))) < target:
+            lo = mid
+        else:
+            hi = mid
+    return (lo + hi) / 2
+
+class MonteCarloEngine:
+    """Runs thousands of seeded random workloads per strategy across a
+    process pool and reports measured metrics with confidence intervals"""
+    def __init__(self, trials=1000, seed=None, workers=None, chunk_size=200, confidence=0.95,
+                 processes=(3, 8), resources=(2, 4), total=None, max_need=None,
+                 max_ticks=5000, detect_interval=5):
+        self.trials = trials
+        self.seed = seed if seed is not None else random.SystemRandom().randrange(2**32)
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.confidence = confidence
+        self.workload_options = {'processes': tuple(processes), 'resources': tuple(resources),
+                                 'total': total, 'max_need': max_need}
+        self.sim_options = {'max_ticks': max_ticks, 'detect_interval': detect_interval}
+
+    def run(self):
+        start_time = time.perf_counter()
+        options = (self.workload_options, self.sim_options)
+        chunks = [
+            (self.seed, start, min(start + self.chunk_size, self.trials), options)
+            for start in range(0, self.trials, self.chunk_size)
+        ]
+
+        workers = self.workers or os.cpu_count() or 1
+        if workers == 1 or len(chunks) == 1:
+            parts = [_run_chunk(chunk) for chunk in chunks]
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+                parts = list(pool.map(_run_chunk, chunks))
+
+        strategies = {}
+        for strategy in STRATEGIES:
+            merged = {metric: [v for part in parts for v in part[strategy][metric]] for metric in METRICS}
+            summary = {metric: confidence_interval(merged[metric], self.confidence) for metric in METRICS}
+            deadlocked_trials = sum(1 for d in merged['deadlocks'] if d > 0)
+            summary['deadlock_rate'] = rate_interval(deadlocked_trials, len(merged['deadlocks']), self.confidence)
+            strategies[strategy] = summary
+
+        return {
+            'trials': self.trials,
+            'seed': self.seed,
+            'confidence': self.confidence,
+            'workers': 1 if len(chunks) == 1 else min(workers, len(chunks)),
+            'elapsed': time.perf_counter() - start_time,
+            'strategies': strategies
+        }
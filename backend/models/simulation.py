@@ -3,6 +3,11 @@ import random
 from algorithms.bankers_algorithm import BankersAlgorithm
 from algorithms.wait_for_graph import WaitForGraph
 from algorithms.deadlock_recovery import DeadlockRecovery
+from models.monte_carlo import MonteCarloEngine
+
+# Server-side bounds for the optional Monte Carlo comparison
+MAX_TRIALS = 2000
+MAX_WORKERS = 4
 
 class Simulation:
     def __init__(self, config):
@@ -14,6 +19,16 @@ class Simulation:
         self.max_need = config.get('max_need') or config.get('maxNeed')
         self.available = config['available']
         self.steps = []
+        self.seed = config.get('seed')
+        self.rng = random.Random(self.seed)
+        # Monte Carlo takes seconds per call, so it only runs when asked for
+        self.monte_carlo = bool(config.get('monte_carlo'))
+        self.trials = int(config.get('trials', 500))
+        if not 1 <= self.trials <= MAX_TRIALS:
+            raise ValueError(f"trials must be between 1 and {MAX_TRIALS}")
+        self.workers = int(config.get('workers') or MAX_WORKERS)
+        if not 1 <= self.workers <= MAX_WORKERS:
+            raise ValueError(f"workers must be between 1 and {MAX_WORKERS}")
         
     def run(self):
         results = {
@@ -27,8 +42,38 @@ class Simulation:
         results["comparison"]["avoidance"] = self._run_avoidance()
         results["comparison"]["detection"] = self._run_detection()
         results["comparison"]["prevention"] = self._run_prevention()
+
+        if not self.monte_carlo:
+            return results
+        
+        # Measured efficiency: resource utilization across randomized runs of
+        # this configuration, with confidence intervals
+        monte_carlo = self._run_monte_carlo()
+        for strategy, metrics in monte_carlo["strategies"].items():
+            entry = results["comparison"][strategy]
+            entry["efficiency"] = round(metrics["utilization"]["mean"] * 100, 1)
+            entry["metrics"] = metrics
+        results["statistics"]["monte_carlo"] = {
+            key: monte_carlo[key] for key in ("trials", "seed", "confidence", "workers", "elapsed")
+        }
         
         return results
+
+    def _run_monte_carlo(self):
+        total = [
+            sum(row[r] for row in self.allocation) + self.available[r]
+            for r in range(self.resources)
+        ]
+        # A claim above the total could never be granted under any strategy
+        max_need = [[min(need, t) for need, t in zip(row, total)] for row in self.max_need]
+        engine = MonteCarloEngine(
+            trials=self.trials,
+            seed=self.seed if self.seed is not None else self.rng.randrange(2**32),
+            workers=self.workers,
+            total=total,
+            max_need=max_need
+        )
+        return engine.run()
     
     def _run_avoidance(self):
         banker = BankersAlgorithm(
@@ -46,8 +91,7 @@ class Simulation:
             "result": "Safe" if is_safe else "Unsafe",
             "safe_sequence": sequence,
             "pros": ["Prevents deadlock", "Optimal resource utilization"],
-            "cons": ["Requires advance knowledge", "Conservative approach"],
-            "efficiency": 85 if is_safe else 40
+            "cons": ["Requires advance knowledge", "Conservative approach"]
         }
     
     def _run_detection(self):
@@ -66,8 +110,7 @@ class Simulation:
             "result": "Deadlock Detected" if has_deadlock else "No Deadlock",
             "deadlock_cycle": cycle,
             "pros": ["Detects actual deadlocks", "No false positives"],
-            "cons": ["Reactive approach", "Recovery overhead"],
-            "efficiency": 60 if not has_deadlock else 30
+            "cons": ["Reactive approach", "Recovery overhead"]
         }
     
     def _run_prevention(self):
@@ -77,16 +120,15 @@ class Simulation:
             "result": "Deadlock Prevented",
             "method": "Ordered resource allocation",
             "pros": ["Guarantees no deadlock", "Simple implementation"],
-            "cons": ["Reduced concurrency", "May cause starvation"],
-            "efficiency": 70
+            "cons": ["Reduced concurrency", "May cause starvation"]
         }
     
     def _generate_wait_for_edges(self):
         edges = []
         # Generate some random wait-for relationships
         for i in range(self.processes):
-            if random.random() < 0.3:  # 30% chance of waiting
-                target = random.randint(0, self.processes - 1)
+            if self.rng.random() < 0.3:  # 30% chance of waiting
+                target = self.rng.randint(0, self.processes - 1)
                 if target != i:
                     edges.append({"from": i, "to": target})
         return edges
@@ -0,0 +1,156 @@
+import logging
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import deque
+import psutil
+from models.metrics_store import MetricsStore
+
+logger = logging.getLogger(__name__)
+
+class SystemSampler:
+    """Collects CPU, memory, disk and top-process stats on a fixed cadence
+    into a fixed-size ring buffer so API requests never call psutil"""
+    def __init__(self, interval=1.0, capacity=600, top_processes=15, store=None):
+        self.interval = interval
+        self.top_processes = top_processes
+        self.snapshots = deque(maxlen=capacity)
+        # Long-term history, created on the first sample once the series are known
+        self.store = store
+        self._process_count = 0
+        self._lock = threading.Lock()
+        self._thread = None
+        self._running = False
+
+    def start(self):
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+
+        self._thread = threading.Thread(target=self._run, name='system-sampler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+
+    def _run(self):
+        # Prime the counters: the first cpu_percent() call always reads 0
+        psutil.cpu_percent(percpu=True)
+        for proc in psutil.process_iter():
+            try:
+                proc.cpu_percent(None)
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                continue
+
+        next_tick = time.monotonic()
+        while self._running:
+            # A short first wait gives the primed counters a measurable interval
+            next_tick += self.interval if self.snapshots else min(self.interval, 0.1)
+            time.sleep(max(next_tick - time.monotonic(), 0))
+            # One bad tick must not stop the sampler and freeze every endpoint
+            try:
+                self.sample_once()
+            except Exception:
+                logger.exception('System sample failed')
+
+    def sample_once(self):
+        snapshot = {
+            'timestamp': time.time(),
+            'resources': self._collect_resources(),
+            'processes': self._collect_processes()
+        }
+        values = self._series_values(snapshot)
+        with self._lock:
+            self.snapshots.append(snapshot)
+            if self.store is None:
+                self.store = MetricsStore(values.keys())
+        self.store.append(snapshot['timestamp'], values)
+        return snapshot
+
+    def _series_values(self, snapshot):
+        values = {}
+        cores = []
+        for resource in snapshot['resources']:
+            key = resource['name'].lower().rstrip(':').replace(' ', '_')
+            if key.startswith('cpu_core'):
+                cores.append(resource['usage'])
+            values[key] = resource['usage']
+        values['cpu'] = sum(cores) / len(cores) if cores else None
+        values['process_count'] = self._process_count
+        return values
+
+    def _collect_resources(self):
+        # Non-blocking: usage since the previous sample
+        cpu_percent = psutil.cpu_percent(percpu=True)
+        memory = psutil.virtual_memory()
+
+        # Use C: drive for Windows
+        try:
+            disk = psutil.disk_usage('C:\\')
+        except Exception:
+            disk = psutil.disk_usage('/')
+
+        resources = [
+            {'name': f'CPU Core {i+1}', 'usage': round(cpu, 1), 'total': 100, 'unit': '%'}
+            for i, cpu in enumerate(cpu_percent)
+        ]
+
+        resources.extend([
+            {
+                'name': 'Memory',
+                'usage': round(memory.used / 1024**3, 1),
+                'total': round(memory.total / 1024**3, 1),
+                'unit': 'GB'
+            },
+            {
+                'name': 'Disk C:',
+                'usage': round(disk.used / 1024**3, 1),
+                'total': round(disk.total / 1024**3, 1),
+                'unit': 'GB'
+            }
+        ])
+        return resources
+
+    def _collect_processes(self):
+        processes = []
+        # process_iter reuses cached Process objects, so cpu_percent is a real
+        # delta since the previous sample
+        for proc in psutil.process_iter():
+            try:
+                pinfo = proc.as_dict(attrs=['pid', 'name', 'cpu_percent', 'memory_info', 'status'])
+                processes.append({
+                    'pid': pinfo['pid'],
+                    'name': pinfo['name'] or 'Unknown',
+                    'cpu': round(pinfo['cpu_percent'] or 0, 1),
+                    'memory': round((pinfo['memory_info'].rss if pinfo['memory_info'] else 0) / 1024 / 1024, 1),
+                    'status': pinfo['status'] or 'unknown'
+                })
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                continue
+
+        self._process_count = len(processes)
+
+        # Sort by memory usage and keep the top entries
+        processes.sort(key=lambda x: x['memory'], reverse=True)
+        return processes[:self.top_processes]
+
+    def latest(self):
+        # Never sample or wait in the request thread: until the sampler
+        # thread has a first sample, answer with an empty placeholder
+        with self._lock:
+            if self.snapshots:
+                return self.snapshots[-1]
+        return {'timestamp': time.time(), 'resources': [], 'processes': [], 'warming_up': True}
+
+    def history(self, since=None, until=None, limit=None):
+        with self._lock:
+            snapshots = list(self.snapshots)
+
+        timestamps = [s['timestamp'] for s in snapshots]
+        lo = bisect_left(timestamps, since) if since is not None else 0
+        hi = bisect_right(timestamps, until) if until is not None else len(snapshots)
+        selected = snapshots[lo:hi]
+        if limit:
+            selected = selected[-limit:]
+        return selected
@@ -0,0 +1,233 @@
+"""Streaming exporters for simulation traces.
+
+Every exporter is a generator of bytes chunks, so the same code writes a
+file incrementally or feeds a chunked HTTP response, and steps may come
+from any iterable (a generator over a million-step trace included).
+"""
+import csv
+import io
+import json
+import struct
+import numpy as np
+
+FORMATS = {
+    'json': 'application/json',
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+    'columnar': 'application/octet-stream'
+}
+EXTENSIONS = {'json': 'json', 'ndjson': 'ndjson', 'csv': 'csv', 'columnar': 'dlkc'}
+
+COLUMNAR_MAGIC = b'DLKCOL1\n'
+ROW_GROUP_SIZE = 65536
+CSV_LOOKAHEAD = 1000
+CHUNK_SIZE = 64 * 1024
+
+def _split(simulation_data):
+    meta = {k: v for k, v in simulation_data.items() if k != 'steps'}
+    return meta, simulation_data.get('steps') or ()
+
+def _batched(chunks, size=CHUNK_SIZE):
+    # Coalesce small pieces so the transport sees reasonably sized writes
+    buffer = []
+    length = 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        length += len(chunk)
+        if length >= size:
+            yield b''.join(buffer)
+            buffer, length = [], 0
+    if buffer:
+        yield b''.join(buffer)
+
+def export_json(simulation_data):
+    meta, steps = _split(simulation_data)
+    def pieces():
+        head = json.dumps(meta, separators=(',', ':'))
+        yield (head[:-1] + (',' if meta else '') + '"steps":[').encode()
+        for i, step in enumerate(steps):
+            yield ((',' if i else '') + json.dumps(step, separators=(',', ':'))).encode()
+        yield b']}'
+    return _batched(pieces())
+
+def export_ndjson(simulation_data):
+    """First line is the trace metadata, then one line per step"""
+    meta, steps = _split(simulation_data)
+    def pieces():
+        yield json.dumps({'meta': meta}, separators=(',', ':')).encode() + b'\n'
+        for step in steps:
+            yield json.dumps(step, separators=(',', ':')).encode() + b'\n'
+    return _batched(pieces())
+
+def _csv_value(value):
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, separators=(',', ':'))
+    return value
+
+def export_csv(simulation_data):
+    """Columns come from the first CSV_LOOKAHEAD steps; keys that only show
+    up later are kept as JSON in a trailing 'extra' column"""
+    _, steps = _split(simulation_data)
+    steps = iter(steps)
+    window = []
+    for step in steps:
+        window.append(step)
+        if len(window) >= CSV_LOOKAHEAD:
+            break
+    columns = list(dict.fromkeys(key for step in window for key in step))
+    known = set(columns)
+
+    def pieces():
+        out = io.StringIO()
+        writer = csv.writer(out)
+        writer.writerow(columns + ['extra'])
+        for source in (window, steps):
+            for step in source:
+                extra = {k: v for k, v in step.items() if k not in known}
+                writer.writerow([_csv_value(step.get(c, '')) for c in columns] +
+                                [json.dumps(extra, separators=(',', ':')) if extra else ''])
+                if out.tell() >= CHUNK_SIZE:
+                    yield out.getvalue().encode()
+                    out.seek(0)
+                    out.truncate()
+        yield out.getvalue().encode()
+    return pieces()
+
+def _encode_column(values):
+    """(descriptor, buffers) for one column of a row group"""
+    present = [v for v in values if v is not None]
+    nulls = len(present) != len(values)
+    if present and all(isinstance(v, int) and not isinstance(v, bool) for v in present) and not nulls:
+        return {'type': 'int64'}, [np.asarray(values, dtype='<i8').tobytes()]
+    if present and all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in present):
+        array = np.array([np.nan if v is None else v for v in values], dtype='<f8')
+        return {'type': 'float64'}, [array.tobytes()]
+    if present and all(isinstance(v, bool) for v in present) and not nulls:
+        return {'type': 'bool'}, [np.asarray(values, dtype=np.uint8).tobytes()]
+    if present and not nulls and all(isinstance(v, list) for v in present):
+        # Equal-length numeric vectors (work, finish, need rows) as one 2-D buffer
+        try:
+            array = np.asarray(values)
+        except ValueError:
+            array = np.empty(0)  # ragged
+        if array.ndim == 2 and array.dtype.kind in 'biu':
+            kind = 'bool' if array.dtype.kind == 'b' else 'int64'
+            array = array.astype(np.uint8 if kind == 'bool' else '<i8')
+            return {'type': kind, 'shape': list(array.shape)}, [array.tobytes()]
+
+    # Strings as Arrow-style offsets + UTF-8 data; nested values as JSON
+    encoded = [
+        b'' if v is None else (v if isinstance(v, str) else json.dumps(v, separators=(',', ':'))).encode()
+        for v in values
+    ]
+    offsets = np.zeros(len(encoded) + 1, dtype='<i4')
+    np.cumsum([len(e) for e in encoded], out=offsets[1:])
+    descriptor = {'type': 'utf8' if all(isinstance(v, str) for v in present) else 'json'}
+    buffers = [offsets.tobytes(), b''.join(encoded)]
+    if nulls:
+        descriptor['nulls'] = True
+        buffers.append(np.array([v is None for v in values], dtype=np.uint8).tobytes())
+    return descriptor, buffers
+
+def _row_group(rows):
+    columns = list(dict.fromkeys(key for row in rows for key in row))
+    header = {'rows': len(rows), 'columns': []}
+    body = []
+    for name in columns:
+        descriptor, buffers = _encode_column([row.get(name) for row in rows])
+        descriptor['name'] = name
+        descriptor['lengths'] = [len(b) for b in buffers]
+        header['columns'].append(descriptor)
+        body.extend(buffers)
+    encoded = json.dumps(header, separators=(',', ':')).encode()
+    return [struct.pack('<I', len(encoded)), encoded] + body
+
+def export_columnar(simulation_data, row_group_size=ROW_GROUP_SIZE):
+    """Parquet-style layout: magic, metadata block, then row groups of typed
+    little-endian column buffers, terminated by a zero-length header.
+    Only one row group of steps is held at a time."""
+    meta, steps = _split(simulation_data)
+    def pieces():
+        yield COLUMNAR_MAGIC
+        encoded = json.dumps(meta, separators=(',', ':')).encode()
+        yield struct.pack('<I', len(encoded))
+        yield encoded
+        rows = []
+        for step in steps:
+            rows.append(step)
+            if len(rows) >= row_group_size:
+                yield from _row_group(rows)
+                rows = []
+        if rows:
+            yield from _row_group(rows)
+        yield struct.pack('<I', 0)
+    return _batched(pieces())
+
+def read_columnar(stream):
+    """Returns (meta, row groups); each row group maps column name to a
+    NumPy array (object arrays for string/JSON columns)"""
+    if stream.read(len(COLUMNAR_MAGIC)) != COLUMNAR_MAGIC:
+        raise ValueError('Not a columnar simulation export')
+    (length,) = struct.unpack('<I', stream.read(4))
+    meta = json.loads(stream.read(length))
+
+    def groups():
+        while True:
+            (length,) = struct.unpack('<I', stream.read(4))
+            if length == 0:
+                return
+            header = json.loads(stream.read(length))
+            group = {}
+            for column in header['columns']:
+                buffers = [stream.read(n) for n in column['lengths']]
+                kind = column['type']
+                shape = column.get('shape', [header['rows']])
+                if kind in ('int64', 'float64'):
+                    dtype = '<i8' if kind == 'int64' else '<f8'
+                    group[column['name']] = np.frombuffer(buffers[0], dtype=dtype).reshape(shape)
+                elif kind == 'bool':
+                    group[column['name']] = np.frombuffer(buffers[0], dtype=np.uint8).astype(bool).reshape(shape)
+                else:
+                    offsets = np.frombuffer(buffers[0], dtype='<i4')
+                    data = buffers[1]
+                    nulls = np.frombuffer(buffers[2], dtype=np.uint8) if column.get('nulls') else None
+                    values = np.empty(header['rows'], dtype=object)
+                    for i in range(header['rows']):
+                        if nulls is not None and nulls[i]:
+                            continue
+                        text = data[offsets[i]:offsets[i + 1]].decode()
+                        values[i] = text if kind == 'utf8' else json.loads(text)
+                    group[column['name']] = values
+            yield group
+    return meta, groups()
+
+def iter_ndjson_steps(stream):
+    """Streaming input: metadata line then step lines, as written by
+    export_ndjson. Returns (meta, step iterator)"""
+    lines = (line for line in stream if line.strip())
+    first = json.loads(next(lines, '{}'))
+    meta = first.get('meta', {}) if 'meta' in first else {}
+    def steps():
+        if 'meta' not in first and first:
+            yield first
+        for line in lines:
+            yield json.loads(line)
+    return meta, steps()
+
+EXPORTERS = {
+    'json': export_json,
+    'ndjson': export_ndjson,
+    'csv': export_csv,
+    'columnar': export_columnar
+}
+
+def export(simulation_data, format='json'):
+    if format not in EXPORTERS:
+        raise ValueError(f"Unknown export format {format!r}, expected one of: {', '.join(EXPORTERS)}")
+    return EXPORTERS[format](simulation_data)
+
+def export_to_file(simulation_data, format, filename):
+    with open(filename, 'wb') as f:
+        for chunk in export(simulation_data, format):
+            f.write(chunk)
+    return filename
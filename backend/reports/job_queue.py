@@ -0,0 +1,162 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from reports.exporters import EXTENSIONS
+
+JOB_KINDS = ('simulation', 'comparison', 'export')
+
+def render_job(kind, payload, path, export_format='json'):
+    """Runs in a pool worker; imports ReportLab there, not in the API process"""
+    from reports.report_generator import ReportGenerator
+    generator = ReportGenerator()
+    if kind == 'simulation':
+        return generator.generate_simulation_report(payload, filename=path)
+    if kind == 'comparison':
+        return generator.generate_comparison_report(payload, filename=path)
+    return generator.export_simulation_data(payload, export_format, filename=path)
+
+class ReportJob:
+    def __init__(self, kind, filename):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.filename = filename
+        self.path = None
+        self.status = 'queued'
+        self.error = None
+        self.submitted_at = time.time()
+        self.finished_at = None
+        self.future = None
+
+    def to_dict(self):
+        return {
+            'job_id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'filename': self.filename,
+            'error': self.error,
+            'submitted_at': self.submitted_at,
+            'finished_at': self.finished_at
+        }
+
+class ReportJobQueue:
+    """Renders reports and exports on a bounded worker pool.
+
+    Jobs are polled by id and their files downloaded when done. Finished
+    jobs are kept up to max_retained and retention_seconds, after which the
+    record and its file are removed."""
+    def __init__(self, max_workers=None, use_processes=True, max_retained=200,
+                 retention_seconds=3600, max_pending=1000, output_dir=None):
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.use_processes = use_processes
+        self.max_retained = max_retained
+        self.retention_seconds = retention_seconds
+        self.max_pending = max_pending
+        # Created on first submit: spawned workers re-import the app module
+        self.output_dir = output_dir
+        self.jobs = {}
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _pool(self):
+        if self._executor is None:
+            # Imported on first submit so API startup does not pay for them
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+            if self.use_processes:
+                # spawn: forking a server process that runs sampler threads is unsafe
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='report')
+        return self._executor
+
+    def submit(self, kind, payload, export_format='json'):
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Unknown job type {kind!r}, expected one of: {', '.join(JOB_KINDS)}")
+        if kind == 'export' and export_format not in EXTENSIONS:
+            raise ValueError(f"Unknown export format {export_format!r}, expected one of: {', '.join(EXTENSIONS)}")
+        extension = EXTENSIONS[export_format] if kind == 'export' else 'pdf'
+        prefix = {'simulation': 'deadlock_simulation', 'comparison': 'deadlock_strategies_comparison',
+                  'export': 'simulation_data'}[kind]
+
+        with self._lock:
+            self._prune()
+            pending = sum(1 for job in self.jobs.values() if job.status in ('queued', 'running'))
+            if pending >= self.max_pending:
+                raise RuntimeError('Too many report jobs pending, try again later')
+
+            if self.output_dir is None:
+                self.output_dir = tempfile.mkdtemp(prefix='deadlock-reports-')
+            job = ReportJob(kind, f"{prefix}_{time.strftime('%Y%m%d_%H%M%S')}.{extension}")
+            job.path = os.path.join(self.output_dir, f'{job.id}.{extension}')
+            self.jobs[job.id] = job
+            job.future = self._pool().submit(render_job, kind, payload, job.path, export_format)
+        job.future.add_done_callback(lambda future, job=job: self._finished(job, future))
+        return job
+
+    def _finished(self, job, future):
+        with self._lock:
+            job.finished_at = time.time()
+            if job.status == 'cancelled' or future.cancelled():
+                job.status = 'cancelled'
+                self._remove_file(job)
+            elif future.exception() is not None:
+                job.status = 'failed'
+                job.error = str(future.exception())
+            else:
+                job.status = 'done'
+
+    def get(self, job_id):
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if job is not None and job.status == 'queued' and job.future.running():
+                job.status = 'running'
+            return job
+
+    def cancel(self, job_id):
+        """Queued jobs never start; a job already rendering finishes in its
+        worker but its output is discarded"""
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if job is None or job.status in ('done', 'failed', 'cancelled'):
+                return job
+            job.status = 'cancelled'
+        job.future.cancel()
+        return job
+
+    def list(self):
+        with self._lock:
+            self._prune()
+            for job in self.jobs.values():
+                if job.status == 'queued' and job.future.running():
+                    job.status = 'running'
+            return [job.to_dict() for job in self.jobs.values()]
+
+    def _prune(self):
+        now = time.time()
+        finished = [job for job in self.jobs.values() if job.finished_at is not None]
+        expired = [job for job in finished if now - job.finished_at > self.retention_seconds]
+        # Oldest finished jobs beyond the retention count go too
+        finished.sort(key=lambda job: job.finished_at)
+        overflow = finished[:max(0, len(finished) - self.max_retained)]
+        for job in expired + overflow:
+            if self.jobs.pop(job.id, None) is not None:
+                self._remove_file(job)
+
+    def _remove_file(self, job):
+        try:
+            os.remove(job.path)
+        except OSError:
+            pass
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        if self.output_dir is not None:
+            shutil.rmtree(self.output_dir, ignore_errors=True)
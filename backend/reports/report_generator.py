@@ -1,15 +1,65 @@
-import json
 import datetime
 from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, LongTable, TableStyle
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.lib import colors
+from reports.exporters import EXTENSIONS, export_to_file
+
+class _FlowableStream:
+    """List-like story that pulls flowables from a generator on demand.
+
+    doc.build only ever looks at the front of the story (plus a short
+    keep-with-next lookahead) and pushes split remainders back onto it, so a
+    small window is enough and the full story never exists in memory."""
+    def __init__(self, flowables, window=64):
+        self._source = iter(flowables)
+        self._buffer = []
+        self._window = window
+
+    def _fill(self):
+        while self._source is not None and len(self._buffer) < self._window:
+            try:
+                self._buffer.append(next(self._source))
+            except StopIteration:
+                self._source = None
+
+    def __len__(self):
+        self._fill()
+        return len(self._buffer)
+
+    def __getitem__(self, index):
+        self._fill()
+        return self._buffer[index]
+
+    def __setitem__(self, index, value):
+        self._buffer[index] = value
+
+    def __delitem__(self, index):
+        del self._buffer[index]
+
+    def insert(self, index, value):
+        self._buffer.insert(index, value)
 
 class ReportGenerator:
+    # Matrix blocks: columns per block so tables fit the page width, rows
+    # per LongTable so no single table object holds a whole large matrix
+    MATRIX_COLUMNS = 12
+    MATRIX_ROWS = 200
+
     def __init__(self):
         self.styles = getSampleStyleSheet()
         self.custom_styles = self._create_custom_styles()
+        self.matrix_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 12),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)
+        ])
     
     def _create_custom_styles(self):
         return {
@@ -26,6 +76,11 @@ class ReportGenerator:
                 fontSize=14,
                 spaceAfter=12,
                 textColor=colors.darkgreen
+            ),
+            'Step': ParagraphStyle(
+                'Step',
+                parent=self.styles['Normal'],
+                spaceAfter=6
             )
         }
     
@@ -34,13 +89,15 @@ class ReportGenerator:
             timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"deadlock_simulation_{timestamp}.pdf"
         
-        doc = SimpleDocTemplate(filename, pagesize=A4)
-        story = []
-        
+        # Finished pages are kept until save; compressing them keeps that small
+        doc = SimpleDocTemplate(filename, pagesize=A4, pageCompression=1)
+        doc.build(_FlowableStream(self._simulation_story(simulation_data)))
+        return filename
+
+    def _simulation_story(self, simulation_data):
         # Title
-        title = Paragraph("Deadlock Handling Simulation Report", self.custom_styles['CustomTitle'])
-        story.append(title)
-        story.append(Spacer(1, 12))
+        yield Paragraph("Deadlock Handling Simulation Report", self.custom_styles['CustomTitle'])
+        yield Spacer(1, 12)
         
         # Simulation Info
         info_text = f"""
@@ -50,64 +107,50 @@ class ReportGenerator:
         <b>Resources:</b> {simulation_data.get('resources', 'N/A')}<br/>
         <b>Result:</b> {simulation_data.get('result', 'N/A')}
         """
-        story.append(Paragraph(info_text, self.styles['Normal']))
-        story.append(Spacer(1, 20))
+        yield Paragraph(info_text, self.styles['Normal'])
+        yield Spacer(1, 20)
         
         # Algorithm Steps
         if 'steps' in simulation_data:
-            story.append(Paragraph("Algorithm Execution Steps", self.custom_styles['CustomHeading']))
+            yield Paragraph("Algorithm Execution Steps", self.custom_styles['CustomHeading'])
             
+            step_style = self.custom_styles['Step']
             for step in simulation_data['steps']:
-                step_text = f"<b>Step {step.get('step', 0)}:</b> {step.get('description', '')}"
-                story.append(Paragraph(step_text, self.styles['Normal']))
-                story.append(Spacer(1, 6))
+                yield Paragraph(f"<b>Step {step.get('step', 0)}:</b> {step.get('description', '')}", step_style)
         
         # Matrices
         if 'matrices' in simulation_data:
-            story.append(Paragraph("System Matrices", self.custom_styles['CustomHeading']))
+            yield Paragraph("System Matrices", self.custom_styles['CustomHeading'])
             
-            matrices = simulation_data['matrices']
-            if 'allocation' in matrices:
-                story.append(Paragraph("<b>Allocation Matrix:</b>", self.styles['Normal']))
-                allocation_table = self._create_matrix_table(matrices['allocation'])
-                story.append(allocation_table)
-                story.append(Spacer(1, 12))
+            for name, matrix in simulation_data['matrices'].items():
+                label = name.replace('_', ' ').title()
+                yield Paragraph(f"<b>{label} Matrix:</b>", self.styles['Normal'])
+                yield from self._matrix_blocks(matrix)
+                yield Spacer(1, 12)
         
         # Results Analysis
         if 'analysis' in simulation_data:
-            story.append(Paragraph("Results Analysis", self.custom_styles['CustomHeading']))
-            analysis_text = simulation_data['analysis']
-            story.append(Paragraph(analysis_text, self.styles['Normal']))
-        
-        doc.build(story)
-        return filename
+            yield Paragraph("Results Analysis", self.custom_styles['CustomHeading'])
+            yield Paragraph(simulation_data['analysis'], self.styles['Normal'])
     
-    def _create_matrix_table(self, matrix_data):
-        # Convert matrix to table format
-        table_data = []
-        if isinstance(matrix_data, list) and len(matrix_data) > 0:
-            # Add header row
-            header = ['Process'] + [f'R{i}' for i in range(len(matrix_data[0]))]
-            table_data.append(header)
-            
-            # Add data rows
-            for i, row in enumerate(matrix_data):
-                table_row = [f'P{i}'] + [str(val) for val in row]
-                table_data.append(table_row)
-        
-        table = Table(table_data)
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        
-        return table
+    def _matrix_blocks(self, matrix_data):
+        """Paginated LongTable blocks of at most MATRIX_ROWS x MATRIX_COLUMNS
+        cells, header row repeated on every page"""
+        if not isinstance(matrix_data, list) or not matrix_data:
+            return
+        columns = len(matrix_data[0])
+        for col in range(0, max(columns, 1), self.MATRIX_COLUMNS):
+            last = min(col + self.MATRIX_COLUMNS, columns)
+            header = ['Process'] + [f'R{j}' for j in range(col, last)]
+            for row in range(0, len(matrix_data), self.MATRIX_ROWS):
+                rows = matrix_data[row:row + self.MATRIX_ROWS]
+                table = LongTable(
+                    [header] + [[f'P{row + i}'] + [str(v) for v in values[col:last]] for i, values in enumerate(rows)],
+                    repeatRows=1
+                )
+                table.setStyle(self.matrix_style)
+                yield table
+                yield Spacer(1, 6)
     
     def generate_comparison_report(self, comparison_data, filename=None):
         if not filename:
@@ -147,21 +190,12 @@ class ReportGenerator:
         doc.build(story)
         return filename
     
-    def export_simulation_data(self, simulation_data, format='json'):
-        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        
-        if format == 'json':
-            filename = f"simulation_data_{timestamp}.json"
-            with open(filename, 'w') as f:
-                json.dump(simulation_data, f, indent=2)
-        
-        elif format == 'csv':
-            import pandas as pd
-            filename = f"simulation_data_{timestamp}.csv"
-            
-            # Convert steps to DataFrame if available
-            if 'steps' in simulation_data:
-                df = pd.DataFrame(simulation_data['steps'])
-                df.to_csv(filename, index=False)
+    def export_simulation_data(self, simulation_data, format='json', filename=None):
+        if format not in EXTENSIONS:
+            raise ValueError(f"Unknown export format {format!r}, expected one of: {', '.join(EXTENSIONS)}")
+        if not filename:
+            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"simulation_data_{timestamp}.{EXTENSIONS[format]}"
         
-        return filename
\ No newline at end of file
+        # Written incrementally; steps may be any iterable
+        return export_to_file(simulation_data, format, filename)
@@ -0,0 +1,70 @@
+from algorithms.checkpoint_recovery import CheckpointRecovery
+from algorithms.realtime_monitor import RealTimeDeadlockMonitor
+
+def deadlocked_pair(recovery=True):
+    """P0 and P1 each hold one lock the other wants, plus three units of
+    private work taken before the checkpoint"""
+    monitor = RealTimeDeadlockMonitor()
+    for r in ('A', 'B'):
+        monitor.add_resource(r, r, 1)
+    for p, priority in ((0, 'High'), (1, 'Low')):
+        monitor.add_process(p, f'P{p}', priority)
+        monitor.add_resource(f'work{p}', f'work{p}', 3)
+        monitor.request_resource(p, f'work{p}', 3)
+    monitor.request_resource(0, 'A')
+    monitor.request_resource(1, 'B')
+    if recovery:
+        monitor.recovery_engine = CheckpointRecovery(monitor)
+        monitor.recovery_engine.take_checkpoint()
+    return monitor
+
+def block(monitor):
+    monitor.request_resource(0, 'B')
+    monitor.request_resource(1, 'A')
+    cycle = monitor.find_deadlock()
+    assert sorted(cycle) == [0, 1]
+    return cycle
+
+def test_preemption_breaks_the_cycle_and_keeps_progress():
+    monitor = deadlocked_pair()
+    resolved, _ = monitor.recovery_engine.resolve(block(monitor))
+
+    assert resolved
+    assert monitor.find_deadlock() == []
+    stats = monitor.recovery_engine.stats
+    assert stats['units_preempted'] == 1
+    assert stats['units_saved_vs_termination'] > 0
+    # The low-priority victim keeps its work and queues for the lock again
+    victim = monitor.processes[1]
+    assert victim.held_units('work1') == 3
+    assert victim.wanted_units('B') == 1
+    assert monitor.processes[0].held_units('B') == 1
+
+def test_preemption_keeps_more_than_termination():
+    preempted = deadlocked_pair()
+    preempted.recovery_engine.resolve(block(preempted))
+    terminated = deadlocked_pair(recovery=False)
+    cycle = block(terminated)
+    terminated.auto_resolve_deadlock(cycle)
+
+    def held(monitor):
+        return sum(p.held_units(r) for p in monitor.processes.values() for r in p.resources)
+
+    assert terminated.find_deadlock() == []
+    assert held(preempted) > held(terminated)
+
+def test_rolled_back_units_are_requeued():
+    monitor = deadlocked_pair()
+    # Units taken after the checkpoint; P1 has fewer to lose, so it is the victim
+    monitor.add_resource('extra', 'extra', 3)
+    monitor.request_resource(0, 'extra', 2)
+    monitor.request_resource(1, 'extra', 1)
+    plan = monitor.recovery_engine.plan_preemption(block(monitor))
+    assert plan['victim'] == 1
+    assert plan['rolled_back'] == [('extra', 1)]
+    assert plan['units_lost'] == 2
+
+    monitor.recovery_engine.resolve(monitor.find_deadlock())
+    victim = monitor.processes[1]
+    assert victim.held_units('extra') == 0
+    assert victim.wanted_units('extra') == 1
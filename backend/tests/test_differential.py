@@ -0,0 +1,7 @@
+from benchmarks import differential
+
+def test_engines_agree_with_planted_ground_truth():
+    assert differential.main(['--trials', '60', '--max-size', '40']) == 0
+
+def test_engines_agree_on_large_systems():
+    assert differential.main(['--trials', '5', '--min-size', '200', '--max-size', '300', '--seed', '1']) == 0